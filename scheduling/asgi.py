@@ -0,0 +1,225 @@
+"""An ASGI application serving the API.
+
+Serve it with any ASGI server, for example:
+
+    uvicorn asgi:app
+
+Requests for availability are handled by views.async_availability, which
+fetches every user's data concurrently through an AsyncDatabase, and runs
+the rest of the work in an executor so that computing availability never
+blocks the event loop. Every other request, and every request to a
+coordinator of a sharded deployment, is dispatched to the Flask application
+in app.py, in the executor. Both applications share the same caches,
+precomputed availability, groups and metrics, and unhandled errors become
+500 responses either way.
+"""
+import asyncio
+from contextvars import copy_context
+from functools import partial
+import io
+import sys
+
+from flask import request
+from werkzeug.exceptions import HTTPException
+
+from app import app as flask_app
+from views import async_availability
+
+# The endpoint served by views.async_availability.
+ASYNC_AVAILABILITY_ENDPOINT = 'scheduling.get_availability'
+
+# The maximum number of chunks of a streamed response produced in the
+# executor at a time, and sent together.
+MAX_CHUNKS_PER_SEND = 256
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _handle_lifespan(receive, send)
+        return
+
+    if scope['type'] != 'http':
+        raise ValueError(f'Unsupported ASGI scope type: {scope["type"]}')
+
+    body = await _read_body(receive)
+    environ = _get_environ(scope, body)
+    loop = asyncio.get_running_loop()
+
+    # A response is itself a WSGI application, so both are sent the same
+    # way.
+    if _is_async_request(environ):
+        wsgi_app = await _dispatch_async(environ)
+    else:
+        wsgi_app = flask_app.wsgi_app
+
+    status, headers, chunks = await loop.run_in_executor(
+        None,
+        partial(copy_context().run, _call_wsgi_app, wsgi_app, environ),
+    )
+
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ],
+        })
+
+        # Streamed responses are produced as they are sent, so they are
+        # read in the executor too.
+        chunks_iter = iter(chunks)
+        while True:
+            batch = await loop.run_in_executor(None, _read_chunks,
+                                               chunks_iter)
+            if not batch:
+                break
+            await send({
+                'type': 'http.response.body',
+                'body': b''.join(batch),
+                'more_body': True,
+            })
+
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def _is_async_request(environ):
+    """Determine whether a request is served by views.async_availability.
+
+    Args:
+        environ(dict): The WSGI environment of the request.
+
+    Returns:
+        (bool): Whether the request is for availability, from a server that
+            holds its own users.
+    """
+    if async_availability.async_db is None:
+        return False
+
+    try:
+        endpoint, _ = flask_app.url_map.bind_to_environ(environ).match()
+    except HTTPException:
+        return False
+
+    return endpoint == ASYNC_AVAILABILITY_ENDPOINT
+
+
+async def _dispatch_async(environ):
+    """Handle a request for availability with views.async_availability,
+    running the Flask application's request hooks and error handlers around
+    it as Flask.full_dispatch_request and Flask.wsgi_app would.
+
+    Args:
+        environ(dict): The WSGI environment of the request.
+
+    Returns:
+        (flask.Response): The response.
+    """
+    with flask_app.request_context(environ):
+        try:
+            try:
+                rv = flask_app.preprocess_request()
+                if rv is None:
+                    rv = await async_availability.get_availability_async(
+                        request.args,
+                        request.accept_mimetypes,
+                    )
+            except Exception as e:
+                rv = flask_app.handle_user_exception(e)
+            return flask_app.finalize_request(rv)
+        except Exception as e:
+            return flask_app.handle_exception(e)
+
+
+def _call_wsgi_app(wsgi_app, environ):
+    """Call a WSGI application.
+
+    Args:
+        wsgi_app(function): The WSGI application.
+        environ(dict): The WSGI environment of the request.
+
+    Returns:
+        (tuple(int, list(tuple(str, str)), iterable(bytes))): The status
+            code, headers and body of the response.
+    """
+    response_start = []
+
+    def start_response(status, headers, exc_info=None):
+        response_start[:] = [int(status.split(' ', 1)[0]), headers]
+
+    chunks = wsgi_app(environ, start_response)
+    status, headers = response_start
+    return status, headers, chunks
+
+
+def _read_chunks(chunks):
+    return [chunk for _, chunk in zip(range(MAX_CHUNKS_PER_SEND), chunks)]
+
+
+def _get_environ(scope, body):
+    """Build the WSGI environment of an ASGI HTTP request.
+
+    Args:
+        scope(dict): The ASGI connection scope.
+        body(bytes): The body of the request.
+
+    Returns:
+        (dict): The WSGI environment.
+    """
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            if key in environ:
+                value = f'{environ[key]},{value}'
+            environ[key] = value
+
+    return environ
+
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def _handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
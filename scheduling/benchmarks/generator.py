@@ -0,0 +1,139 @@
+import random
+
+from utils.dates import to_isoformat, to_timestamp
+
+DEFAULT_START_DATE = '2019-01-01T00:00:00+00:00'
+
+DEFAULT_TIME_ZONES = (
+    'UTC',
+    'America/New_York',
+    'America/Los_Angeles',
+    'Europe/London',
+    'Europe/Berlin',
+    'Asia/Kolkata',
+    'Asia/Tokyo',
+    'Australia/Sydney',
+)
+
+# The relative likelihood of an event lasting each number of minutes.
+DEFAULT_EVENT_LENGTHS = {
+    15: 1,
+    30: 4,
+    45: 1,
+    60: 4,
+    90: 1,
+    120: 1,
+}
+
+WORKING_HOURS = (
+    ('08:00', '16:00'),
+    ('09:00', '17:00'),
+    ('09:30', '17:30'),
+    ('10:00', '18:00'),
+)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Events start on multiples of this many seconds, as most meetings do.
+EVENT_ALIGNMENT = 15 * 60
+
+
+def generate_users(user_count=100, days=30, events_per_day=4,
+                   event_lengths=None, overlap_rate=0.1, time_zones=None,
+                   start_date=DEFAULT_START_DATE, seed=0):
+    """Generate a synthetic set of users and their calendars.
+
+    The same arguments always produce the same users.
+
+    Args:
+        user_count(int): The number of users.
+        days(int): The number of days over which events are scheduled.
+        events_per_day(float): The average number of events each user has
+            per day.
+        event_lengths(dict(int, float)): The relative likelihood of an event
+            lasting each number of minutes, defaults to
+            DEFAULT_EVENT_LENGTHS.
+        overlap_rate(float): The probability, between 0 and 1, of an event
+            starting during the user's previous event.
+        time_zones(list(str)): The time zones from which each user's time
+            zone is chosen, defaults to DEFAULT_TIME_ZONES.
+        start_date(str): The date from which events are scheduled, in ISO
+            8601 format.
+        seed(int): The seed of the random number generator.
+
+    Returns:
+        (list(dict)): The users, in the format of data/db.json.
+    """
+    rng = random.Random(seed)
+    event_lengths = event_lengths or DEFAULT_EVENT_LENGTHS
+    time_zones = time_zones or DEFAULT_TIME_ZONES
+    start_date = to_timestamp(start_date)
+
+    lengths = [minutes * 60 for minutes in event_lengths]
+    weights = list(event_lengths.values())
+
+    users = []
+    for user_id in range(1, user_count + 1):
+        working_hours_start, working_hours_end = rng.choice(WORKING_HOURS)
+
+        users.append({
+            'user_id': user_id,
+            'time_zone': rng.choice(time_zones),
+            'working_hours': {
+                'start': working_hours_start,
+                'end': working_hours_end,
+            },
+            'events': _generate_events(
+                rng,
+                start_date,
+                days,
+                events_per_day,
+                lengths,
+                weights,
+                overlap_rate,
+            ),
+        })
+
+    return users
+
+
+def _generate_events(rng, start_date, days, events_per_day, lengths,
+                     weights, overlap_rate):
+    events = []
+    previous_event = None
+
+    for day in range(days):
+        day_start = start_date + day * SECONDS_PER_DAY
+
+        # Vary the number of events from day to day around the average,
+        # while keeping the average over many days.
+        event_count = int(events_per_day)
+        if rng.random() < events_per_day - event_count:
+            event_count += 1
+
+        for _ in range(event_count):
+            length = rng.choices(lengths, weights)[0]
+
+            if previous_event is not None and rng.random() < overlap_rate:
+                previous_start, previous_end = previous_event
+                event_start = rng.randrange(
+                    previous_start,
+                    previous_end,
+                    EVENT_ALIGNMENT,
+                )
+            else:
+                event_start = day_start + rng.randrange(
+                    0,
+                    SECONDS_PER_DAY,
+                    EVENT_ALIGNMENT,
+                )
+
+            previous_event = (event_start, event_start + length)
+            events.append({
+                'id': len(events) + 1,
+                'title': f'Event {len(events) + 1}',
+                'start': to_isoformat(event_start),
+                'end': to_isoformat(event_start + length),
+            })
+
+    return events
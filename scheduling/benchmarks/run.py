@@ -0,0 +1,258 @@
+"""Benchmark the API against synthetic data.
+
+Run from the scheduling directory, for example:
+
+    python -m benchmarks.run --users 200 --output results.json
+
+Each benchmark is timed over several repetitions, and its peak memory
+allocation is measured with tracemalloc in a separate run, so that tracing
+does not distort the timings. Results are written as JSON, along with the
+commit and parameters they were produced with, so that they can be compared
+across commits.
+"""
+from datetime import datetime, timezone
+from statistics import mean, median
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.generator import DEFAULT_START_DATE, generate_users
+from data.database import Database
+from data.models import User
+from utils.availability_utils import (
+    get_intersecting_availabilities,
+    get_user_availability,
+    get_user_work_hour_availability,
+)
+from utils.dates import to_isoformat, to_timestamp
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def run_benchmarks(users_data, group_size=10, window_days=7, repeat=5):
+    """Run every benchmark against a set of users.
+
+    Args:
+        users_data(list(dict)): The users, in the format of data/db.json.
+        group_size(int): The number of users whose common availability is
+            determined by the intersection and endpoint benchmarks.
+        window_days(int): The length of the date range queried, in days,
+            from the start of the generated events.
+        repeat(int): The number of times each benchmark is timed.
+
+    Returns:
+        (list(dict)): The results of each benchmark.
+    """
+    start_date = to_timestamp(DEFAULT_START_DATE)
+    end_date = start_date + window_days * SECONDS_PER_DAY
+
+    def load_database():
+        return Database({
+            user_data['user_id']: User.from_json(user_data)
+            for user_data in users_data
+        })
+
+    db = load_database()
+    user_ids = [user_data['user_id'] for user_data in users_data]
+    group_ids = user_ids[:group_size]
+
+    def get_user_events():
+        for user_id in user_ids:
+            db.get_user_events(user_id, start_date, end_date)
+
+    user_events = {
+        user_id: db.get_user_events(user_id, start_date, end_date)
+        for user_id in user_ids
+    }
+
+    def get_availability():
+        for user_id in user_ids:
+            get_user_availability(user_events[user_id], start_date, end_date)
+
+    def get_work_hour_availability():
+        for user_id in user_ids:
+            user = db.get_user(user_id)
+            get_user_work_hour_availability(
+                user_events[user_id],
+                start_date,
+                end_date,
+                user.working_hours,
+                user.time_zone,
+            )
+
+    group_availabilities = [
+        get_user_availability(user_events[user_id], start_date, end_date)
+        for user_id in group_ids
+    ]
+
+    def get_intersection():
+        get_intersecting_availabilities(group_availabilities)
+
+    benchmarks = [
+        ('database.load', load_database),
+        ('database.get_user_events', get_user_events),
+        ('get_user_availability', get_availability),
+        ('get_user_work_hour_availability', get_work_hour_availability),
+        ('get_intersecting_availabilities', get_intersection),
+    ]
+    benchmarks.extend(_get_endpoint_benchmarks(
+        users_data,
+        group_ids,
+        start_date,
+        end_date,
+    ))
+
+    return [
+        {
+            'name': name,
+            **_time(func, repeat),
+            'peak_memory_bytes': _measure_peak_memory(func),
+        }
+        for name, func in benchmarks
+    ]
+
+
+def _get_endpoint_benchmarks(users_data, group_ids, start_date, end_date):
+    """Build benchmarks of the availability endpoint, through the Flask test
+    client, serving the users from a temporary JSON database.
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.json',
+                                     delete=False) as f:
+        json.dump(users_data, f)
+
+    os.environ['SCHEDULING_DATABASE_BACKEND'] = 'json'
+    os.environ['SCHEDULING_DATABASE_FILENAME'] = f.name
+    try:
+        # The database is loaded when the views are first imported.
+        from app import app
+        from views import availability
+    finally:
+        os.remove(f.name)
+
+    client = app.test_client()
+    query_string = [('user_id', user_id) for user_id in group_ids] + [
+        ('start_date', to_isoformat(start_date)),
+        ('end_date', to_isoformat(end_date)),
+    ]
+
+    def request_availability():
+        response = client.get('/scheduling/availability/',
+                              query_string=query_string)
+        assert response.status_code == 200
+
+    def request_uncached_availability():
+        availability.user_availability_cache.clear()
+        availability.common_availability_cache.clear()
+        request_availability()
+
+    return [
+        ('endpoint.availability', request_uncached_availability),
+        ('endpoint.availability.cached', request_availability),
+    ]
+
+
+def _time(func, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return {
+        'repeat': repeat,
+        'min_seconds': min(durations),
+        'median_seconds': median(durations),
+        'mean_seconds': mean(durations),
+    }
+
+
+def _measure_peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the API against synthetic data.',
+    )
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--events-per-day', type=float, default=4)
+    parser.add_argument(
+        '--event-lengths',
+        nargs='+',
+        metavar='MINUTES:WEIGHT',
+        help='the relative likelihood of each event length, e.g. 30:4 60:1',
+    )
+    parser.add_argument('--overlap-rate', type=float, default=0.1)
+    parser.add_argument('--time-zones', nargs='+')
+    parser.add_argument('--group-size', type=int, default=10)
+    parser.add_argument('--window-days', type=int, default=7)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='defaults to standard output')
+    args = parser.parse_args()
+
+    parameters = vars(args).copy()
+    del parameters['output']
+
+    event_lengths = None
+    if args.event_lengths:
+        event_lengths = {
+            int(minutes): float(weight)
+            for minutes, weight in (
+                event_length.split(':')
+                for event_length in args.event_lengths
+            )
+        }
+
+    users_data = generate_users(
+        user_count=args.users,
+        days=args.days,
+        events_per_day=args.events_per_day,
+        event_lengths=event_lengths,
+        overlap_rate=args.overlap_rate,
+        time_zones=args.time_zones,
+        seed=args.seed,
+    )
+
+    results = {
+        'commit': _get_commit(),
+        'python_version': platform.python_version(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'parameters': parameters,
+        'benchmarks': run_benchmarks(
+            users_data,
+            group_size=args.group_size,
+            window_days=args.window_days,
+            repeat=args.repeat,
+        ),
+    }
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
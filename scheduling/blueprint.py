@@ -1,11 +1,68 @@
 from flask import Blueprint
 
-from views.availability import get_availability
+from utils.metrics import start_request_timing
+from views.availability import (
+    get_availability,
+    get_batch_availability,
+    shard_client,
+)
+from views.events import create_event, delete_event, update_event
+from views.metrics import add_server_timing, get_metrics
+from views.shard import get_shard_availability
+from views.suggestions import get_suggestions
 
 blueprint = Blueprint('scheduling', __name__, url_prefix='/scheduling')
 
+blueprint.before_request(start_request_timing)
+blueprint.after_request(add_server_timing)
+
 blueprint.add_url_rule(
     '/availability/',
     view_func=get_availability,
     methods=['GET'],
-)
\ No newline at end of file
+)
+
+blueprint.add_url_rule(
+    '/metrics',
+    view_func=get_metrics,
+    methods=['GET'],
+)
+
+# A coordinator only serves availability. Everything else is served by the
+# shards, which own the users' data.
+if shard_client is None:
+    blueprint.add_url_rule(
+        '/availability/batch',
+        view_func=get_batch_availability,
+        methods=['POST'],
+    )
+
+    blueprint.add_url_rule(
+        '/users/<int:user_id>/events/',
+        view_func=create_event,
+        methods=['POST'],
+    )
+
+    blueprint.add_url_rule(
+        '/users/<int:user_id>/events/<int:event_id>',
+        view_func=update_event,
+        methods=['PUT'],
+    )
+
+    blueprint.add_url_rule(
+        '/users/<int:user_id>/events/<int:event_id>',
+        view_func=delete_event,
+        methods=['DELETE'],
+    )
+
+    blueprint.add_url_rule(
+        '/shard/availability/',
+        view_func=get_shard_availability,
+        methods=['GET'],
+    )
+
+    blueprint.add_url_rule(
+        '/suggestions/',
+        view_func=get_suggestions,
+        methods=['GET'],
+    )
\ No newline at end of file
@@ -0,0 +1,49 @@
+import asyncio
+from functools import partial
+
+
+class AsyncDatabase():
+    """An asyncio interface to a database.
+
+    Wraps any of the synchronous databases, running each call in an executor
+    so that slow lookups do not block the event loop, and lookups for many
+    users can be awaited concurrently. Exceptions, such as
+    UserNotFoundException, are raised from the awaited call.
+    """
+
+    def __init__(self, db, executor=None):
+        """Initialize the database.
+
+        Args:
+            db(data.database.Database): The synchronous database, or any
+                other database providing the same interface.
+            executor(concurrent.futures.Executor): The executor in which
+                calls are run, defaults to the event loop's default executor.
+        """
+        self._db = db
+        self._executor = executor
+
+    async def get_user(self, user_id):
+        return await self._run(self._db.get_user, user_id)
+
+    async def get_user_ids(self):
+        return await self._run(self._db.get_user_ids)
+
+    async def get_user_events(self, user_id, start_date, end_date):
+        return await self._run(self._db.get_user_events, user_id,
+                               start_date, end_date)
+
+    async def get_user_busy_intervals(self, user_id, start_date, end_date):
+        return await self._run(self._db.get_user_busy_intervals, user_id,
+                               start_date, end_date)
+
+    async def get_user_free_intervals(self, user_id, start_date, end_date):
+        return await self._run(self._db.get_user_free_intervals, user_id,
+                               start_date, end_date)
+
+    async def get_user_version(self, user_id):
+        return await self._run(self._db.get_user_version, user_id)
+
+    def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, partial(func, *args))
@@ -0,0 +1,99 @@
+import os
+
+from data.database import Database
+from data.groups import GroupStore
+from data.snapshot_database import SnapshotDatabase
+from data.sqlite_database import DEFAULT_POOL_SIZE, SQLiteDatabase
+from utils.sharding import load_shard
+
+JSON_BACKEND = 'json'
+SQLITE_BACKEND = 'sqlite'
+SNAPSHOT_BACKEND = 'snapshot'
+
+DEFAULT_FILENAMES = {
+    JSON_BACKEND: 'data/db.json',
+    SQLITE_BACKEND: 'data/db.sqlite3',
+    SNAPSHOT_BACKEND: 'data/db.snapshot',
+}
+
+DEFAULT_GROUPS_FILENAME = 'data/groups.json'
+
+
+def load_database(backend=None, filename=None):
+    """Open the database configured for the application.
+
+    Unless provided, the backend and database file are read from the
+    SCHEDULING_DATABASE_BACKEND and SCHEDULING_DATABASE_FILENAME environment
+    variables. The size of the SQLite connection pool can be configured with
+    SCHEDULING_DATABASE_POOL_SIZE.
+
+    If the process is a shard, as configured by SCHEDULING_SHARD_INDEX and
+    SCHEDULING_SHARD_COUNT, the JSON backend only loads the users the shard
+    owns. The other backends query their files per user, so they are opened
+    as they are.
+
+    Args:
+        backend(str): Either "json", to load every user into memory from a
+            JSON file, "sqlite", to query a SQLite database, or "snapshot",
+            to memory-map a read-only binary snapshot. Defaults to "json".
+        filename(str): The path to the database file. Defaults to the
+            backend's file in the data directory.
+
+    Returns:
+        (Database|SQLiteDatabase|SnapshotDatabase): The database.
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    backend = backend or os.environ.get(
+        'SCHEDULING_DATABASE_BACKEND',
+        JSON_BACKEND,
+    )
+    if backend not in DEFAULT_FILENAMES:
+        raise ValueError(f'Unsupported database backend: {backend}')
+
+    filename = (
+        filename or
+        os.environ.get('SCHEDULING_DATABASE_FILENAME') or
+        DEFAULT_FILENAMES[backend]
+    )
+
+    if backend == SQLITE_BACKEND:
+        pool_size = int(os.environ.get(
+            'SCHEDULING_DATABASE_POOL_SIZE',
+            DEFAULT_POOL_SIZE,
+        ))
+        return SQLiteDatabase(filename, pool_size)
+
+    if backend == SNAPSHOT_BACKEND:
+        return SnapshotDatabase(filename)
+
+    return Database.from_file(filename, load_shard())
+
+
+def load_groups(filename=None):
+    """Load the groups configured for the application.
+
+    Groups are held apart from users, so they can be used with any database
+    backend. Unless provided, the file is read from the
+    SCHEDULING_GROUPS_FILENAME environment variable. Groups are optional, so
+    if neither is set and the default file does not exist, there are none.
+
+    Args:
+        filename(str): The path to the groups' JSON file. Defaults to
+            data/groups.json.
+
+    Returns:
+        (GroupStore): The groups.
+
+    Raises:
+        ValueError: If the groups are invalid.
+    """
+    filename = filename or os.environ.get('SCHEDULING_GROUPS_FILENAME')
+
+    if filename is None:
+        if not os.path.exists(DEFAULT_GROUPS_FILENAME):
+            return GroupStore()
+        filename = DEFAULT_GROUPS_FILENAME
+
+    return GroupStore.from_file(filename)
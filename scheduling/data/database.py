@@ -1,37 +1,299 @@
+from heapq import merge
+from itertools import count
+from operator import attrgetter
 import json
+from threading import RLock
 
-from data.models import User
-from data.exceptions import UserNotFoundException
+from data.exceptions import EventNotFoundException, UserNotFoundException
+from data.free_busy import FreeBusy, get_free_intervals
+from data.models import Event, User
+from utils.sharding import get_shard_index
+
+# Versions are unique across every database instance in the process, so that
+# a reloaded database never reuses the version of a stale user.
+_versions = count(1)
+
+
+def next_version():
+    """Allocate a new version for a user's data.
+
+    Returns:
+        (int): A version that has not been used before in this process.
+    """
+    return next(_versions)
 
 
 class Database():
     def __init__(self, db):
-        self._db = db
+        self._db = {}
+        self._versions = {}
+        self._free_busy = {}
+
+        # The highest event id allocated or loaded, which is never lowered,
+        # so that the ids of deleted events are not allocated again.
+        self._last_event_id = 0
+
+        # Guards the users' events and schedules, which are updated in place
+        # by writes.
+        self._lock = RLock()
+
+        for user in db.values():
+            self.set_user(user)
 
     def get_user(self, user_id):
         user = self._db.get(user_id)
         if not user:
-            raise UserNotFoundException
+            raise UserNotFoundException(user_id)
         return user
 
+    def get_user_ids(self):
+        """Retrieve the ids of every user.
+
+        Returns:
+            (list(int)): The ids of the users, in ascending order.
+        """
+        return sorted(self._db)
+
     def get_user_events(self, user_id, start_date, end_date):
         user = self.get_user(user_id)
+        with self._lock:
+            events = user.event_store.get_events(start_date, end_date)
+
+        if not user.recurring_events:
+            return events
+
+        return list(merge(
+            events,
+            user.get_occurrences(start_date, end_date),
+            key=attrgetter('start_date'),
+        ))
+
+    def get_user_busy_intervals(self, user_id, start_date, end_date):
+        """Retrieve the start and end dates of a user's events that overlap
+        with a date range.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the events,
+                in ascending order by start date.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        user = self.get_user(user_id)
+        with self._lock:
+            busy_intervals = user.event_store.get_busy_intervals(start_date,
+                                                                 end_date)
+
+        if not user.recurring_events:
+            return busy_intervals
+
+        return list(merge(
+            busy_intervals,
+            (
+                (occurrence.start_date, occurrence.end_date)
+                for occurrence in user.get_occurrences(start_date, end_date)
+            ),
+        ))
+
+    def get_user_free_intervals(self, user_id, start_date, end_date):
+        """Retrieve the intervals within a date range during which a user has
+        no events.
+
+        These are read from the user's schedule, which is kept up to date as
+        events are written, rather than derived from their events. Users with
+        recurring events are the exception, as their occurrences are only
+        expanded within the date range.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the free
+                intervals, clipped to the date range, in ascending order.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        user = self.get_user(user_id)
+
+        if user.recurring_events:
+            return get_free_intervals(
+                self.get_user_busy_intervals(user_id, start_date, end_date),
+                start_date,
+                end_date,
+            )
+
+        with self._lock:
+            return self._free_busy[user_id].get_free_intervals(start_date,
+                                                               end_date)
+
+    def get_user_version(self, user_id):
+        """Retrieve the version of a user's data.
+
+        The version changes whenever the user or their events change, so it
+        can be used to invalidate anything derived from them.
+
+        Args:
+            user_id(int): The id of the user.
 
-        events_in_range = [
-            event
-            for event in user.events
-            if event.start_date < end_date and event.end_date > start_date
-        ]
+        Returns:
+            (int): The version of the user's data.
 
-        return sorted(events_in_range, key=lambda e: e.start_date)
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        self.get_user(user_id)
+        return self._versions[user_id]
+
+    def set_user(self, user):
+        """Add a user to the database, replacing any existing user with the
+        same id.
+
+        Args:
+            user(User): The user, including all of their events.
+        """
+        free_busy = FreeBusy(user.event_store.get_busy_intervals(None, None))
+
+        last_event_id = max(
+            [user.event_store.get_next_event_id() - 1] + [
+                recurring_event.id
+                for recurring_event in user.recurring_events
+            ],
+        )
+
+        with self._lock:
+            self._versions[user.id] = next_version()
+            self._free_busy[user.id] = free_busy
+            self._db[user.id] = user
+            self._last_event_id = max(self._last_event_id, last_event_id)
+
+    def create_event(self, user_id, title, start_date, end_date):
+        """Add a new event to a user's schedule.
+
+        Args:
+            user_id(int): The id of the user.
+            title(str): The title of the event.
+            start_date(int): The start date of the event, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the event, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (Event): The event, with a newly allocated id, which is unique
+                across the database and never reused.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        user = self.get_user(user_id)
+
+        with self._lock:
+            self._last_event_id += 1
+            event = Event(
+                id=self._last_event_id,
+                title=title,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            self._add_event(user, event)
+
+        return event
+
+    def update_event(self, user_id, event_id, title, start_date, end_date):
+        """Replace the details of one of a user's events.
+
+        Args:
+            user_id(int): The id of the user.
+            event_id(int): The id of the event.
+            title(str): The new title of the event.
+            start_date(int): The new start date of the event, as a UTC epoch
+                timestamp.
+            end_date(int): The new end date of the event, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (Event): The updated event.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+            EventNotFoundException: If the user has no such event.
+        """
+        user = self.get_user(user_id)
+        event = Event(
+            id=event_id,
+            title=title,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        with self._lock:
+            self._remove_event(user, event_id)
+            self._add_event(user, event)
+
+        return event
+
+    def delete_event(self, user_id, event_id):
+        """Remove one of a user's events.
+
+        Args:
+            user_id(int): The id of the user.
+            event_id(int): The id of the event.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+            EventNotFoundException: If the user has no such event.
+        """
+        user = self.get_user(user_id)
+
+        with self._lock:
+            self._remove_event(user, event_id)
+
+    def _add_event(self, user, event):
+        user.event_store.add_event(event)
+        self._free_busy[user.id].add(event.start_date, event.end_date)
+        self._versions[user.id] = next_version()
+
+    def _remove_event(self, user, event_id):
+        event = user.event_store.remove_event(event_id)
+        if event is None:
+            raise EventNotFoundException(event_id)
+
+        self._free_busy[user.id].remove(event.start_date, event.end_date)
+        self._versions[user.id] = next_version()
 
     @classmethod
-    def from_file(cls, filename='data/db.json'):
+    def from_file(cls, filename='data/db.json', shard=None):
+        """Load a database from a JSON file.
+
+        Args:
+            filename(str): The path to the JSON file.
+            shard(tuple(int, int)): The index of the shard and the number of
+                shards, if only the users owned by a shard should be loaded.
+
+        Returns:
+            (Database): The database.
+        """
         with open(filename) as f:
             data = json.load(f)
 
         db = {}
         for user_data in data:
+            if (
+                shard is not None and
+                get_shard_index(user_data['user_id'], shard[1]) != shard[0]
+            ):
+                continue
             db[user_data['user_id']] = User.from_json(user_data)
 
         return cls(db)
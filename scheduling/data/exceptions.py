@@ -1,3 +1,26 @@
 class UserNotFoundException(Exception):
     """Raised when a user cannot be found in the database"""
-    pass
+
+    def __init__(self, user_id=None):
+        super().__init__(user_id)
+        self.user_id = user_id
+
+
+class GroupNotFoundException(Exception):
+    """Raised when a group cannot be found"""
+
+    def __init__(self, group_id=None):
+        super().__init__(group_id)
+        self.group_id = group_id
+
+
+class EventNotFoundException(Exception):
+    """Raised when an event cannot be found in the database"""
+
+    def __init__(self, event_id=None):
+        super().__init__(event_id)
+        self.event_id = event_id
+
+
+class ReadOnlyDatabaseException(Exception):
+    """Raised when attempting to modify a database that is read-only"""
@@ -0,0 +1,197 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+class FreeBusy:
+    """A user's schedule, maintained as the number of events taking place at
+    each moment in time.
+
+    The schedule is held as a step function: a sorted list of boundaries,
+    along with the number of events taking place from each boundary up until
+    the next one. No events take place before the first boundary or after the
+    last one. Adjacent steps always have different counts, so the stretches
+    of time during which the count is zero are exactly the user's free
+    intervals.
+
+    Adding or removing an event only splits, updates and merges the steps
+    that it overlaps, rather than rebuilding the whole schedule.
+
+    Events that start and end at the same moment take up no time, but still
+    split the free interval they fall within in two, so they are held
+    separately.
+    """
+
+    __slots__ = ('_boundaries', '_counts', '_instants')
+
+    def __init__(self, busy_intervals=()):
+        """Build the schedule.
+
+        Args:
+            busy_intervals(iterable(tuple(int, int))): The start and end
+                dates of the user's events, as UTC epoch timestamps, in any
+                order.
+        """
+        self._boundaries = []
+        self._counts = []
+        self._instants = []
+
+        for start_date, end_date in busy_intervals:
+            self.add(start_date, end_date)
+
+    def add(self, start_date, end_date):
+        """Add an event to the schedule.
+
+        Args:
+            start_date(int): The start date of the event, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the event, as a UTC epoch
+                timestamp.
+        """
+        self._update(start_date, end_date, 1)
+
+    def remove(self, start_date, end_date):
+        """Remove an event, previously added, from the schedule.
+
+        Args:
+            start_date(int): The start date of the event, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the event, as a UTC epoch
+                timestamp.
+        """
+        self._update(start_date, end_date, -1)
+
+    def get_free_intervals(self, start_date, end_date):
+        """Retrieve the intervals within a date range during which no events
+        take place.
+
+        Args:
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the free
+                intervals, clipped to the date range, in ascending order.
+        """
+        boundaries = self._boundaries
+        counts = self._counts
+        instants = self._instants
+
+        free_intervals = []
+
+        # The step containing the start of the range, or -1 if the range
+        # starts before the first boundary.
+        index = bisect_right(boundaries, start_date) - 1
+        interval_start = start_date
+
+        while interval_start < end_date:
+            count = counts[index] if index >= 0 else 0
+            if index + 1 < len(boundaries):
+                interval_end = min(boundaries[index + 1], end_date)
+            else:
+                interval_end = end_date
+
+            if not count:
+                lo = bisect_right(instants, interval_start)
+                hi = bisect_left(instants, interval_end)
+                for instant in sorted(set(instants[lo:hi])):
+                    free_intervals.append((interval_start, instant))
+                    interval_start = instant
+                free_intervals.append((interval_start, interval_end))
+
+            interval_start = interval_end
+            index += 1
+
+        return free_intervals
+
+    def __len__(self):
+        return len(self._boundaries)
+
+    def _update(self, start_date, end_date, delta):
+        if start_date == end_date:
+            if delta > 0:
+                insort(self._instants, start_date)
+            else:
+                instants = self._instants
+                index = bisect_left(instants, start_date)
+                if index < len(instants) and instants[index] == start_date:
+                    del instants[index]
+            return
+
+        if start_date > end_date:
+            return
+
+        first = self._split(start_date)
+        last = self._split(end_date)
+
+        counts = self._counts
+        for index in range(first, last):
+            counts[index] += delta
+
+        # Merge the steps either side of the updated range with their
+        # neighbours, where the update has made their counts equal. The later
+        # boundary is merged first, so that the earlier index stays valid.
+        self._merge(last)
+        self._merge(first)
+
+    def _split(self, date):
+        """Ensure that a step begins at the given date.
+
+        Args:
+            date(int): The date, as a UTC epoch timestamp.
+
+        Returns:
+            (int): The index of the step beginning at the date.
+        """
+        boundaries = self._boundaries
+        index = bisect_left(boundaries, date)
+
+        if index == len(boundaries) or boundaries[index] != date:
+            boundaries.insert(index, date)
+            self._counts.insert(index, self._counts[index - 1] if index else 0)
+
+        return index
+
+    def _merge(self, index):
+        """Remove the boundary at the given index if the steps either side of
+        it have the same count.
+
+        Args:
+            index(int): The index of the boundary.
+        """
+        counts = self._counts
+        previous_count = counts[index - 1] if index else 0
+
+        if counts[index] == previous_count:
+            del self._boundaries[index]
+            del counts[index]
+
+
+def get_free_intervals(busy_intervals, start_date, end_date):
+    """Determine the intervals within a date range during which none of the
+    given events take place.
+
+    Args:
+        busy_intervals(iterable(tuple(int, int))): The start and end dates of
+            the events that overlap with the date range, as UTC epoch
+            timestamps, in ascending order by start date.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+
+    Returns:
+        (list(tuple(int, int))): The start and end dates of the free
+            intervals, clipped to the date range, in ascending order.
+    """
+    free_intervals = []
+    interval_start = start_date
+
+    for event_start, event_end in busy_intervals:
+        if event_start > interval_start:
+            free_intervals.append((interval_start, min(event_start, end_date)))
+        interval_start = max(interval_start, event_end)
+
+    if interval_start < end_date:
+        free_intervals.append((interval_start, end_date))
+
+    return free_intervals
@@ -0,0 +1,113 @@
+import json
+
+from data.exceptions import GroupNotFoundException
+from data.models import Group
+
+GROUP_CYCLE = 'Groups cannot contain themselves: {}'
+GROUP_NOT_FOUND = 'Group {} contains group {}, which does not exist'
+EMPTY_GROUP = 'Group {} has no members'
+
+
+class GroupStore:
+    """The groups of users, with nested groups resolved to their members.
+
+    Groups are resolved once, when the store is created, so that looking up
+    a group's members does not walk the groups it contains.
+    """
+
+    def __init__(self, groups=()):
+        """Initialize the store.
+
+        Args:
+            groups(iterable(Group)): The groups.
+
+        Raises:
+            ValueError: If a group contains a group that does not exist, or
+                contains itself, directly or through other groups, or if a
+                group has no members.
+        """
+        self._groups = {group.id: group for group in groups}
+        self._member_ids = {}
+
+        for group_id in self._groups:
+            self._resolve(group_id, [])
+
+    def get_group(self, group_id):
+        group = self._groups.get(group_id)
+        if group is None:
+            raise GroupNotFoundException(group_id)
+        return group
+
+    def get_member_ids(self, group_id):
+        """Retrieve the members of a group, including those of any groups it
+        contains.
+
+        Args:
+            group_id(int): The id of the group.
+
+        Returns:
+            (tuple(int)): The ids of the members, in ascending order.
+
+        Raises:
+            GroupNotFoundException: If the group does not exist.
+        """
+        member_ids = self._member_ids.get(group_id)
+        if member_ids is None:
+            raise GroupNotFoundException(group_id)
+        return member_ids
+
+    def _resolve(self, group_id, path):
+        """Determine a group's members, resolving the groups it contains
+        first.
+
+        Args:
+            group_id(int): The id of the group.
+            path(list(int)): The ids of the groups being resolved that
+                contain this group, outermost first.
+
+        Returns:
+            (tuple(int)): The ids of the members, in ascending order.
+        """
+        member_ids = self._member_ids.get(group_id)
+        if member_ids is not None:
+            return member_ids
+
+        if group_id in path:
+            cycle = path[path.index(group_id):] + [group_id]
+            raise ValueError(GROUP_CYCLE.format(
+                ' -> '.join(str(id) for id in cycle)
+            ))
+
+        group = self._groups[group_id]
+        member_ids = set(group.user_ids)
+
+        path.append(group_id)
+        for nested_group_id in group.group_ids:
+            if nested_group_id not in self._groups:
+                raise ValueError(GROUP_NOT_FOUND.format(group_id,
+                                                        nested_group_id))
+            member_ids.update(self._resolve(nested_group_id, path))
+        path.pop()
+
+        if not member_ids:
+            raise ValueError(EMPTY_GROUP.format(group_id))
+
+        member_ids = tuple(sorted(member_ids))
+        self._member_ids[group_id] = member_ids
+        return member_ids
+
+    @classmethod
+    def from_file(cls, filename='data/groups.json'):
+        """Load the groups from a JSON file.
+
+        Args:
+            filename(str): The path to the JSON file, which holds a list of
+                groups.
+
+        Returns:
+            (GroupStore): The groups.
+        """
+        with open(filename) as f:
+            data = json.load(f)
+
+        return cls(Group.from_json(group_data) for group_data in data)
@@ -1,16 +1,49 @@
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import namedtuple
+from heapq import merge
+from itertools import accumulate
+from operator import attrgetter
+import sys
+
+from utils.dates import to_isoformat, to_timestamp
+from utils.recurrence import FREQUENCIES, get_occurrence_starts
 
 WorkingHours = namedtuple('WorkingHours', ['start', 'end'])
 WorkingHoursTime = namedtuple('WorkingHoursTime', ['hour', 'minute'])
 
+INVALID_FREQUENCY = 'Invalid recurrence frequency: must be one of {}'
+INVALID_INTERVAL = 'Invalid recurrence interval: must be a positive integer'
+
 
 def _parse_work_hours(time):
     hours, minutes = time.split(':')
     return int(hours), int(minutes)
 
 
+def _get_start_date(event):
+    return event[0]
+
+
 class User:
-    def __init__(self, id, working_hours, time_zone, events):
+    """A user, along with their events.
+
+    The user's events are held in an EventStore, rather than as a list of
+    Event objects. Recurring events are held separately, and their
+    occurrences are only expanded when they are requested.
+    """
+
+    __slots__ = (
+        'id',
+        '_working_hours',
+        'working_hours',
+        'time_zone',
+        'event_store',
+        'recurring_events',
+    )
+
+    def __init__(self, id, working_hours, time_zone, events,
+                 recurring_events=()):
         self.id = id
         self._working_hours = working_hours
         self.working_hours = WorkingHours(
@@ -18,7 +51,44 @@ class User:
             WorkingHoursTime(*_parse_work_hours(working_hours.end)),
         )
         self.time_zone = time_zone
-        self.events = events
+
+        if isinstance(events, EventStore):
+            self.event_store = events
+        else:
+            self.event_store = EventStore(events)
+
+        self.recurring_events = list(recurring_events)
+
+    @property
+    def events(self):
+        return self.event_store.get_events()
+
+    def get_occurrences(self, start_date, end_date):
+        """Retrieve the occurrences of the user's recurring events that
+        overlap with a date range.
+
+        Occurrences are recurred in the user's time zone.
+
+        Args:
+            start_date(int): The start date of the range, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(Event)): The occurrences, in ascending order by start date.
+        """
+        return list(merge(
+            *(
+                recurring_event.get_occurrences(
+                    start_date,
+                    end_date,
+                    self.time_zone,
+                )
+                for recurring_event in self.recurring_events
+            ),
+            key=attrgetter('start_date'),
+        ))
 
     def to_json(self):
         return {
@@ -28,16 +98,14 @@ class User:
                 'end': self._working_hours.end,
             },
             'time_zone': self.time_zone,
-            'events': [event.to_json() for event in self.events]
+            'events': [event.to_json() for event in self.events] + [
+                recurring_event.to_json()
+                for recurring_event in self.recurring_events
+            ]
         }
 
     @classmethod
     def from_json(cls, data):
-        events = [
-            Event.from_json(event)
-            for event in data['events']
-        ]
-
         return cls(
             id=data['user_id'],
             working_hours=WorkingHours(
@@ -45,11 +113,26 @@ class User:
                data['working_hours']['end'],
             ),
             time_zone=data['time_zone'],
-            events=events,
+            events=EventStore.from_json([
+                event for event in data['events']
+                if 'recurrence' not in event
+            ]),
+            recurring_events=[
+                RecurringEvent.from_json(event) for event in data['events']
+                if 'recurrence' in event
+            ],
         )
 
 
 class Event:
+    """A scheduled event.
+
+    Event dates are held as UTC epoch timestamps, in seconds, so that they
+    are parsed only once, when the event is loaded.
+    """
+
+    __slots__ = ('id', 'title', 'start_date', 'end_date')
+
     def __init__(self, id, title, start_date, end_date):
         self.id = id
         self.title = title
@@ -60,8 +143,155 @@ class Event:
         return {
             'id': self.id,
             'title': self.title,
-            'start': self.start_date,
-            'end': self.end_date,
+            'start': to_isoformat(self.start_date),
+            'end': to_isoformat(self.end_date),
+        }
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if type(other) != type(self):
+            return False
+        return (
+            (other.id, other.title, other.start_date, other.end_date) ==
+            (self.id, self.title, self.start_date, self.end_date)
+        )
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            start_date=to_timestamp(data['start']),
+            end_date=to_timestamp(data['end']),
+        )
+
+
+class Recurrence:
+    """The rule by which an event recurs.
+
+    Events recur daily, weekly or monthly, on the same day of the month as
+    their first occurrence for monthly events, at the same local time of
+    day. Recurrence stops after a number of occurrences, or a date, if
+    either is given, and individual occurrences may be cancelled.
+    """
+
+    __slots__ = ('frequency', 'interval', 'count', 'until', 'exceptions')
+
+    def __init__(self, frequency, interval=1, count=None, until=None,
+                 exceptions=frozenset()):
+        """Initialize a recurrence rule.
+
+        Args:
+            frequency(str): "daily", "weekly" or "monthly".
+            interval(int): The number of days, weeks or months between
+                occurrences, defaults to 1.
+            count(int): The maximum number of occurrences, or None.
+            until(int): The last date on which an occurrence may start, as a
+                UTC epoch timestamp, or None.
+            exceptions(frozenset(int)): The start dates of cancelled
+                occurrences, as UTC epoch timestamps.
+
+        Raises:
+            ValueError: If the frequency or interval is invalid.
+        """
+        if frequency not in FREQUENCIES:
+            raise ValueError(INVALID_FREQUENCY.format(', '.join(FREQUENCIES)))
+
+        if not isinstance(interval, int) or interval < 1:
+            raise ValueError(INVALID_INTERVAL)
+
+        self.frequency = frequency
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.exceptions = frozenset(exceptions)
+
+    def to_json(self):
+        data = {'frequency': self.frequency, 'interval': self.interval}
+        if self.count is not None:
+            data['count'] = self.count
+        if self.until is not None:
+            data['until'] = to_isoformat(self.until)
+        if self.exceptions:
+            data['exceptions'] = [
+                to_isoformat(exception)
+                for exception in sorted(self.exceptions)
+            ]
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        until = data.get('until')
+        return cls(
+            frequency=data['frequency'],
+            interval=data.get('interval', 1),
+            count=data.get('count'),
+            until=None if until is None else to_timestamp(until),
+            exceptions=frozenset(
+                to_timestamp(exception)
+                for exception in data.get('exceptions', ())
+            ),
+        )
+
+
+class RecurringEvent:
+    """An event that recurs according to a rule.
+
+    The event's dates are those of its first occurrence. Every occurrence
+    shares the event's id and title.
+    """
+
+    __slots__ = ('id', 'title', 'start_date', 'end_date', 'recurrence')
+
+    def __init__(self, id, title, start_date, end_date, recurrence):
+        self.id = id
+        self.title = title
+        self.start_date = start_date
+        self.end_date = end_date
+        self.recurrence = recurrence
+
+    def get_occurrences(self, start_date, end_date, time_zone):
+        """Retrieve the occurrences of the event that overlap with a date
+        range.
+
+        Args:
+            start_date(int): The start date of the range, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the range, as a UTC epoch
+                timestamp.
+            time_zone(str): The time zone within which the event recurs.
+
+        Returns:
+            (list(Event)): The occurrences, in ascending order by start date.
+        """
+        duration = self.end_date - self.start_date
+        recurrence = self.recurrence
+
+        return [
+            Event(self.id, self.title, occurrence_start,
+                  occurrence_start + duration)
+            for occurrence_start in get_occurrence_starts(
+                self.start_date,
+                duration,
+                time_zone,
+                recurrence.frequency,
+                recurrence.interval,
+                recurrence.count,
+                recurrence.until,
+                recurrence.exceptions,
+                start_date,
+                end_date,
+            )
+        ]
+
+    def to_json(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'start': to_isoformat(self.start_date),
+            'end': to_isoformat(self.end_date),
+            'recurrence': self.recurrence.to_json(),
         }
 
     @classmethod
@@ -69,6 +299,248 @@ class Event:
         return cls(
             id=data['id'],
             title=data['title'],
-            start_date=data['start'],
-            end_date=data['end'],
+            start_date=to_timestamp(data['start']),
+            end_date=to_timestamp(data['end']),
+            recurrence=Recurrence.from_json(data['recurrence']),
+        )
+
+
+class Group:
+    """A named group of users, such as a team.
+
+    A group's members are the users it lists, along with the members of the
+    groups it contains.
+    """
+
+    __slots__ = ('id', 'name', 'user_ids', 'group_ids')
+
+    def __init__(self, id, name, user_ids=(), group_ids=()):
+        self.id = id
+        self.name = name
+        self.user_ids = tuple(user_ids)
+        self.group_ids = tuple(group_ids)
+
+    def to_json(self):
+        return {
+            'group_id': self.id,
+            'name': self.name,
+            'user_ids': list(self.user_ids),
+            'group_ids': list(self.group_ids),
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            id=data['group_id'],
+            name=data.get('name', ''),
+            user_ids=data.get('user_ids', ()),
+            group_ids=data.get('group_ids', ()),
         )
+
+
+class EventStore:
+    """Columnar storage for a user's events, supporting efficient time range
+    lookups.
+
+    Rather than holding an object per event, the events' start dates, end
+    dates and ids are held in arrays of integers, sorted by start date, with
+    titles held as references to interned strings. Event objects are only
+    created when they are requested.
+    """
+
+    __slots__ = ('_starts', '_ends', '_max_ends', '_ids', '_titles')
+
+    def __init__(self, events=()):
+        """Build the store.
+
+        Args:
+            events(iterable(Event)): The events to be stored, in any order.
+        """
+        self._set_columns(sorted(
+            (
+                (event.start_date, event.end_date, event.id, event.title)
+                for event in events
+            ),
+            key=_get_start_date,
+        ))
+
+    def get_events(self, start_date=None, end_date=None):
+        """Retrieve the events that overlap with a date range.
+
+        Args:
+            start_date(int): The start date of the range, as a UTC epoch
+                timestamp, or None for every event.
+            end_date(int): The end date of the range, as a UTC epoch
+                timestamp, or None for every event.
+
+        Returns:
+            (list(Event)): The events overlapping with the range, in
+                ascending order by start date.
+        """
+        return [
+            self._get_event(i)
+            for i in self._get_indexes(start_date, end_date)
+        ]
+
+    def get_busy_intervals(self, start_date, end_date):
+        """Retrieve the start and end dates of the events that overlap with a
+        date range, without creating the events themselves.
+
+        Args:
+            start_date(int): The start date of the range, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the events,
+                in ascending order by start date.
+        """
+        starts = self._starts
+        ends = self._ends
+        return [
+            (starts[i], ends[i])
+            for i in self._get_indexes(start_date, end_date)
+        ]
+
+    def get_event(self, event_id):
+        """Retrieve an event by its id.
+
+        Args:
+            event_id(int): The id of the event.
+
+        Returns:
+            (Event): The event, or None if it does not exist.
+        """
+        index = self._get_index(event_id)
+        if index is None:
+            return None
+        return self._get_event(index)
+
+    def add_event(self, event):
+        """Add an event to the store, in order of its start date.
+
+        Args:
+            event(Event): The event.
+        """
+        index = bisect_right(self._starts, event.start_date)
+
+        self._starts.insert(index, event.start_date)
+        self._ends.insert(index, event.end_date)
+        self._ids.insert(index, event.id)
+        self._titles.insert(index, sys.intern(event.title))
+        self._max_ends.insert(index, event.end_date)
+
+        self._update_max_ends(index)
+
+    def remove_event(self, event_id):
+        """Remove an event from the store.
+
+        Args:
+            event_id(int): The id of the event.
+
+        Returns:
+            (Event): The removed event, or None if it does not exist.
+        """
+        index = self._get_index(event_id)
+        if index is None:
+            return None
+
+        event = self._get_event(index)
+        del self._starts[index]
+        del self._ends[index]
+        del self._ids[index]
+        del self._titles[index]
+        del self._max_ends[index]
+
+        self._update_max_ends(index)
+
+        return event
+
+    def get_next_event_id(self):
+        """Determine an id that is not yet used by any event in the store.
+
+        Returns:
+            (int): The id.
+        """
+        return max(self._ids, default=0) + 1
+
+    def __len__(self):
+        return len(self._starts)
+
+    @classmethod
+    def from_json(cls, data):
+        """Build a store from serialized events, without creating an Event
+        for each of them.
+
+        Args:
+            data(list(dict)): The events, in the format read by
+                Event.from_json.
+
+        Returns:
+            (EventStore): The store.
+        """
+        store = cls()
+        store._set_columns(sorted(
+            (
+                (
+                    to_timestamp(event['start']),
+                    to_timestamp(event['end']),
+                    event['id'],
+                    event['title'],
+                )
+                for event in data
+            ),
+            key=_get_start_date,
+        ))
+        return store
+
+    def _set_columns(self, events):
+        """Populate the columns of the store.
+
+        Args:
+            events(list(tuple)): The start date, end date, id and title of
+                each event, in ascending order by start date.
+        """
+        self._starts = array('q', (event[0] for event in events))
+        self._ends = array('q', (event[1] for event in events))
+        self._ids = array('q', (event[2] for event in events))
+        self._titles = [sys.intern(event[3]) for event in events]
+
+        # The running maximum of the end dates, in start date order. As it is
+        # non-decreasing it can be bisected to skip every event that ends
+        # before a range begins, while still catching long-running events
+        # that started well before the range.
+        self._max_ends = array('q', accumulate(self._ends, max))
+
+    def _update_max_ends(self, index):
+        """Recalculate the running maximum of the end dates, from the given
+        index onwards.
+        """
+        max_ends = self._max_ends
+        max_end = max_ends[index - 1] if index else None
+
+        for i in range(index, len(max_ends)):
+            end = self._ends[i]
+            max_end = end if max_end is None else max(max_end, end)
+            max_ends[i] = max_end
+
+    def _get_event(self, index):
+        return Event(self._ids[index], self._titles[index],
+                     self._starts[index], self._ends[index])
+
+    def _get_index(self, event_id):
+        try:
+            return self._ids.index(event_id)
+        except ValueError:
+            return None
+
+    def _get_indexes(self, start_date, end_date):
+        if start_date is None or end_date is None:
+            return range(len(self._starts))
+
+        lo = bisect_right(self._max_ends, start_date)
+        hi = bisect_left(self._starts, end_date)
+
+        ends = self._ends
+        return [i for i in range(lo, hi) if ends[i] > start_date]
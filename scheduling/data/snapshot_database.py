@@ -0,0 +1,369 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+import argparse
+import json
+import mmap
+import struct
+import sys
+
+from data.database import next_version
+from data.exceptions import ReadOnlyDatabaseException, UserNotFoundException
+from data.free_busy import get_free_intervals
+from data.models import Event, User, WorkingHours
+
+MAGIC = b'SCHEDSNP'
+FORMAT_VERSION = 1
+
+# The magic number, format version, byte order, number of users, events and
+# strings, and size of the string data, followed by the offset of each column.
+HEADER = struct.Struct('<8sIBxxxQQQQ13Q')
+
+# The columns of the snapshot, in the order they are stored, with their
+# array type codes. Each user's events are stored contiguously, in ascending
+# order by start date.
+USER_COLUMNS = (
+    ('user_ids', 'q'),
+    ('time_zones', 'I'),
+    ('working_hours_starts', 'H'),
+    ('working_hours_ends', 'H'),
+    ('first_events', 'Q'),
+    ('event_counts', 'Q'),
+)
+EVENT_COLUMNS = (
+    ('event_starts', 'q'),
+    ('event_ends', 'q'),
+    # The running maximum of each user's event end dates, for finding
+    # long-running events that started before a date range.
+    ('event_max_ends', 'q'),
+    ('event_ids', 'q'),
+    ('event_titles', 'I'),
+)
+STRING_COLUMNS = (
+    ('string_offsets', 'Q'),
+    ('string_data', 'B'),
+)
+COLUMNS = USER_COLUMNS + EVENT_COLUMNS + STRING_COLUMNS
+
+BYTE_ORDERS = {'little': 0, 'big': 1}
+
+RECURRING_EVENTS_UNSUPPORTED = (
+    'User id {} has recurring events, which snapshots do not support'
+)
+
+
+class SnapshotDatabase():
+    """A read-only database backed by a memory-mapped binary snapshot.
+
+    Provides the same read interface as data.database.Database. Opening a
+    snapshot only maps it into memory: users and events are read from their
+    columns as they are queried, so startup time does not depend on the
+    size of the data.
+    """
+
+    def __init__(self, filename):
+        """Open a snapshot.
+
+        Args:
+            filename(str): The path to the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot that can be read on
+                this machine.
+        """
+        with open(filename, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f'{filename} is not a supported snapshot')
+
+        (
+            magic,
+            format_version,
+            byte_order,
+            user_count,
+            event_count,
+            string_count,
+            string_data_size,
+            *offsets,
+        ) = HEADER.unpack_from(self._mmap)
+
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f'{filename} is not a supported snapshot')
+        if byte_order != BYTE_ORDERS[sys.byteorder]:
+            raise ValueError(f'{filename} was written with another byte order')
+
+        lengths = (
+            [user_count] * len(USER_COLUMNS) +
+            [event_count] * len(EVENT_COLUMNS) +
+            [string_count + 1, string_data_size]
+        )
+
+        view = memoryview(self._mmap)
+        for (name, typecode), offset, length in zip(COLUMNS, offsets,
+                                                    lengths):
+            size = length * array(typecode).itemsize
+            column = view[offset:offset + size].cast(typecode)
+            setattr(self, f'_{name}', column)
+
+        self._strings = {}
+        self._version = next_version()
+
+    def get_user(self, user_id):
+        """Retrieve a user.
+
+        The user's events are not loaded, and should be retrieved with
+        get_user_events instead.
+
+        Args:
+            user_id(int): The id of the user.
+
+        Returns:
+            (User): The user, without their events.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        i = self._get_user_index(user_id)
+
+        return User(
+            id=user_id,
+            working_hours=WorkingHours(
+                _format_minutes(self._working_hours_starts[i]),
+                _format_minutes(self._working_hours_ends[i]),
+            ),
+            time_zone=self._get_string(self._time_zones[i]),
+            events=[],
+        )
+
+    def get_user_ids(self):
+        """Retrieve the ids of every user.
+
+        Returns:
+            (list(int)): The ids of the users, in ascending order.
+        """
+        return self._user_ids.tolist()
+
+    def get_user_events(self, user_id, start_date, end_date):
+        """Retrieve the events of a user that overlap with a date range.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(Event)): The events overlapping with the range, in
+                ascending order by start date.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        return [
+            Event(
+                id=self._event_ids[i],
+                title=self._get_string(self._event_titles[i]),
+                start_date=self._event_starts[i],
+                end_date=self._event_ends[i],
+            )
+            for i in self._get_event_indexes(user_id, start_date, end_date)
+        ]
+
+    def get_user_busy_intervals(self, user_id, start_date, end_date):
+        """Retrieve the start and end dates of a user's events that overlap
+        with a date range.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the events,
+                in ascending order by start date.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        return [
+            (self._event_starts[i], self._event_ends[i])
+            for i in self._get_event_indexes(user_id, start_date, end_date)
+        ]
+
+    def get_user_version(self, user_id):
+        """Retrieve the version of a user's data.
+
+        As snapshots are read-only, the version only changes when the
+        snapshot is reopened.
+
+        Args:
+            user_id(int): The id of the user.
+
+        Returns:
+            (int): The version of the user's data.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        self._get_user_index(user_id)
+        return self._version
+
+    def get_user_free_intervals(self, user_id, start_date, end_date):
+        """Retrieve the intervals within a date range during which a user has
+        no events.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the free
+                intervals, clipped to the date range, in ascending order.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        return get_free_intervals(
+            self.get_user_busy_intervals(user_id, start_date, end_date),
+            start_date,
+            end_date,
+        )
+
+    def create_event(self, user_id, title, start_date, end_date):
+        raise ReadOnlyDatabaseException()
+
+    def update_event(self, user_id, event_id, title, start_date, end_date):
+        raise ReadOnlyDatabaseException()
+
+    def delete_event(self, user_id, event_id):
+        raise ReadOnlyDatabaseException()
+
+    def _get_event_indexes(self, user_id, start_date, end_date):
+        i = self._get_user_index(user_id)
+        first_event = self._first_events[i]
+        last_event = first_event + self._event_counts[i]
+
+        lo = bisect_right(self._event_max_ends, start_date,
+                          first_event, last_event)
+        hi = bisect_left(self._event_starts, end_date, lo, last_event)
+
+        ends = self._event_ends
+        return [i for i in range(lo, hi) if ends[i] > start_date]
+
+    def _get_user_index(self, user_id):
+        i = bisect_left(self._user_ids, user_id)
+        if i == len(self._user_ids) or self._user_ids[i] != user_id:
+            raise UserNotFoundException(user_id)
+        return i
+
+    def _get_string(self, i):
+        string = self._strings.get(i)
+        if string is None:
+            start, end = self._string_offsets[i], self._string_offsets[i + 1]
+            string = bytes(self._string_data[start:end]).decode('utf-8')
+            self._strings[i] = string
+        return string
+
+
+def write_snapshot(users, filename):
+    """Write users and their events to a snapshot file.
+
+    Args:
+        users(iterable(User)): The users to be written.
+        filename(str): The path to the snapshot file.
+
+    Raises:
+        ValueError: If any of the users have recurring events.
+    """
+    strings = {}
+
+    def intern(string):
+        return strings.setdefault(string, len(strings))
+
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+
+    for user in sorted(users, key=lambda u: u.id):
+        if user.recurring_events:
+            raise ValueError(RECURRING_EVENTS_UNSUPPORTED.format(user.id))
+
+        events = sorted(user.events, key=lambda e: e.start_date)
+
+        columns['user_ids'].append(user.id)
+        columns['time_zones'].append(intern(user.time_zone))
+        columns['working_hours_starts'].append(
+            _to_minutes(user.working_hours.start),
+        )
+        columns['working_hours_ends'].append(
+            _to_minutes(user.working_hours.end),
+        )
+        columns['first_events'].append(len(columns['event_ids']))
+        columns['event_counts'].append(len(events))
+
+        columns['event_starts'].extend(event.start_date for event in events)
+        columns['event_ends'].extend(event.end_date for event in events)
+        columns['event_max_ends'].extend(
+            accumulate((event.end_date for event in events), max)
+        )
+        columns['event_ids'].extend(event.id for event in events)
+        columns['event_titles'].extend(intern(event.title) for event in events)
+
+    encoded_strings = [string.encode('utf-8') for string in strings]
+    columns['string_offsets'].extend(
+        accumulate([0] + [len(string) for string in encoded_strings])
+    )
+    columns['string_data'].frombytes(b''.join(encoded_strings))
+
+    # Each column is aligned to eight bytes, following the header.
+    offsets = []
+    offset = HEADER.size
+    for name, _ in COLUMNS:
+        offset += -offset % 8
+        offsets.append(offset)
+        offset += len(columns[name]) * columns[name].itemsize
+
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            BYTE_ORDERS[sys.byteorder],
+            len(columns['user_ids']),
+            len(columns['event_ids']),
+            len(strings),
+            len(columns['string_data']),
+            *offsets,
+        ))
+        for (name, _), offset in zip(COLUMNS, offsets):
+            f.write(b'\0' * (offset - f.tell()))
+            columns[name].tofile(f)
+
+
+def _to_minutes(time):
+    return time.hour * 60 + time.minute
+
+
+def _format_minutes(minutes):
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Convert a JSON database file into a snapshot.',
+    )
+    parser.add_argument('json_filename')
+    parser.add_argument('filename')
+    args = parser.parse_args()
+
+    with open(args.json_filename) as f:
+        data = json.load(f)
+
+    write_snapshot(
+        (User.from_json(user_data) for user_data in data),
+        args.filename,
+    )
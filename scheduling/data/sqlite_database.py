@@ -0,0 +1,526 @@
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from threading import Lock
+import argparse
+import json
+import sqlite3
+
+from data.exceptions import EventNotFoundException, UserNotFoundException
+from data.free_busy import get_free_intervals
+from data.models import Event, User, WorkingHours
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    working_hours_start TEXT NOT NULL,
+    working_hours_end TEXT NOT NULL,
+    time_zone TEXT NOT NULL,
+    max_event_duration INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    "end" INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS events_user_id_start_end
+    ON events (user_id, start, "end");
+
+CREATE TABLE IF NOT EXISTS event_ids (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_id INTEGER NOT NULL
+);
+'''
+
+# The default maximum number of open connections to the database.
+DEFAULT_POOL_SIZE = 8
+
+RECURRING_EVENTS_UNSUPPORTED = (
+    'User id {} has recurring events, which SQLite databases do not support'
+)
+
+
+class ConnectionPool():
+    """A thread-safe pool of SQLite connections.
+
+    Connections are opened as they are needed, up to the size of the pool,
+    and are only ever used by one thread at a time.
+    """
+
+    def __init__(self, filename, size=DEFAULT_POOL_SIZE):
+        """Initialize the pool.
+
+        Args:
+            filename(str): The path to the SQLite database file.
+            size(int): The maximum number of open connections.
+        """
+        self._filename = filename
+        self._size = size
+        self._opened = 0
+        self._idle = LifoQueue()
+        self._lock = Lock()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection from the pool, waiting for one to become
+        available if every connection is in use.
+
+        Yields:
+            (sqlite3.Connection): The connection, which is returned to the
+                pool afterwards.
+        """
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        with self._lock:
+            should_open = self._opened < self._size
+            if should_open:
+                self._opened += 1
+
+        if should_open:
+            return self._connect()
+
+        return self._idle.get()
+
+    def _connect(self):
+        connection = sqlite3.connect(self._filename, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+
+class SQLiteDatabase():
+    """A database backed by SQLite.
+
+    Provides the same interface as data.database.Database, but rather than
+    holding every user and event in memory, events are retrieved with
+    indexed range queries as they are needed.
+    """
+
+    def __init__(self, filename, pool_size=DEFAULT_POOL_SIZE):
+        """Open the database, creating its tables if they do not exist.
+
+        Args:
+            filename(str): The path to the SQLite database file.
+            pool_size(int): The maximum number of open connections.
+        """
+        self._pool = ConnectionPool(filename, pool_size)
+
+        with self._pool.connection() as connection:
+            connection.executescript(SCHEMA)
+
+            # Databases created before event ids were tracked start from
+            # their highest event id.
+            with connection:
+                connection.execute(
+                    'INSERT OR IGNORE INTO event_ids (id, last_id) '
+                    'SELECT 1, COALESCE(MAX(id), 0) FROM events',
+                )
+
+    def get_user(self, user_id):
+        """Retrieve a user.
+
+        The user's events are not loaded, and should be retrieved with
+        get_user_events instead.
+
+        Args:
+            user_id(int): The id of the user.
+
+        Returns:
+            (User): The user, without their events.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        with self._pool.connection() as connection:
+            row = self._get_user_row(connection, user_id)
+
+        working_hours_start, working_hours_end, time_zone = row[:3]
+
+        return User(
+            id=user_id,
+            working_hours=WorkingHours(working_hours_start, working_hours_end),
+            time_zone=time_zone,
+            events=[],
+        )
+
+    def get_user_ids(self):
+        """Retrieve the ids of every user.
+
+        Returns:
+            (list(int)): The ids of the users, in ascending order.
+        """
+        with self._pool.connection() as connection:
+            rows = connection.execute(
+                'SELECT id FROM users ORDER BY id',
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def get_user_events(self, user_id, start_date, end_date):
+        """Retrieve the events of a user that overlap with a date range.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(Event)): The events overlapping with the range, in
+                ascending order by start date.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        rows = self._get_event_rows(
+            'id, title, start, "end"',
+            user_id,
+            start_date,
+            end_date,
+        )
+
+        return [
+            Event(id=id, title=title, start_date=start, end_date=end)
+            for id, title, start, end in rows
+        ]
+
+    def get_user_busy_intervals(self, user_id, start_date, end_date):
+        """Retrieve the start and end dates of a user's events that overlap
+        with a date range.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the events,
+                in ascending order by start date.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        return self._get_event_rows('start, "end"', user_id, start_date,
+                                    end_date)
+
+    def get_user_free_intervals(self, user_id, start_date, end_date):
+        """Retrieve the intervals within a date range during which a user has
+        no events.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the free
+                intervals, clipped to the date range, in ascending order.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        return get_free_intervals(
+            self.get_user_busy_intervals(user_id, start_date, end_date),
+            start_date,
+            end_date,
+        )
+
+    def get_user_version(self, user_id):
+        """Retrieve the version of a user's data.
+
+        Args:
+            user_id(int): The id of the user.
+
+        Returns:
+            (int): The version of the user's data.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        with self._pool.connection() as connection:
+            return self._get_user_row(connection, user_id)[4]
+
+    def set_user(self, user):
+        """Add a user to the database, replacing any existing user with the
+        same id.
+
+        Args:
+            user(User): The user, including all of their events.
+        """
+        with self._pool.connection() as connection, connection:
+            self._set_user(connection, user)
+
+    def create_event(self, user_id, title, start_date, end_date):
+        """Add a new event to a user's schedule.
+
+        Args:
+            user_id(int): The id of the user.
+            title(str): The title of the event.
+            start_date(int): The start date of the event, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the event, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (Event): The event, with a newly allocated id, which is unique
+                across the database and never reused.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        with self._pool.connection() as connection, connection:
+            # Updating the user first takes the database's write lock, so
+            # that no other connection can allocate the same id.
+            self._update_user(connection, user_id, end_date - start_date)
+
+            event_id, = connection.execute(
+                'UPDATE event_ids SET last_id = last_id + 1 RETURNING last_id',
+            ).fetchone()
+
+            connection.execute(
+                '''
+                INSERT INTO events (user_id, id, title, start, "end")
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                (user_id, event_id, title, start_date, end_date),
+            )
+
+        return Event(
+            id=event_id,
+            title=title,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    def update_event(self, user_id, event_id, title, start_date, end_date):
+        """Replace the details of one of a user's events.
+
+        Args:
+            user_id(int): The id of the user.
+            event_id(int): The id of the event.
+            title(str): The new title of the event.
+            start_date(int): The new start date of the event, as a UTC epoch
+                timestamp.
+            end_date(int): The new end date of the event, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (Event): The updated event.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+            EventNotFoundException: If the user has no such event.
+        """
+        with self._pool.connection() as connection, connection:
+            self._update_user(connection, user_id, end_date - start_date)
+
+            cursor = connection.execute(
+                '''
+                UPDATE events
+                SET title = ?, start = ?, "end" = ?
+                WHERE user_id = ? AND id = ?
+                ''',
+                (title, start_date, end_date, user_id, event_id),
+            )
+            if not cursor.rowcount:
+                raise EventNotFoundException(event_id)
+
+        return Event(
+            id=event_id,
+            title=title,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    def delete_event(self, user_id, event_id):
+        """Remove one of a user's events.
+
+        Args:
+            user_id(int): The id of the user.
+            event_id(int): The id of the event.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+            EventNotFoundException: If the user has no such event.
+        """
+        with self._pool.connection() as connection, connection:
+            self._update_user(connection, user_id, 0)
+
+            cursor = connection.execute(
+                'DELETE FROM events WHERE user_id = ? AND id = ?',
+                (user_id, event_id),
+            )
+            if not cursor.rowcount:
+                raise EventNotFoundException(event_id)
+
+    @classmethod
+    def from_json_file(cls, json_filename, filename,
+                       pool_size=DEFAULT_POOL_SIZE):
+        """Import the users in a JSON database file into a SQLite database.
+
+        Args:
+            json_filename(str): The path to the JSON database file, in the
+                format read by data.database.Database.from_file.
+            filename(str): The path to the SQLite database file.
+            pool_size(int): The maximum number of open connections.
+
+        Returns:
+            (SQLiteDatabase): The SQLite database.
+
+        Raises:
+            ValueError: If any of the users have recurring events.
+        """
+        with open(json_filename) as f:
+            data = json.load(f)
+
+        db = cls(filename, pool_size)
+
+        with db._pool.connection() as connection, connection:
+            for user_data in data:
+                db._set_user(connection, User.from_json(user_data))
+
+        return db
+
+    def _get_event_rows(self, columns, user_id, start_date, end_date):
+        with self._pool.connection() as connection:
+            max_event_duration = self._get_user_row(connection, user_id)[3]
+
+            # No event can overlap with the range if it starts more than the
+            # user's longest event before the range, which bounds the index
+            # scan for users with long histories.
+            return connection.execute(
+                f'''
+                SELECT {columns}
+                FROM events
+                WHERE user_id = ?
+                    AND start < ?
+                    AND start >= ?
+                    AND "end" > ?
+                ORDER BY start
+                ''',
+                (
+                    user_id,
+                    end_date,
+                    start_date - max_event_duration,
+                    start_date,
+                ),
+            ).fetchall()
+
+    def _get_user_row(self, connection, user_id):
+        row = connection.execute(
+            '''
+            SELECT working_hours_start, working_hours_end, time_zone,
+                max_event_duration, version
+            FROM users
+            WHERE id = ?
+            ''',
+            (user_id,),
+        ).fetchone()
+
+        if row is None:
+            raise UserNotFoundException(user_id)
+
+        return row
+
+    def _update_user(self, connection, user_id, event_duration):
+        """Record a change to a user's events, bumping their version.
+
+        The longest event duration is only ever raised, as it remains a valid
+        bound on the duration of the user's events after one is removed.
+        """
+        cursor = connection.execute(
+            '''
+            UPDATE users
+            SET max_event_duration = MAX(max_event_duration, ?),
+                version = version + 1
+            WHERE id = ?
+            ''',
+            (event_duration, user_id),
+        )
+        if not cursor.rowcount:
+            raise UserNotFoundException(user_id)
+
+    def _set_user(self, connection, user):
+        if user.recurring_events:
+            raise ValueError(RECURRING_EVENTS_UNSUPPORTED.format(user.id))
+
+        max_event_duration = max(
+            (event.end_date - event.start_date for event in user.events),
+            default=0,
+        )
+        last_event_id = max((event.id for event in user.events), default=0)
+
+        connection.execute(
+            '''
+            INSERT INTO users (id, working_hours_start, working_hours_end,
+                time_zone, max_event_duration)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                working_hours_start = excluded.working_hours_start,
+                working_hours_end = excluded.working_hours_end,
+                time_zone = excluded.time_zone,
+                max_event_duration = excluded.max_event_duration,
+                version = version + 1
+            ''',
+            (
+                user.id,
+                _format_working_hours_time(user.working_hours.start),
+                _format_working_hours_time(user.working_hours.end),
+                user.time_zone,
+                max_event_duration,
+            ),
+        )
+        connection.execute('DELETE FROM events WHERE user_id = ?', (user.id,))
+        connection.executemany(
+            '''
+            INSERT INTO events (user_id, id, title, start, "end")
+            VALUES (?, ?, ?, ?, ?)
+            ''',
+            (
+                (
+                    user.id,
+                    event.id,
+                    event.title,
+                    event.start_date,
+                    event.end_date,
+                )
+                for event in user.events
+            ),
+        )
+        connection.execute(
+            'UPDATE event_ids SET last_id = MAX(last_id, ?)',
+            (last_event_id,),
+        )
+
+
+def _format_working_hours_time(time):
+    return f'{time.hour:02d}:{time.minute:02d}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Import a JSON database file into a SQLite database.',
+    )
+    parser.add_argument('json_filename')
+    parser.add_argument('filename')
+    args = parser.parse_args()
+
+    SQLiteDatabase.from_json_file(args.json_filename, args.filename)
@@ -0,0 +1,106 @@
+"""Run a sharded deployment of the API on a single machine.
+
+Run from the scheduling directory, for example:
+
+    python run_sharded.py --shards 4 --port 5000
+
+A process is started for each shard, serving the users it owns on
+consecutive ports after the coordinator's, followed by a coordinator on the
+given port, which fans availability requests out to the shards. Each process
+is configured through the same environment variables as a deployment across
+several machines would be.
+"""
+import argparse
+import multiprocessing
+import os
+
+
+def serve(host, port, environ):
+    """Serve the API in the current process.
+
+    The application is imported only once the environment is configured, as
+    the database and shards are loaded when it is first imported.
+
+    Args:
+        host(str): The host on which to listen.
+        port(int): The port on which to listen.
+        environ(dict(str, str)): The environment variables configuring the
+            process.
+    """
+    os.environ.update(environ)
+
+    from werkzeug.serving import run_simple
+
+    from app import app
+
+    run_simple(host, port, app, threaded=True)
+
+
+def get_process_environs(shard_count, host, port):
+    """Build the environment of each process in a sharded deployment.
+
+    Args:
+        shard_count(int): The number of shards.
+        host(str): The host on which the processes listen.
+        port(int): The coordinator's port. Shards listen on the ports that
+            follow it.
+
+    Returns:
+        (list(tuple(int, dict(str, str)))): The port and environment
+            variables of each shard, followed by those of the coordinator.
+    """
+    shard_ports = [port + 1 + i for i in range(shard_count)]
+
+    environs = [
+        (
+            shard_port,
+            {
+                'SCHEDULING_SHARD_INDEX': str(i),
+                'SCHEDULING_SHARD_COUNT': str(shard_count),
+            },
+        )
+        for i, shard_port in enumerate(shard_ports)
+    ]
+    environs.append((
+        port,
+        {
+            'SCHEDULING_SHARD_URLS': ','.join(
+                f'http://{host}:{shard_port}' for shard_port in shard_ports
+            ),
+        },
+    ))
+
+    return environs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Run a sharded deployment of the API on this machine.',
+    )
+    parser.add_argument('--shards', type=int, default=2)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000,
+                        help="the coordinator's port")
+    args = parser.parse_args()
+
+    processes = [
+        multiprocessing.Process(
+            target=serve,
+            args=(args.host, port, environ),
+        )
+        for port, environ in get_process_environs(
+            args.shards,
+            args.host,
+            args.port,
+        )
+    ]
+
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
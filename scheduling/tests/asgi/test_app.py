@@ -0,0 +1,214 @@
+import asyncio
+from threading import Barrier
+import time
+
+import pytest
+
+from app import app as flask_app
+from asgi import app
+from data.async_database import AsyncDatabase
+import views.async_availability
+import views.availability
+import views.metrics
+
+QUERY_STRING = (
+    'user_id=1&user_id=2&start_date=2019-01-01T00:00:00%2B0000'
+    '&end_date=2019-01-08T00:00:00%2B0000'
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    views.availability.user_availability_cache.clear()
+    views.availability.common_availability_cache.clear()
+
+
+class _SlowDatabase():
+    """A database whose free intervals take a while to fetch, waiting on a
+    barrier if one is provided.
+    """
+
+    def __init__(self, db, delay=0, barrier=None):
+        self._db = db
+        self._delay = delay
+        self._barrier = barrier
+
+    def get_user_free_intervals(self, *args):
+        time.sleep(self._delay)
+        if self._barrier is not None:
+            self._barrier.wait()
+        return self._db.get_user_free_intervals(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+def _use_database(monkeypatch, db):
+    monkeypatch.setattr(views.async_availability, 'async_db',
+                        AsyncDatabase(db))
+
+
+async def _request(path, query_string=''):
+    """Send a GET request to the ASGI app, returning the status, headers and
+    body of its response.
+    """
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(
+        {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': query_string.encode('latin-1'),
+            'headers': [],
+        },
+        receive,
+        send,
+    )
+
+    start = messages[0]
+    return (
+        start['status'],
+        dict(start['headers']),
+        b''.join(message.get('body', b'') for message in messages[1:]),
+    )
+
+
+@pytest.mark.parametrize('extra', [
+    '',
+    '&stream=true',
+    '&format=compact',
+    '&include_non_working_hours=true',
+    '&min_attendees=1',
+    '&granularity=30',
+    '&min_duration=60&limit=2',
+])
+def test__matches_flask_app(extra):
+    """Responses match those of the Flask app, including streamed ones."""
+    status, headers, body = asyncio.run(
+        _request('/scheduling/availability/', QUERY_STRING + extra),
+    )
+
+    views.availability.common_availability_cache.clear()
+    response = flask_app.test_client().get(
+        f'/scheduling/availability/?{QUERY_STRING}{extra}',
+    )
+    assert status == response.status_code
+    assert headers[b'content-type'] == response.content_type.encode()
+    assert body == response.get_data()
+
+
+def test__missing_user():
+    """Missing users are reported as they are by the Flask app."""
+    status, _, body = asyncio.run(_request(
+        '/scheduling/availability/',
+        'user_id=99&start_date=2019-01-01T00:00:00%2B0000'
+        '&end_date=2019-01-02T00:00:00%2B0000',
+    ))
+
+    assert status == 404
+    assert b'User id 99 does not exist' in body
+
+
+def test__invalid_parameters():
+    """Invalid parameters are reported as they are by the Flask app."""
+    status, _, body = asyncio.run(_request(
+        '/scheduling/availability/',
+        'user_id=1&start_date=2019-01-02T00:00:00%2B0000'
+        '&end_date=2019-01-01T00:00:00%2B0000',
+    ))
+
+    response = flask_app.test_client().get(
+        '/scheduling/availability/?user_id=1'
+        '&start_date=2019-01-02T00:00:00%2B0000'
+        '&end_date=2019-01-01T00:00:00%2B0000',
+    )
+    assert status == response.status_code == 400
+    assert body == response.get_data()
+
+
+def test__users_are_fetched_concurrently(monkeypatch):
+    """Every user's free intervals are fetched at the same time, rather
+    than one after another.
+    """
+    _use_database(monkeypatch, _SlowDatabase(
+        views.availability.db,
+        barrier=Barrier(2, timeout=5),
+    ))
+
+    status, _, _ = asyncio.run(
+        _request('/scheduling/availability/', QUERY_STRING),
+    )
+
+    assert status == 200
+
+
+def test__shares_caches_with_flask_app(monkeypatch):
+    """Availability computed by the ASGI app is reused by the Flask app."""
+    status, _, body = asyncio.run(
+        _request('/scheduling/availability/', QUERY_STRING),
+    )
+
+    def fail(*args):
+        raise AssertionError('availability was computed again')
+
+    monkeypatch.setattr(views.availability, '_get_common_availability',
+                        fail)
+    response = flask_app.test_client().get(
+        f'/scheduling/availability/?{QUERY_STRING}',
+    )
+    assert response.status_code == status == 200
+    assert response.get_data() == body
+
+
+def test__event_loop_is_not_blocked(monkeypatch):
+    """Users' data is fetched outside of the event loop, so other tasks
+    keep running while it is.
+    """
+    _use_database(monkeypatch,
+                  _SlowDatabase(views.availability.db, delay=0.2))
+
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await _request('/scheduling/availability/', QUERY_STRING)
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(main()) > 5
+
+
+@pytest.mark.parametrize('path,module,name', [
+    (
+        '/scheduling/availability/',
+        views.async_availability,
+        'combine_user_availabilities',
+    ),
+    ('/scheduling/metrics', views.metrics, 'render_metrics'),
+])
+def test__unhandled_errors_are_internal_server_errors(path, module, name,
+                                                      monkeypatch):
+    """An unhandled error, whether in the asynchronous view or in the Flask
+    app, becomes a 500 response rather than escaping the ASGI app.
+    """
+    def fail(*args):
+        raise RuntimeError('Unexpected error')
+
+    monkeypatch.setattr(module, name, fail)
+
+    status, _, _ = asyncio.run(_request(path, QUERY_STRING))
+
+    assert status == 500
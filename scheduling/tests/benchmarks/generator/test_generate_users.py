@@ -0,0 +1,57 @@
+from benchmarks.generator import generate_users
+from data.models import User
+
+
+def test__same_seed_generates_same_users():
+    """Generated users only depend on the arguments, so benchmarks can be
+    compared across runs.
+    """
+    assert generate_users(user_count=5, seed=1) == generate_users(
+        user_count=5,
+        seed=1,
+    )
+    assert generate_users(user_count=5, seed=1) != generate_users(
+        user_count=5,
+        seed=2,
+    )
+
+
+def test__generated_users_can_be_loaded():
+    """Generated users are in the format of the JSON database, with the
+    requested number of users, days and time zones.
+    """
+    users = generate_users(
+        user_count=3,
+        days=10,
+        events_per_day=2,
+        time_zones=['Asia/Tokyo'],
+    )
+
+    assert [user['user_id'] for user in users] == [1, 2, 3]
+
+    for user_data in users:
+        user = User.from_json(user_data)
+
+        assert user.time_zone == 'Asia/Tokyo'
+        assert len(user.events) == 20
+        assert all(
+            event.end_date > event.start_date
+            for event in user.events
+        )
+
+
+def test__overlap_rate():
+    """Without overlaps, events are placed independently, while with every
+    event overlapping, each starts during the one before it.
+    """
+    users = generate_users(user_count=1, days=5, overlap_rate=1)
+    events = [
+        (event.start_date, event.end_date)
+        for event in User.from_json(users[0]).events
+    ]
+
+    assert all(
+        previous_start <= start < previous_end
+        for (previous_start, previous_end), (start, _)
+        in zip(events, events[1:])
+    )
@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+from data.async_database import AsyncDatabase
+from data.database import Database
+from data.exceptions import UserNotFoundException
+from data.models import Event, User, WorkingHours
+
+START_DATE = 0
+END_DATE = 1000
+
+
+def _database(user_count):
+    return Database({
+        user_id: User(
+            id=user_id,
+            working_hours=WorkingHours('09:00', '17:00'),
+            time_zone='UTC',
+            events=[Event(1, 'Event', 100 * user_id, 100 * user_id + 50)],
+        )
+        for user_id in range(1, user_count + 1)
+    })
+
+
+def test__matches_synchronous_database():
+    """Awaited calls return the same results as the wrapped database."""
+    db = _database(2)
+    async_db = AsyncDatabase(db)
+
+    async def get_free_intervals():
+        return await async_db.get_user_free_intervals(2, START_DATE, END_DATE)
+
+    assert (
+        asyncio.run(get_free_intervals()) ==
+        db.get_user_free_intervals(2, START_DATE, END_DATE)
+    )
+
+
+def test__users_are_fetched_concurrently():
+    """Calls for different users run at the same time, rather than one
+    after another.
+    """
+    user_count = 4
+    db = _database(user_count)
+
+    # Each call waits until every call has started, so this only completes
+    # if the calls are running concurrently.
+    barrier = Barrier(user_count, timeout=5)
+
+    class SlowDatabase():
+        def get_user_free_intervals(self, *args):
+            barrier.wait()
+            return db.get_user_free_intervals(*args)
+
+    async_db = AsyncDatabase(SlowDatabase(), ThreadPoolExecutor(user_count))
+
+    async def get_free_intervals():
+        return await asyncio.gather(*(
+            async_db.get_user_free_intervals(user_id, START_DATE, END_DATE)
+            for user_id in range(1, user_count + 1)
+        ))
+
+    assert asyncio.run(get_free_intervals()) == [
+        db.get_user_free_intervals(user_id, START_DATE, END_DATE)
+        for user_id in range(1, user_count + 1)
+    ]
+
+
+def test__exceptions_are_raised_when_awaited():
+    """Exceptions raised by the wrapped database are raised by the awaited
+    call.
+    """
+    async_db = AsyncDatabase(_database(1))
+
+    with pytest.raises(UserNotFoundException):
+        asyncio.run(async_db.get_user(2))
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from data.database import Database
+from data.exceptions import UserNotFoundException
+
+
+def test__shard(tmp_path):
+    """Only the users owned by a shard are loaded into it."""
+    filename = tmp_path / 'db.json'
+    filename.write_text(json.dumps([
+        {
+            'user_id': user_id,
+            'time_zone': 'UTC',
+            'working_hours': {'start': '09:00', 'end': '17:00'},
+            'events': [],
+        }
+        for user_id in range(1, 6)
+    ]))
+
+    db = Database.from_file(str(filename), shard=(1, 2))
+
+    assert [db.get_user(user_id).id for user_id in (1, 3, 5)] == [1, 3, 5]
+    with pytest.raises(UserNotFoundException):
+        db.get_user(2)
@@ -0,0 +1,81 @@
+import pytest
+
+from data.database import Database
+from data.exceptions import UserNotFoundException
+from data.models import Event, User, WorkingHours
+from utils.dates import to_timestamp
+
+START_DATE = '2019-01-02T09:00:00+0000'
+END_DATE = '2019-01-02T17:00:00+0000'
+START_TIMESTAMP = to_timestamp(START_DATE)
+END_TIMESTAMP = to_timestamp(END_DATE)
+
+
+def _event(id, start_date, end_date):
+    return Event(id=id, title=str(id), start_date=to_timestamp(start_date),
+                 end_date=to_timestamp(end_date))
+
+
+def _database(events):
+    user = User(
+        id=1,
+        working_hours=WorkingHours('09:00', '17:00'),
+        time_zone='UTC',
+        events=events,
+    )
+    return Database({1: user})
+
+
+def test__unknown_user():
+    """Looking up the events of a missing user raises an exception."""
+    with pytest.raises(UserNotFoundException):
+        _database([]).get_user_events(2, START_TIMESTAMP, END_TIMESTAMP)
+
+
+def test__events_outside_of_range_are_excluded():
+    """Only events overlapping with the date range are returned."""
+    before = _event(1, '2019-01-01T10:00:00+0000', '2019-01-01T11:00:00+0000')
+    touching = _event(2, '2019-01-02T08:00:00+0000', START_DATE)
+    inside = _event(3, '2019-01-02T10:00:00+0000', '2019-01-02T11:00:00+0000')
+    after = _event(4, END_DATE, '2019-01-02T18:00:00+0000')
+
+    db = _database([after, inside, touching, before])
+
+    assert db.get_user_events(1, START_TIMESTAMP, END_TIMESTAMP) == [inside]
+
+
+def test__long_running_event_starting_before_range():
+    """Events that start well before the range but overlap with it are
+    returned, in ascending order by start date.
+    """
+    long_running = _event(
+        1,
+        '2018-12-01T00:00:00+0000',
+        '2019-01-02T10:00:00+0000',
+    )
+    short = _event(2, '2018-12-02T10:00:00+0000', '2018-12-02T11:00:00+0000')
+    inside = _event(3, '2019-01-02T12:00:00+0000', '2019-01-02T13:00:00+0000')
+
+    db = _database([inside, short, long_running])
+
+    assert db.get_user_events(1, START_TIMESTAMP, END_TIMESTAMP) == [
+        long_running,
+        inside,
+    ]
+
+
+def test__busy_intervals_match_events():
+    """The busy intervals of a user are the start and end dates of the
+    events that would be returned for the same range.
+    """
+    touching = _event(1, '2019-01-02T08:00:00+0000', START_DATE)
+    long_running = _event(2, '2019-01-01T00:00:00+0000',
+                          '2019-01-02T12:00:00+0000')
+    inside = _event(3, '2019-01-02T10:00:00+0000', '2019-01-02T11:00:00+0000')
+
+    db = _database([inside, touching, long_running])
+
+    assert db.get_user_busy_intervals(1, START_TIMESTAMP, END_TIMESTAMP) == [
+        (long_running.start_date, long_running.end_date),
+        (inside.start_date, inside.end_date),
+    ]
@@ -0,0 +1,39 @@
+import pytest
+
+from data.database import Database
+from data.exceptions import UserNotFoundException
+from data.models import User, WorkingHours
+
+
+def _user(id):
+    return User(
+        id=id,
+        working_hours=WorkingHours('09:00', '17:00'),
+        time_zone='UTC',
+        events=[],
+    )
+
+
+def test__unknown_user():
+    """Looking up the version of a missing user raises an exception."""
+    with pytest.raises(UserNotFoundException):
+        Database({}).get_user_version(1)
+
+
+def test__changing_a_user_changes_only_their_version():
+    """Replacing a user changes their version, but no one else's."""
+    db = Database({1: _user(1), 2: _user(2)})
+    version1 = db.get_user_version(1)
+    version2 = db.get_user_version(2)
+
+    db.set_user(_user(1))
+
+    assert db.get_user_version(1) != version1
+    assert db.get_user_version(2) == version2
+
+
+def test__reloaded_database_has_new_versions():
+    """Versions are never reused by a reloaded database."""
+    version = Database({1: _user(1)}).get_user_version(1)
+
+    assert Database({1: _user(1)}).get_user_version(1) != version
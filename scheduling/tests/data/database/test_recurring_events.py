@@ -0,0 +1,131 @@
+from data.database import Database
+from data.models import Event, Recurrence, RecurringEvent, User, WorkingHours
+from utils.dates import to_isoformat, to_timestamp
+from utils.recurrence import _expand_bucket
+
+HOUR = 60 * 60
+
+
+def _database(recurring_event, time_zone='UTC'):
+    user = User(
+        id=1,
+        working_hours=WorkingHours('09:00', '17:00'),
+        time_zone=time_zone,
+        events=[
+            Event(id=1, title='One-off',
+                  start_date=to_timestamp('2019-03-05T16:00:00+0000'),
+                  end_date=to_timestamp('2019-03-05T17:00:00+0000')),
+        ],
+        recurring_events=[recurring_event],
+    )
+    return Database({1: user})
+
+
+def _get_starts(db, start_date, end_date):
+    return [
+        to_isoformat(event.start_date)
+        for event in db.get_user_events(
+            1,
+            to_timestamp(start_date),
+            to_timestamp(end_date),
+        )
+    ]
+
+
+def test__weekly_event():
+    """Weekly events recur at the same local time, across daylight saving
+    time transitions, except for cancelled occurrences. Occurrences are
+    merged with the user's other events.
+    """
+    db = _database(
+        RecurringEvent(
+            id=2,
+            title='1:1',
+            start_date=to_timestamp('2019-03-01T15:00:00+0000'),
+            end_date=to_timestamp('2019-03-01T15:30:00+0000'),
+            recurrence=Recurrence(
+                'weekly',
+                exceptions={to_timestamp('2019-03-15T14:00:00+0000')},
+            ),
+        ),
+        time_zone='America/New_York',
+    )
+
+    result = _get_starts(db, '2019-03-01T00:00:00+0000',
+                         '2019-03-30T00:00:00+0000')
+
+    assert result == [
+        '2019-03-01T15:00:00+00:00',
+        '2019-03-05T16:00:00+00:00',
+        '2019-03-08T15:00:00+00:00',
+        '2019-03-22T14:00:00+00:00',
+        '2019-03-29T14:00:00+00:00',
+    ]
+
+
+def test__monthly_event():
+    """Monthly events skip months without their day of the month, which do
+    not count towards the number of occurrences.
+    """
+    db = _database(RecurringEvent(
+        id=2,
+        title='Review',
+        start_date=to_timestamp('2019-01-31T10:00:00+0000'),
+        end_date=to_timestamp('2019-01-31T11:00:00+0000'),
+        recurrence=Recurrence('monthly', count=4),
+    ))
+
+    result = _get_starts(db, '2019-06-01T00:00:00+0000',
+                         '2020-01-01T00:00:00+0000')
+
+    assert result == [
+        '2019-07-31T10:00:00+00:00',
+    ]
+
+
+def test__daily_event_free_intervals():
+    """Occurrences that start before the date range still take up the time
+    they overlap with it.
+    """
+    db = _database(RecurringEvent(
+        id=2,
+        title='Night shift',
+        start_date=to_timestamp('2019-01-01T22:00:00+0000'),
+        end_date=to_timestamp('2019-01-02T06:00:00+0000'),
+        recurrence=Recurrence(
+            'daily',
+            interval=2,
+            until=to_timestamp('2019-01-10T00:00:00+0000'),
+        ),
+    ))
+    start_date = to_timestamp('2019-01-04T00:00:00+0000')
+
+    result = db.get_user_free_intervals(1, start_date, start_date + 72 * HOUR)
+
+    assert result == [
+        (start_date + 6 * HOUR, start_date + 46 * HOUR),
+        (start_date + 54 * HOUR, start_date + 72 * HOUR),
+    ]
+
+
+def test__expansion_is_windowed():
+    """Only the occurrences around the date range are expanded, however long
+    ago the event began recurring.
+    """
+    db = _database(RecurringEvent(
+        id=2,
+        title='Stand-up',
+        start_date=to_timestamp('2000-01-03T09:00:00+0000'),
+        end_date=to_timestamp('2000-01-03T09:15:00+0000'),
+        recurrence=Recurrence('daily'),
+    ))
+    _expand_bucket.cache_clear()
+
+    result = _get_starts(db, '2030-01-01T00:00:00+0000',
+                         '2030-01-03T00:00:00+0000')
+
+    assert result == [
+        '2030-01-01T09:00:00+00:00',
+        '2030-01-02T09:00:00+00:00',
+    ]
+    assert _expand_bucket.cache_info().currsize == 1
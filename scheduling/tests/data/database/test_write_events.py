@@ -0,0 +1,108 @@
+import pytest
+
+from data.database import Database
+from data.exceptions import EventNotFoundException, UserNotFoundException
+from data.models import Event, User, WorkingHours
+from utils.dates import to_timestamp
+
+START_DATE = to_timestamp('2019-01-02T00:00:00+0000')
+END_DATE = to_timestamp('2019-01-03T00:00:00+0000')
+HOUR = 60 * 60
+
+
+def _database():
+    user = User(
+        id=1,
+        working_hours=WorkingHours('09:00', '17:00'),
+        time_zone='UTC',
+        events=[
+            Event(id=3, title='Existing', start_date=START_DATE + 9 * HOUR,
+                  end_date=START_DATE + 10 * HOUR),
+        ],
+    )
+    return Database({1: user})
+
+
+def test__create_event():
+    """Created events are allocated a new id, and immediately affect the
+    user's events, free intervals and version.
+    """
+    db = _database()
+    version = db.get_user_version(1)
+
+    event = db.create_event(1, 'New', START_DATE + 12 * HOUR,
+                            START_DATE + 13 * HOUR)
+
+    assert event.id == 4
+    assert db.get_user_events(1, START_DATE, END_DATE)[1] == event
+    assert db.get_user_free_intervals(1, START_DATE, END_DATE) == [
+        (START_DATE, START_DATE + 9 * HOUR),
+        (START_DATE + 10 * HOUR, START_DATE + 12 * HOUR),
+        (START_DATE + 13 * HOUR, END_DATE),
+    ]
+    assert db.get_user_version(1) != version
+
+
+def test__update_event():
+    """Updating an event moves it within the user's schedule."""
+    db = _database()
+
+    db.update_event(1, 3, 'Moved', START_DATE + 11 * HOUR,
+                    START_DATE + 12 * HOUR)
+
+    assert db.get_user_events(1, START_DATE, END_DATE) == [
+        Event(id=3, title='Moved', start_date=START_DATE + 11 * HOUR,
+              end_date=START_DATE + 12 * HOUR),
+    ]
+    assert db.get_user_free_intervals(1, START_DATE, END_DATE) == [
+        (START_DATE, START_DATE + 11 * HOUR),
+        (START_DATE + 12 * HOUR, END_DATE),
+    ]
+
+
+def test__delete_event():
+    """Deleting an event frees the time it took up."""
+    db = _database()
+
+    db.delete_event(1, 3)
+
+    assert db.get_user_events(1, START_DATE, END_DATE) == []
+    assert db.get_user_free_intervals(1, START_DATE, END_DATE) == [
+        (START_DATE, END_DATE),
+    ]
+
+
+def test__unknown_event():
+    """Modifying a missing event raises an exception, without changing the
+    user's schedule.
+    """
+    db = _database()
+    version = db.get_user_version(1)
+
+    with pytest.raises(EventNotFoundException):
+        db.update_event(1, 4, 'Missing', START_DATE, END_DATE)
+    with pytest.raises(EventNotFoundException):
+        db.delete_event(1, 4)
+
+    assert len(db.get_user_events(1, START_DATE, END_DATE)) == 1
+    assert db.get_user_version(1) == version
+
+
+def test__unknown_user():
+    """Creating an event for a missing user raises an exception."""
+    with pytest.raises(UserNotFoundException):
+        _database().create_event(2, 'New', START_DATE, END_DATE)
+
+
+def test__deleted_event_ids_are_not_reused():
+    """Event ids are allocated from a counter that is never lowered, so
+    deleting the event with the highest id does not free its id.
+    """
+    db = _database()
+
+    db.delete_event(1, 3)
+    first = db.create_event(1, 'First', START_DATE, START_DATE + HOUR)
+    db.delete_event(1, first.id)
+    second = db.create_event(1, 'Second', START_DATE, START_DATE + HOUR)
+
+    assert (first.id, second.id) == (4, 5)
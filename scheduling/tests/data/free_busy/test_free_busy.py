@@ -0,0 +1,79 @@
+from data.free_busy import FreeBusy, get_free_intervals
+
+
+def test__no_events():
+    """A user without events is free for the whole date range."""
+    assert FreeBusy().get_free_intervals(0, 100) == [(0, 100)]
+
+
+def test__overlapping_and_touching_events_are_merged():
+    """Overlapping and touching events form a single busy interval."""
+    free_busy = FreeBusy([(10, 30), (20, 40), (40, 50), (70, 80)])
+
+    assert free_busy.get_free_intervals(0, 100) == [
+        (0, 10),
+        (50, 70),
+        (80, 100),
+    ]
+
+
+def test__free_intervals_are_clipped_to_the_date_range():
+    """Free intervals are clipped to the date range."""
+    free_busy = FreeBusy([(10, 20), (30, 40)])
+
+    assert free_busy.get_free_intervals(15, 35) == [(20, 30)]
+    assert free_busy.get_free_intervals(22, 28) == [(22, 28)]
+    assert free_busy.get_free_intervals(10, 20) == []
+
+
+def test__removing_an_overlapping_event_splits_the_busy_interval():
+    """Removing an event only frees the time that no other event covers."""
+    free_busy = FreeBusy([(10, 30), (20, 40), (35, 60)])
+
+    free_busy.remove(20, 40)
+
+    assert free_busy.get_free_intervals(0, 100) == [
+        (0, 10),
+        (30, 35),
+        (60, 100),
+    ]
+
+
+def test__removing_every_event_leaves_no_boundaries():
+    """Steps are merged as events are removed, rather than accumulating."""
+    free_busy = FreeBusy([(10, 30), (20, 40), (30, 50)])
+
+    free_busy.remove(20, 40)
+    free_busy.remove(10, 30)
+    free_busy.remove(30, 50)
+
+    assert len(free_busy) == 0
+    assert free_busy.get_free_intervals(0, 100) == [(0, 100)]
+
+
+def test__zero_length_events_split_free_intervals():
+    """An event taking up no time splits the free interval it falls within,
+    in the same way as when free intervals are derived from events.
+    """
+    busy_intervals = [(10, 20), (30, 30), (40, 50), (45, 45)]
+
+    free_busy = FreeBusy(busy_intervals)
+
+    assert free_busy.get_free_intervals(0, 100) == [
+        (0, 10),
+        (20, 30),
+        (30, 40),
+        (50, 100),
+    ]
+    assert (
+        free_busy.get_free_intervals(0, 100) ==
+        get_free_intervals(busy_intervals, 0, 100)
+    )
+
+    free_busy.remove(30, 30)
+
+    assert free_busy.get_free_intervals(0, 100) == [
+        (0, 10),
+        (20, 40),
+        (50, 100),
+    ]
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from data.exceptions import GroupNotFoundException
+from data.groups import GroupStore
+from data.models import Group
+
+
+def test__nested_groups_are_resolved():
+    """A group's members include those of the groups it contains, at any
+    depth, each included once.
+    """
+    groups = GroupStore([
+        Group(1, 'Engineering', user_ids=[1, 2], group_ids=[2, 3]),
+        Group(2, 'Platform', user_ids=[2, 3], group_ids=[3]),
+        Group(3, 'Storage', user_ids=[5, 4]),
+    ])
+
+    assert groups.get_member_ids(1) == (1, 2, 3, 4, 5)
+    assert groups.get_member_ids(2) == (2, 3, 4, 5)
+    assert groups.get_member_ids(3) == (4, 5)
+
+
+def test__cycles_are_rejected():
+    """Groups that contain themselves, through other groups, are rejected."""
+    with pytest.raises(ValueError, match='1 -> 2 -> 3 -> 1'):
+        GroupStore([
+            Group(1, 'A', user_ids=[1], group_ids=[2]),
+            Group(2, 'B', user_ids=[2], group_ids=[3]),
+            Group(3, 'C', user_ids=[3], group_ids=[1]),
+        ])
+
+
+def test__missing_nested_group_is_rejected():
+    """Groups that contain a group that does not exist are rejected."""
+    with pytest.raises(ValueError):
+        GroupStore([Group(1, 'A', user_ids=[1], group_ids=[2])])
+
+
+def test__missing_group_raises(tmp_path):
+    """Looking up a group that does not exist raises an exception."""
+    filename = tmp_path / 'groups.json'
+    filename.write_text(json.dumps([
+        {'group_id': 1, 'name': 'A', 'user_ids': [1, 2]},
+    ]))
+
+    groups = GroupStore.from_file(str(filename))
+
+    assert groups.get_member_ids(1) == (1, 2)
+    with pytest.raises(GroupNotFoundException):
+        groups.get_member_ids(2)
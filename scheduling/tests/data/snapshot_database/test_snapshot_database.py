@@ -0,0 +1,87 @@
+import pytest
+
+from data.exceptions import UserNotFoundException
+from data.models import Event, User, WorkingHours
+from data.snapshot_database import SnapshotDatabase, write_snapshot
+from utils.dates import to_timestamp
+
+START_DATE = to_timestamp('2019-01-02T09:00:00+0000')
+END_DATE = to_timestamp('2019-01-02T17:00:00+0000')
+
+
+def _event(id, title, start_date, end_date):
+    return Event(id, title, to_timestamp(start_date), to_timestamp(end_date))
+
+
+USERS = [
+    User(
+        id=7,
+        working_hours=WorkingHours('08:30', '17:15'),
+        time_zone='Europe/Paris',
+        events=[
+            _event(3, 'Inside', '2019-01-02T12:00:00+0000',
+                   '2019-01-02T13:00:00+0000'),
+            _event(1, 'Long-running', '2018-12-01T00:00:00+0000',
+                   '2019-01-02T10:00:00+0000'),
+            _event(2, 'Before', '2019-01-01T10:00:00+0000',
+                   '2019-01-01T11:00:00+0000'),
+        ],
+    ),
+    User(
+        id=3,
+        working_hours=WorkingHours('09:00', '17:00'),
+        time_zone='UTC',
+        events=[],
+    ),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    filename = str(tmp_path / 'db.snapshot')
+    write_snapshot(USERS, filename)
+    return SnapshotDatabase(filename)
+
+
+def test__get_user(db):
+    """Users are read with their working hours and time zone."""
+    user = db.get_user(7)
+
+    assert user.id == 7
+    assert user.working_hours == USERS[0].working_hours
+    assert user.time_zone == 'Europe/Paris'
+
+
+def test__unknown_user(db):
+    """Looking up a missing user raises an exception."""
+    with pytest.raises(UserNotFoundException):
+        db.get_user(5)
+
+
+def test__get_user_events(db):
+    """Only events overlapping with the date range are returned, including
+    long-running events, in ascending order by start date.
+    """
+    events = db.get_user_events(7, START_DATE, END_DATE)
+
+    assert [event.title for event in events] == ['Long-running', 'Inside']
+    assert events[1] == Event(
+        3,
+        'Inside',
+        to_timestamp('2019-01-02T12:00:00+0000'),
+        to_timestamp('2019-01-02T13:00:00+0000'),
+    )
+
+
+def test__user_without_events(db):
+    """Users without any events have no events in any date range."""
+    assert db.get_user_events(3, START_DATE, END_DATE) == []
+
+
+def test__not_a_snapshot(tmp_path):
+    """Files that are not snapshots are rejected."""
+    filename = tmp_path / 'db.json'
+    filename.write_bytes(b'[]' * 100)
+
+    with pytest.raises(ValueError):
+        SnapshotDatabase(str(filename))
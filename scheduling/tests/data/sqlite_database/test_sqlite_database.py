@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+from data.exceptions import EventNotFoundException, UserNotFoundException
+from data.models import Event, User, WorkingHours
+from data.sqlite_database import SQLiteDatabase
+from utils.dates import to_timestamp
+
+START_DATE = to_timestamp('2019-01-02T09:00:00+0000')
+END_DATE = to_timestamp('2019-01-02T17:00:00+0000')
+
+USER_DATA = {
+    'user_id': 1,
+    'time_zone': 'America/New_York',
+    'working_hours': {'start': '08:30', 'end': '17:00'},
+    'events': [
+        {
+            'id': 1,
+            'title': 'Long-running',
+            'start': '2018-12-01T00:00:00+0000',
+            'end': '2019-01-02T10:00:00+0000',
+        },
+        {
+            'id': 2,
+            'title': 'Before',
+            'start': '2019-01-01T10:00:00+0000',
+            'end': '2019-01-01T11:00:00+0000',
+        },
+        {
+            'id': 3,
+            'title': 'Inside',
+            'start': '2019-01-02T12:00:00+0000',
+            'end': '2019-01-02T13:00:00+0000',
+        },
+        {
+            'id': 4,
+            'title': 'After',
+            'start': '2019-01-02T17:00:00+0000',
+            'end': '2019-01-02T18:00:00+0000',
+        },
+    ],
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    json_filename = tmp_path / 'db.json'
+    json_filename.write_text(json.dumps([USER_DATA]))
+
+    return SQLiteDatabase.from_json_file(
+        str(json_filename),
+        str(tmp_path / 'db.sqlite3'),
+    )
+
+
+def test__get_user(db):
+    """Users are imported with their working hours and time zone."""
+    user = db.get_user(1)
+
+    assert user.id == 1
+    assert user.working_hours == User.from_json(USER_DATA).working_hours
+    assert user.time_zone == 'America/New_York'
+
+
+def test__unknown_user(db):
+    """Looking up a missing user raises an exception."""
+    with pytest.raises(UserNotFoundException):
+        db.get_user_events(2, START_DATE, END_DATE)
+
+
+def test__get_user_events(db):
+    """Only events overlapping with the date range are returned, including
+    long-running events, in ascending order by start date.
+    """
+    events = db.get_user_events(1, START_DATE, END_DATE)
+
+    assert [event.title for event in events] == ['Long-running', 'Inside']
+    assert events[1].start_date == to_timestamp('2019-01-02T12:00:00+0000')
+    assert events[1].end_date == to_timestamp('2019-01-02T13:00:00+0000')
+
+
+def test__set_user_replaces_events_and_version(db):
+    """Replacing a user replaces their events and changes their version."""
+    version = db.get_user_version(1)
+
+    db.set_user(User(
+        id=1,
+        working_hours=WorkingHours('09:00', '17:00'),
+        time_zone='UTC',
+        events=[Event(5, 'New', START_DATE, START_DATE + 3600)],
+    ))
+
+    events = db.get_user_events(1, START_DATE, END_DATE)
+
+    assert [event.title for event in events] == ['New']
+    assert db.get_user_version(1) != version
+
+
+def test__write_events(db):
+    """Events can be created, updated and deleted, changing the user's free
+    intervals and version each time.
+    """
+    version = db.get_user_version(1)
+
+    event = db.create_event(1, 'New', START_DATE + 3600, START_DATE + 7200)
+    assert event.id == 5
+    assert db.get_user_version(1) != version
+
+    db.update_event(1, 3, 'Moved', END_DATE - 3600, END_DATE)
+    db.delete_event(1, 1)
+
+    assert db.get_user_free_intervals(1, START_DATE, END_DATE) == [
+        (START_DATE, START_DATE + 3600),
+        (START_DATE + 7200, END_DATE - 3600),
+    ]
+
+    with pytest.raises(EventNotFoundException):
+        db.delete_event(1, 1)
+
+
+def test__deleted_event_ids_are_not_reused(db, tmp_path):
+    """Event ids are allocated from a counter stored in the database, so
+    deleting the event with the highest id does not free its id, even once
+    the database is reopened.
+    """
+    db.delete_event(1, 4)
+    first = db.create_event(1, 'First', START_DATE, START_DATE + 3600)
+    db.delete_event(1, first.id)
+
+    reopened = SQLiteDatabase(str(tmp_path / 'db.sqlite3'))
+    second = reopened.create_event(1, 'Second', START_DATE,
+                                   START_DATE + 3600)
+
+    assert (first.id, second.id) == (5, 6)
@@ -1,7 +1,6 @@
-import arrow
-
 from data.models import WorkingHours, WorkingHoursTime
 from utils.availability_utils import add_work_hour_availability, Availability
+from utils.dates import to_timestamp
 
 WORKING_HOURS = WorkingHours(
     WorkingHoursTime(9, 0),
@@ -13,30 +12,30 @@ def test__single_day_availability_during_work_hours():
     """If a block of availability is fully contianed during work hours, it is
     preserved."""
     availabilities = []
-    start_date = arrow.get("2019-01-01T11:00:00+00:00")
-    end_date = arrow.get("2019-01-01T12:00:00+00:00")
+    start_date = to_timestamp("2019-01-01T11:00:00+00:00")
+    end_date = to_timestamp("2019-01-01T12:00:00+00:00")
 
     add_work_hour_availability(availabilities, start_date,
-                               end_date, WORKING_HOURS)
+                               end_date, WORKING_HOURS, 'UTC')
 
     assert availabilities == [
-        Availability(start_date.isoformat(), end_date.isoformat()),
+        Availability(start_date, end_date),
     ]
 
 
 def test__single_day_availability_ends_after_work_hours():
     """If a block of availability ends after work hours, it is truncated."""
     availabilities = []
-    start_date = arrow.get("2019-01-01T11:00:00+00:00")
-    end_date = arrow.get("2019-01-01T18:00:00+00:00")
+    start_date = to_timestamp("2019-01-01T11:00:00+00:00")
+    end_date = to_timestamp("2019-01-01T18:00:00+00:00")
 
     add_work_hour_availability(availabilities, start_date,
-                               end_date, WORKING_HOURS)
+                               end_date, WORKING_HOURS, 'UTC')
 
     assert availabilities == [
         Availability(
-            start_date.isoformat(),
-            arrow.get("2019-01-01T17:30:00+00:00").isoformat(),
+            start_date,
+            to_timestamp("2019-01-01T17:30:00+00:00"),
         ),
     ]
 
@@ -44,16 +43,16 @@ def test__single_day_availability_ends_after_work_hours():
 def test__single_day_availability_starts_before_work_hours():
     """If a block of availability starts before work hours, it is truncated."""
     availabilities = []
-    start_date = arrow.get("2019-01-01T05:00:00+00:00")
-    end_date = arrow.get("2019-01-01T12:00:00+00:00")
+    start_date = to_timestamp("2019-01-01T05:00:00+00:00")
+    end_date = to_timestamp("2019-01-01T12:00:00+00:00")
 
     add_work_hour_availability(availabilities, start_date,
-                               end_date, WORKING_HOURS)
+                               end_date, WORKING_HOURS, 'UTC')
 
     assert availabilities == [
         Availability(
-            arrow.get("2019-01-01T09:00:00+00:00").isoformat(),
-            end_date.isoformat(),
+            to_timestamp("2019-01-01T09:00:00+00:00"),
+            end_date,
         ),
     ]
 
@@ -61,11 +60,11 @@ def test__single_day_availability_starts_before_work_hours():
 def test__availability_ends_before_work_hours():
     """No availability is added if the availability ends before work hours."""
     availabilities = []
-    start_date = arrow.get("2019-01-01T05:00:00+00:00")
-    end_date = arrow.get("2019-01-01T07:00:00+00:00")
+    start_date = to_timestamp("2019-01-01T05:00:00+00:00")
+    end_date = to_timestamp("2019-01-01T07:00:00+00:00")
 
     add_work_hour_availability(availabilities, start_date,
-                               end_date, WORKING_HOURS)
+                               end_date, WORKING_HOURS, 'UTC')
 
     assert availabilities == []
 
@@ -73,11 +72,11 @@ def test__availability_ends_before_work_hours():
 def test__availability_starts_after_work_hours():
     """No availability is added if the availability starts after work hours."""
     availabilities = []
-    start_date = arrow.get("2019-01-01T20:00:00+00:00")
-    end_date = arrow.get("2019-01-01T23:00:00+00:00")
+    start_date = to_timestamp("2019-01-01T20:00:00+00:00")
+    end_date = to_timestamp("2019-01-01T23:00:00+00:00")
 
     add_work_hour_availability(availabilities, start_date,
-                               end_date, WORKING_HOURS)
+                               end_date, WORKING_HOURS, 'UTC')
 
     assert availabilities == []
 
@@ -85,23 +84,40 @@ def test__availability_starts_after_work_hours():
 def test__multiday_availability():
     """If availability spans multiple work days, it is split appropriately."""
     availabilities = []
-    start_date = arrow.get("2019-01-01T10:00:00+00:00")
-    end_date = arrow.get("2019-01-03T12:00:00+00:00")
+    start_date = to_timestamp("2019-01-01T10:00:00+00:00")
+    end_date = to_timestamp("2019-01-03T12:00:00+00:00")
 
     add_work_hour_availability(availabilities, start_date,
-                               end_date, WORKING_HOURS)
+                               end_date, WORKING_HOURS, 'UTC')
 
     assert availabilities == [
         Availability(
-            start_date.isoformat(),
-            arrow.get("2019-01-01T17:30:00+00:00").isoformat(),
+            start_date,
+            to_timestamp("2019-01-01T17:30:00+00:00"),
+        ),
+        Availability(
+            to_timestamp("2019-01-02T09:00:00+00:00"),
+            to_timestamp("2019-01-02T17:30:00+00:00"),
         ),
         Availability(
-            arrow.get("2019-01-02T09:00:00+00:00").isoformat(),
-            arrow.get("2019-01-02T17:30:00+00:00").isoformat(),
+            to_timestamp("2019-01-03T09:00:00+00:00"),
+            end_date,
         ),
+    ]
+
+
+def test__availability_in_another_time_zone():
+    """Work hours are applied in the user's time zone."""
+    availabilities = []
+    start_date = to_timestamp("2019-01-01T10:00:00+00:00")
+    end_date = to_timestamp("2019-01-02T00:00:00+00:00")
+
+    add_work_hour_availability(availabilities, start_date,
+                               end_date, WORKING_HOURS, 'America/New_York')
+
+    assert availabilities == [
         Availability(
-            arrow.get("2019-01-03T09:00:00+00:00").isoformat(),
-            end_date.isoformat(),
+            to_timestamp("2019-01-01T14:00:00+00:00"),
+            to_timestamp("2019-01-01T22:30:00+00:00"),
         ),
     ]
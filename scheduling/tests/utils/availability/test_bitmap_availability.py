@@ -0,0 +1,120 @@
+import random
+
+from data.free_busy import get_free_intervals
+from data.models import WorkingHours, WorkingHoursTime
+from utils.availability_utils import (
+    get_intersecting_availabilities,
+    get_quorum_availabilities,
+    iter_free_interval_availability,
+    Availability,
+)
+from utils.bitmap_availability_utils import (
+    get_availability_bitmap,
+    get_bitmap_availabilities,
+    get_intersecting_bitmap,
+    get_quorum_bitmap,
+    get_slots,
+)
+from utils.dates import to_timestamp
+
+SLOT_SIZE = 15 * 60
+START_DATE = to_timestamp('2019-01-01T00:00:00+00:00')
+END_DATE = to_timestamp('2019-01-08T00:00:00+00:00')
+WORKING_HOURS = WorkingHours(
+    WorkingHoursTime(9, 0),
+    WorkingHoursTime(17, 30),
+)
+
+
+def _random_free_intervals(rng):
+    boundaries = sorted(rng.sample(
+        range(START_DATE, END_DATE, SLOT_SIZE),
+        100,
+    ))
+    busy_intervals = list(zip(boundaries[::2], boundaries[1::2]))
+    return get_free_intervals(busy_intervals, START_DATE, END_DATE)
+
+
+def test__partially_free_slots_are_unavailable():
+    """Only slots during which the user is free throughout are available."""
+    slots = get_slots(100, 1000, 100)
+    bitmap = get_availability_bitmap([(150, 450), (600, 1000)], slots)
+
+    assert get_bitmap_availabilities(bitmap, slots) == [
+        Availability(200, 400),
+        Availability(600, 1000),
+    ]
+
+
+def test__matches_intersection_for_aligned_dates():
+    """For dates aligned to the slots, the bitwise AND of the users' bitmaps
+    matches the intersection of their availabilities, within working hours.
+    """
+    rng = random.Random(0)
+    slots = get_slots(START_DATE, END_DATE, SLOT_SIZE)
+
+    bitmaps = []
+    user_availabilities = []
+    for time_zone in ('UTC', 'Europe/Berlin', 'America/New_York'):
+        free_intervals = _random_free_intervals(rng)
+        bitmaps.append(get_availability_bitmap(
+            free_intervals,
+            slots,
+            working_hours=WORKING_HOURS,
+            time_zone=time_zone,
+        ))
+        user_availabilities.append(list(iter_free_interval_availability(
+            free_intervals,
+            working_hours=WORKING_HOURS,
+            time_zone=time_zone,
+        )))
+
+    result = get_bitmap_availabilities(get_intersecting_bitmap(bitmaps), slots)
+
+    assert result
+    assert result == get_intersecting_availabilities(user_availabilities)
+
+
+def test__matches_quorum_for_aligned_dates():
+    """For dates aligned to the slots, counting the available users in each
+    slot matches the quorum of their availabilities, including where
+    availability is handed over from one user to another.
+    """
+    rng = random.Random(1)
+    slots = get_slots(START_DATE, END_DATE, SLOT_SIZE)
+
+    free_intervals = [_random_free_intervals(rng) for _ in range(5)]
+    bitmaps = [
+        get_availability_bitmap(user_free_intervals, slots)
+        for user_free_intervals in free_intervals
+    ]
+    user_availabilities = [
+        list(iter_free_interval_availability(user_free_intervals))
+        for user_free_intervals in free_intervals
+    ]
+
+    for min_available_users in range(1, 6):
+        result = get_bitmap_availabilities(
+            get_quorum_bitmap(bitmaps, min_available_users),
+            slots,
+        )
+
+        assert result == get_quorum_availabilities(
+            user_availabilities,
+            min_available_users,
+        )
+
+
+def test__quorum_handover_is_not_split():
+    """A quorum kept while one user hands over to another is returned as a
+    single availability.
+    """
+    slots = get_slots(0, 2000, 100)
+    bitmaps = [
+        get_availability_bitmap(free_intervals, slots)
+        for free_intervals in ([(0, 2000)], [(0, 1000)], [(1000, 2000)])
+    ]
+
+    result = get_bitmap_availabilities(get_quorum_bitmap(bitmaps, 2), slots)
+
+    assert result == [Availability(0, 2000)]
@@ -0,0 +1,76 @@
+import random
+
+from utils.availability_utils import (
+    get_intersecting_availabilities,
+    Availability,
+)
+from utils.dates import to_timestamp
+from utils.vectorized_availability_utils import (
+    get_intersecting_availabilities_vectorized,
+)
+
+
+def test__overlapping_availabilities():
+    """If availabilities overlap, only the intersection is preserved."""
+    user1 = [
+        Availability(
+            to_timestamp("2019-01-01T11:00:00+00:00"),
+            to_timestamp("2019-01-01T15:00:00+00:00"),
+        ),
+    ]
+    user2 = [
+        Availability(
+            to_timestamp("2019-01-01T08:00:00+00:00"),
+            to_timestamp("2019-01-01T12:00:00+00:00"),
+        ),
+        Availability(
+            to_timestamp("2019-01-01T13:00:00+00:00"),
+            to_timestamp("2019-01-01T22:00:00+00:00"),
+        ),
+    ]
+    result = get_intersecting_availabilities_vectorized([user1, user2])
+
+    assert result == [
+        Availability(
+            to_timestamp("2019-01-01T11:00:00+00:00"),
+            to_timestamp("2019-01-01T12:00:00+00:00"),
+        ),
+        Availability(
+            to_timestamp("2019-01-01T13:00:00+00:00"),
+            to_timestamp("2019-01-01T15:00:00+00:00"),
+        ),
+    ]
+
+
+def test__no_overlapping_availabilities():
+    """If availabilities are fully disparate, they are not returned."""
+    user1 = [Availability(0, 100)]
+    user2 = [Availability(100, 200)]
+
+    result = get_intersecting_availabilities_vectorized([user1, user2])
+
+    assert result == []
+
+
+def test__matches_iterative_intersection():
+    """The vectorized intersection matches the iterative intersection,
+    including for back-to-back availabilities.
+    """
+    rng = random.Random(0)
+
+    user_availabilities = []
+    for _ in range(4):
+        boundaries = sorted(rng.sample(range(0, 10000, 5), 400))
+        user_availabilities.append([
+            Availability(start_date, end_date)
+            for start_date, end_date in zip(boundaries[::2], boundaries[1::2])
+        ])
+    user_availabilities.append([
+        Availability(0, 5000),
+        Availability(5000, 10000),
+    ])
+
+    result = get_intersecting_availabilities_vectorized(user_availabilities)
+
+    assert result
+    assert result == get_intersecting_availabilities(user_availabilities)
@@ -0,0 +1,99 @@
+from utils.availability_utils import (
+    get_intersecting_availabilities,
+    get_quorum_availabilities,
+    Availability,
+)
+from utils.dates import to_timestamp
+
+USER1 = [
+    Availability(
+        to_timestamp("2019-01-01T09:00:00+00:00"),
+        to_timestamp("2019-01-01T12:00:00+00:00"),
+    ),
+]
+USER2 = [
+    Availability(
+        to_timestamp("2019-01-01T11:00:00+00:00"),
+        to_timestamp("2019-01-01T14:00:00+00:00"),
+    ),
+]
+USER3 = [
+    Availability(
+        to_timestamp("2019-01-01T13:00:00+00:00"),
+        to_timestamp("2019-01-01T15:00:00+00:00"),
+    ),
+]
+
+
+def test__at_least_one_user_available():
+    """With a quorum of one, every period during which anyone is available
+    is returned, merged across users.
+    """
+    result = get_quorum_availabilities([USER1, USER2, USER3], 1)
+
+    assert result == [
+        Availability(
+            to_timestamp("2019-01-01T09:00:00+00:00"),
+            to_timestamp("2019-01-01T15:00:00+00:00"),
+        ),
+    ]
+
+
+def test__at_least_two_users_available():
+    """Only the periods during which enough users are available are
+    returned.
+    """
+    result = get_quorum_availabilities([USER1, USER2, USER3], 2)
+
+    assert result == [
+        Availability(
+            to_timestamp("2019-01-01T11:00:00+00:00"),
+            to_timestamp("2019-01-01T12:00:00+00:00"),
+        ),
+        Availability(
+            to_timestamp("2019-01-01T13:00:00+00:00"),
+            to_timestamp("2019-01-01T14:00:00+00:00"),
+        ),
+    ]
+
+
+def test__user_without_availability():
+    """A user with no availability does not prevent a quorum."""
+    result = get_quorum_availabilities([USER1, USER2, []], 2)
+
+    assert result == [
+        Availability(
+            to_timestamp("2019-01-01T11:00:00+00:00"),
+            to_timestamp("2019-01-01T12:00:00+00:00"),
+        ),
+    ]
+
+
+def test__all_users_matches_intersection():
+    """Requiring every user matches the intersection of availabilities."""
+    user_availabilities = [
+        USER1 + USER3,
+        USER2,
+        [Availability(USER1[0].start_date, USER3[0].end_date)],
+    ]
+
+    assert (
+        get_quorum_availabilities(user_availabilities, 3) ==
+        get_intersecting_availabilities(user_availabilities)
+    )
+
+
+def test__handover_does_not_split_availability():
+    """A user leaving at the moment another arrives keeps the quorum, so the
+    availability is returned whole.
+    """
+    result = get_quorum_availabilities(
+        [
+            [Availability(0, 20)],
+            [Availability(0, 10)],
+            [Availability(10, 20)],
+        ],
+        2,
+    )
+
+    assert result == [Availability(0, 20)]
@@ -0,0 +1,55 @@
+from concurrent.futures import ProcessPoolExecutor
+import random
+
+from data.free_busy import get_free_intervals
+from data.models import WorkingHours, WorkingHoursTime
+from utils.availability_utils import iter_free_interval_availability
+from utils.dates import to_timestamp
+from utils.parallel_availability_utils import (
+    get_user_availabilities_in_parallel,
+)
+
+START_DATE = to_timestamp('2019-01-01T00:00:00+00:00')
+END_DATE = to_timestamp('2019-02-01T00:00:00+00:00')
+WORKING_HOURS = WorkingHours(
+    WorkingHoursTime(9, 0),
+    WorkingHoursTime(17, 30),
+)
+TIME_ZONES = ('UTC', 'America/New_York', 'Asia/Kolkata', 'Australia/Sydney')
+
+
+def test__matches_serial_computation():
+    """Computing availabilities across a process pool produces the same
+    availabilities, for each user in turn, as computing them one by one.
+    """
+    rng = random.Random(0)
+
+    user_free_times = []
+    for i in range(10):
+        boundaries = sorted(rng.sample(range(START_DATE, END_DATE, 60), 200))
+        free_intervals = get_free_intervals(
+            zip(boundaries[::2], boundaries[1::2]),
+            START_DATE,
+            END_DATE,
+        )
+
+        if i % 3:
+            user_free_times.append((
+                free_intervals,
+                WORKING_HOURS,
+                TIME_ZONES[i % len(TIME_ZONES)],
+            ))
+        else:
+            user_free_times.append((free_intervals, None, None))
+
+    with ProcessPoolExecutor(2) as executor:
+        result = get_user_availabilities_in_parallel(
+            executor,
+            user_free_times,
+            chunk_count=3,
+        )
+
+    assert result == [
+        list(iter_free_interval_availability(*user_free_time))
+        for user_free_time in user_free_times
+    ]
@@ -1,8 +1,9 @@
 from data.models import Event
 from utils.availability_utils import get_user_availability, Availability
+from utils.dates import to_timestamp
 
-START_DATE = '2019-01-01T10:00:00+0000'
-END_DATE = '2019-01-01T18:00:00+0000'
+START_DATE = to_timestamp('2019-01-01T10:00:00+0000')
+END_DATE = to_timestamp('2019-01-01T18:00:00+0000')
 
 
 def test__no_events():
@@ -27,8 +28,8 @@ def test__event_overlapping_with_start_date():
     event = Event(
         id=1,
         title='A',
-        start_date='2019-01-01T09:00:00+00:00',
-        end_date='2019-01-01T12:00:00+00:00',
+        start_date=to_timestamp('2019-01-01T09:00:00+00:00'),
+        end_date=to_timestamp('2019-01-01T12:00:00+00:00'),
     )
 
     result = get_user_availability(
@@ -49,8 +50,8 @@ def test__event_overlapping_with_end_date():
     event = Event(
         id=1,
         title='A',
-        start_date='2019-01-01T12:00:00+00:00',
-        end_date='2019-01-01T20:00:00+00:00',
+        start_date=to_timestamp('2019-01-01T12:00:00+00:00'),
+        end_date=to_timestamp('2019-01-01T20:00:00+00:00'),
     )
 
     result = get_user_availability(
@@ -71,14 +72,14 @@ def test__overlapping_events():
     event1 = Event(
         id=1,
         title='A',
-        start_date='2019-01-01T12:00:00+00:00',
-        end_date='2019-01-01T14:00:00+00:00',
+        start_date=to_timestamp('2019-01-01T12:00:00+00:00'),
+        end_date=to_timestamp('2019-01-01T14:00:00+00:00'),
     )
     event2 = Event(
         id=2,
         title='B',
-        start_date='2019-01-01T13:00:00+00:00',
-        end_date='2019-01-01T15:00:00+00:00',
+        start_date=to_timestamp('2019-01-01T13:00:00+00:00'),
+        end_date=to_timestamp('2019-01-01T15:00:00+00:00'),
     )
 
     result = get_user_availability(
@@ -98,20 +99,20 @@ def test__multiple_availabilities():
     event1 = Event(
         id=1,
         title='A',
-        start_date='2019-01-01T12:00:00+00:00',
-        end_date='2019-01-01T14:00:00+00:00',
+        start_date=to_timestamp('2019-01-01T12:00:00+00:00'),
+        end_date=to_timestamp('2019-01-01T14:00:00+00:00'),
     )
     event2 = Event(
         id=2,
         title='B',
-        start_date='2019-01-01T15:00:00+00:00',
-        end_date='2019-01-01T16:00:00+00:00',
+        start_date=to_timestamp('2019-01-01T15:00:00+00:00'),
+        end_date=to_timestamp('2019-01-01T16:00:00+00:00'),
     )
     event3 = Event(
         id=3,
         title='C',
-        start_date='2019-01-01T17:00:00+00:00',
-        end_date='2019-01-01T17:30:00+00:00',
+        start_date=to_timestamp('2019-01-01T17:00:00+00:00'),
+        end_date=to_timestamp('2019-01-01T17:30:00+00:00'),
     )
 
     result = get_user_availability(
@@ -0,0 +1,37 @@
+from itertools import count, islice
+
+from utils.availability_utils import (
+    iter_intersecting_availabilities,
+    Availability,
+)
+
+
+def _hourly_availabilities(duration):
+    """Generate an endless series of availabilities, one an hour."""
+    for hour in count():
+        yield Availability(hour * 3600, hour * 3600 + duration)
+
+
+def test__availabilities_are_consumed_lazily():
+    """Intersecting availabilities are produced without exhausting each
+    user's availabilities.
+    """
+    result = iter_intersecting_availabilities([
+        _hourly_availabilities(1800),
+        _hourly_availabilities(900),
+    ])
+
+    assert list(islice(result, 2)) == [
+        Availability(0, 900),
+        Availability(3600, 4500),
+    ]
+
+
+def test__user_without_availability():
+    """If any user has no availability, there is nothing in common."""
+    result = iter_intersecting_availabilities([
+        _hourly_availabilities(1800),
+        [],
+    ])
+
+    assert list(result) == []
@@ -0,0 +1,43 @@
+from itertools import count
+
+from utils.availability_utils import (
+    iter_qualifying_availabilities,
+    Availability,
+)
+
+
+def test__short_availabilities_are_excluded():
+    """Availabilities shorter than the minimum duration are excluded."""
+    availabilities = [
+        Availability(0, 900),
+        Availability(1000, 2800),
+        Availability(3000, 3600),
+    ]
+
+    result = iter_qualifying_availabilities(availabilities, min_duration=1800)
+
+    assert list(result) == [Availability(1000, 2800)]
+
+
+def test__consumption_stops_at_limit():
+    """No more availabilities are consumed than are needed to reach the
+    limit.
+    """
+    def generate_availabilities():
+        for hour in count():
+            generated.append(hour)
+            yield Availability(hour * 3600, hour * 3600 + hour * 60)
+
+    generated = []
+
+    result = iter_qualifying_availabilities(
+        generate_availabilities(),
+        min_duration=300,
+        limit=2,
+    )
+
+    assert list(result) == [
+        Availability(5 * 3600, 5 * 3600 + 300),
+        Availability(6 * 3600, 6 * 3600 + 360),
+    ]
+    assert generated == [0, 1, 2, 3, 4, 5, 6]
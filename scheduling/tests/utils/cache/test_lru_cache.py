@@ -0,0 +1,39 @@
+from unittest import mock
+
+from utils.cache import LRUCache
+
+
+def test__missing_entry():
+    """The default is returned for keys that have not been cached."""
+    cache = LRUCache(max_size=2)
+
+    assert cache.get('a') is None
+    assert cache.get('a', []) == []
+
+
+def test__least_recently_used_entry_is_evicted():
+    """When full, the least recently used entry is evicted."""
+    cache = LRUCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert len(cache) == 2
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test__expired_entry():
+    """Entries are not returned once they have expired."""
+    cache = LRUCache(max_size=2, ttl=10)
+
+    with mock.patch('utils.cache.time.monotonic', return_value=100):
+        cache.set('a', 1)
+
+    with mock.patch('utils.cache.time.monotonic', return_value=109):
+        assert cache.get('a') == 1
+
+    with mock.patch('utils.cache.time.monotonic', return_value=110):
+        assert cache.get('a') is None
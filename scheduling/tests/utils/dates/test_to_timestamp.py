@@ -0,0 +1,40 @@
+import calendar
+
+import arrow
+import pytest
+
+from utils.dates import to_timestamp
+
+
+@pytest.mark.parametrize('date', [
+    '2019-01-01T00:00:00+00:00',
+    '2019-01-01T00:00:00+0000',
+    '2019-01-01T00:00:00Z',
+    '2019-01-01T10:00:00-08:00',
+    '2019-01-01T10:00:00.923+05:30',
+    '1969-12-31T23:59:59.5+00:00',
+    '2019-01-01T10:00:00',
+    '2019-01-01',
+])
+def test__matches_arrow(date):
+    """Dates are converted as arrow converts them, with dates without an
+    offset taken to be in UTC and fractions of a second dropped.
+    """
+    assert to_timestamp(date) == calendar.timegm(
+        arrow.get(date).utctimetuple()
+    )
+
+
+def test__falls_back_to_arrow():
+    """Dates in formats that datetime does not parse, and arrow objects,
+    are converted by arrow.
+    """
+    assert to_timestamp('2019-002') == to_timestamp('2019-01-02')
+    assert to_timestamp(arrow.get('2019-01-02T00:00:00+00:00')) == (
+        to_timestamp('2019-01-02')
+    )
+
+
+def test__invalid_date():
+    with pytest.raises(ValueError):
+        to_timestamp('not a date')
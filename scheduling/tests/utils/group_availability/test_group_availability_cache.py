@@ -0,0 +1,200 @@
+from data.database import Database
+from data.models import Event, User, WorkingHours
+from utils.availability_utils import (
+    Availability,
+    get_intersecting_availabilities,
+    iter_free_interval_availability,
+)
+from utils.dates import to_timestamp
+from utils.group_availability import (
+    GroupAvailabilityCache,
+    join_buckets,
+    split_into_buckets,
+)
+
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+START_DATE = to_timestamp('2019-01-01T00:00:00+0000')
+
+
+def _database():
+    users = {
+        user_id: User(
+            id=user_id,
+            working_hours=WorkingHours('09:00', '17:00'),
+            time_zone='UTC',
+            events=[
+                Event(id=1, title='Meeting',
+                      start_date=START_DATE + (9 + user_id) * HOUR,
+                      end_date=START_DATE + (10 + user_id) * HOUR),
+            ],
+        )
+        for user_id in (1, 2, 3)
+    }
+    return Database(users)
+
+
+class _Group():
+    """A group whose availability is computed from a database, recording
+    the date ranges for which it is computed.
+    """
+
+    def __init__(self, db, member_ids):
+        self.db = db
+        self.member_ids = member_ids
+        self.computed = []
+
+    def get_member_versions(self):
+        return tuple(
+            self.db.get_user_version(user_id)
+            for user_id in self.member_ids
+        )
+
+    def get_availability(self, group_id, start_date, end_date,
+                         should_include_non_working_hours):
+        self.computed.append((start_date, end_date))
+        return get_intersecting_availabilities([
+            list(iter_free_interval_availability(
+                self.db.get_user_free_intervals(user_id, start_date,
+                                                end_date),
+            ))
+            for user_id in self.member_ids
+        ])
+
+
+def _get_availability(cache, group, start_date, end_date):
+    return cache.get_availability(
+        1,
+        group.member_ids,
+        group.get_member_versions(),
+        start_date,
+        end_date,
+        True,
+    )
+
+
+def test__split_and_join_at_bucket_edges():
+    """Availabilities split at the boundaries between buckets are rejoined,
+    clipped to the date range, while those that meet a boundary without
+    crossing it are left alone.
+    """
+    availabilities = [
+        Availability(START_DATE + 22 * HOUR, START_DATE + DAY + 3 * HOUR),
+        Availability(START_DATE + DAY + 5 * HOUR, START_DATE + 2 * DAY),
+    ]
+    first_bucket = START_DATE // DAY
+
+    bucket_availabilities = split_into_buckets(availabilities,
+                                               first_bucket,
+                                               first_bucket + 2)
+
+    assert bucket_availabilities == {
+        first_bucket: [
+            Availability(START_DATE + 22 * HOUR, START_DATE + DAY),
+        ],
+        first_bucket + 1: [
+            Availability(START_DATE + DAY, START_DATE + DAY + 3 * HOUR),
+            Availability(START_DATE + DAY + 5 * HOUR, START_DATE + 2 * DAY),
+        ],
+        first_bucket + 2: [],
+    }
+    assert join_buckets(
+        [
+            bucket_availabilities[bucket]
+            for bucket in range(first_bucket, first_bucket + 3)
+        ],
+        START_DATE + 23 * HOUR,
+        START_DATE + DAY + 6 * HOUR,
+    ) == [
+        Availability(START_DATE + 23 * HOUR, START_DATE + DAY + 3 * HOUR),
+        Availability(START_DATE + DAY + 5 * HOUR,
+                     START_DATE + DAY + 6 * HOUR),
+    ]
+
+
+def test__window_crossing_midnight():
+    """A date range crossing midnight is computed across both buckets, and
+    an availability spanning midnight is returned whole.
+    """
+    group = _Group(_database(), (1, 2))
+    cache = GroupAvailabilityCache(group.get_availability, 100)
+    start_date = START_DATE + 20 * HOUR
+    end_date = START_DATE + DAY + 12 * HOUR
+
+    result = _get_availability(cache, group, start_date, end_date)
+
+    assert result == [Availability(start_date, end_date)]
+    assert group.computed == [(START_DATE, START_DATE + 2 * DAY)]
+    assert _get_availability(cache, group, start_date, end_date) == result
+    assert len(group.computed) == 1
+
+
+def test__reuses_partial_buckets():
+    """Only the buckets missing from the cache are computed, with
+    consecutive missing buckets computed together, and the result matches
+    computing the whole date range at once.
+    """
+    group = _Group(_database(), (1, 2, 3))
+    cache = GroupAvailabilityCache(group.get_availability, 100)
+
+    _get_availability(cache, group, START_DATE + DAY + HOUR,
+                      START_DATE + 2 * DAY)
+    _get_availability(cache, group, START_DATE + 3 * DAY + HOUR,
+                      START_DATE + 4 * DAY)
+    group.computed.clear()
+
+    result = _get_availability(cache, group, START_DATE + 10 * HOUR,
+                               START_DATE + 5 * DAY - HOUR)
+
+    assert group.computed == [
+        (START_DATE, START_DATE + DAY),
+        (START_DATE + 2 * DAY, START_DATE + 3 * DAY),
+        (START_DATE + 4 * DAY, START_DATE + 5 * DAY),
+    ]
+    assert result == group.get_availability(
+        1,
+        START_DATE + 10 * HOUR,
+        START_DATE + 5 * DAY - HOUR,
+        True,
+    )
+    assert result[0] == Availability(START_DATE + 13 * HOUR,
+                                     START_DATE + 5 * DAY - HOUR)
+
+
+def test__member_version_change_invalidates():
+    """A change to any member's data invalidates the group's buckets."""
+    db = _database()
+    group = _Group(db, (1, 2))
+    cache = GroupAvailabilityCache(group.get_availability, 100)
+    assert _get_availability(cache, group, START_DATE,
+                             START_DATE + DAY) == [
+        Availability(START_DATE, START_DATE + 10 * HOUR),
+        Availability(START_DATE + 12 * HOUR, START_DATE + DAY),
+    ]
+
+    db.create_event(2, 'Lunch', START_DATE + 12 * HOUR,
+                    START_DATE + 13 * HOUR)
+    result = _get_availability(cache, group, START_DATE, START_DATE + DAY)
+
+    assert len(group.computed) == 2
+    assert result == [
+        Availability(START_DATE, START_DATE + 10 * HOUR),
+        Availability(START_DATE + 13 * HOUR, START_DATE + DAY),
+    ]
+
+
+def test__membership_change_invalidates():
+    """Buckets are not shared between different members of a group."""
+    db = _database()
+    group = _Group(db, (1, 2))
+    cache = GroupAvailabilityCache(group.get_availability, 100)
+    _get_availability(cache, group, START_DATE, START_DATE + DAY)
+
+    group.member_ids = (1, 2, 3)
+    result = _get_availability(cache, group, START_DATE, START_DATE + DAY)
+
+    assert len(group.computed) == 2
+    assert result == [
+        Availability(START_DATE, START_DATE + 10 * HOUR),
+        Availability(START_DATE + 13 * HOUR, START_DATE + DAY),
+    ]
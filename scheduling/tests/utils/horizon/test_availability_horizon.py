@@ -0,0 +1,126 @@
+from data.database import Database
+from data.models import Event, User, WorkingHours
+from utils.availability_utils import Availability
+from utils.dates import to_timestamp
+from utils.horizon import AvailabilityHorizon
+
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+START_DATE = to_timestamp('2019-01-01T00:00:00+0000')
+
+
+def _database():
+    user = User(
+        id=1,
+        working_hours=WorkingHours('09:00', '17:00'),
+        time_zone='UTC',
+        events=[
+            Event(id=1, title='Meeting', start_date=START_DATE + 10 * HOUR,
+                  end_date=START_DATE + 11 * HOUR),
+        ],
+    )
+    return Database({1: user})
+
+
+def test__slices_precomputed_availability():
+    """Date ranges within the horizon are served from the precomputed
+    availabilities, clipped to the range.
+    """
+    horizon = AvailabilityHorizon(_database(), 2,
+                                  clock=lambda: START_DATE + HOUR)
+    horizon.refresh()
+
+    result = horizon.get_user_availability(
+        1,
+        START_DATE + 9 * HOUR + 1800,
+        START_DATE + DAY + 10 * HOUR,
+        False,
+    )
+
+    assert result == [
+        Availability(START_DATE + 9 * HOUR + 1800, START_DATE + 10 * HOUR),
+        Availability(START_DATE + 11 * HOUR, START_DATE + 17 * HOUR),
+        Availability(START_DATE + DAY + 9 * HOUR,
+                     START_DATE + DAY + 10 * HOUR),
+    ]
+    assert horizon.get_user_availability(
+        1,
+        START_DATE + 10 * HOUR,
+        START_DATE + 11 * HOUR,
+        True,
+    ) == []
+
+
+def test__outside_horizon():
+    """Date ranges that extend beyond the horizon are not served."""
+    horizon = AvailabilityHorizon(_database(), 2,
+                                  clock=lambda: START_DATE + HOUR)
+    horizon.refresh()
+
+    assert horizon.get_user_availability(
+        1,
+        START_DATE - HOUR,
+        START_DATE + DAY,
+        False,
+    ) is None
+    assert horizon.get_user_availability(
+        1,
+        START_DATE,
+        START_DATE + 3 * DAY,
+        False,
+    ) is None
+
+
+def test__refresh():
+    """Availability is not served once a user's data changes, until the
+    horizon is refreshed. The horizon advances as days pass.
+    """
+    db = _database()
+    now = START_DATE + HOUR
+    horizon = AvailabilityHorizon(db, 2, clock=lambda: now)
+    horizon.refresh()
+
+    db.create_event(1, 'New', START_DATE + 12 * HOUR, START_DATE + 13 * HOUR)
+
+    assert horizon.get_user_availability(1, START_DATE, START_DATE + DAY,
+                                         True) is None
+
+    horizon.refresh()
+
+    assert horizon.get_user_availability(1, START_DATE, START_DATE + DAY,
+                                         True) == [
+        Availability(START_DATE, START_DATE + 10 * HOUR),
+        Availability(START_DATE + 11 * HOUR, START_DATE + 12 * HOUR),
+        Availability(START_DATE + 13 * HOUR, START_DATE + DAY),
+    ]
+
+    now += DAY
+    horizon.refresh()
+
+    assert horizon.get_user_availability(1, START_DATE, START_DATE + DAY,
+                                         True) is None
+    assert horizon.get_user_availability(1, START_DATE + DAY,
+                                         START_DATE + 3 * DAY, True) == [
+        Availability(START_DATE + DAY, START_DATE + 3 * DAY),
+    ]
+
+
+def test__iterates_lazily():
+    """Availabilities sliced lazily from the horizon match those sliced
+    eagerly.
+    """
+    horizon = AvailabilityHorizon(_database(), 2, clock=lambda: START_DATE)
+    horizon.refresh()
+
+    result = horizon.iter_user_availability(1, START_DATE, START_DATE + DAY,
+                                            False)
+
+    assert not isinstance(result, list)
+    assert list(result) == horizon.get_user_availability(
+        1,
+        START_DATE,
+        START_DATE + DAY,
+        False,
+    )
+    assert horizon.iter_user_availability(1, START_DATE, START_DATE + 3 * DAY,
+                                          False) is None
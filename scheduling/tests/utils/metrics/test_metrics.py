@@ -0,0 +1,70 @@
+from utils import metrics
+from utils.metrics import Counter, Histogram
+
+
+def test__histogram_render():
+    """Buckets are reported cumulatively, along with the sum and count."""
+    histogram = Histogram('duration_seconds', 'Durations.', ('phase',),
+                          buckets=(0.1, 1))
+    histogram.observe(0.05, 'parse')
+    histogram.observe(0.1, 'parse')
+    histogram.observe(2, 'parse')
+
+    assert histogram.render() == [
+        '# HELP duration_seconds Durations.',
+        '# TYPE duration_seconds histogram',
+        'duration_seconds_bucket{phase="parse",le="0.1"} 2',
+        'duration_seconds_bucket{phase="parse",le="1"} 2',
+        'duration_seconds_bucket{phase="parse",le="+Inf"} 3',
+        'duration_seconds_sum{phase="parse"} 2.15',
+        'duration_seconds_count{phase="parse"} 3',
+    ]
+
+
+def test__counter_render():
+    """Counters without labels are reported as a single sample."""
+    counter = Counter('events_total', 'Events.')
+    counter.inc()
+    counter.inc(4)
+
+    assert counter.render() == [
+        '# HELP events_total Events.',
+        '# TYPE events_total counter',
+        'events_total 5',
+    ]
+
+
+def test__disabled():
+    """Nothing is recorded while instrumentation is disabled."""
+    metrics.set_enabled(False)
+    counter = Counter('events_total', 'Events.')
+
+    metrics.start_request_timing()
+    with metrics.phase('parse'):
+        pass
+    metrics.count(counter, 3)
+
+    assert metrics.finish_request_timing('endpoint') is None
+    assert counter.render()[2:] == []
+
+
+def test__server_timing():
+    """Each phase of a request is reported in milliseconds, with repeated
+    phases summed, followed by the request's total duration.
+    """
+    metrics.set_enabled(True)
+    try:
+        metrics.start_request_timing()
+        for _ in range(2):
+            with metrics.phase('fetch'):
+                pass
+        with metrics.phase('serialize'):
+            pass
+        server_timing = metrics.finish_request_timing('endpoint')
+    finally:
+        metrics.set_enabled(False)
+
+    names = [timing.split(';')[0] for timing in server_timing.split(', ')]
+    assert names == ['fetch', 'serialize', 'total']
+    assert all(';dur=' in timing for timing in server_timing.split(', '))
+    assert metrics.finish_request_timing('endpoint') is None
@@ -0,0 +1,43 @@
+import pytest
+
+from utils.dates import to_timestamp
+from utils.exceptions import InvalidParameterException
+from utils.request_params import parse_date_range
+
+
+def test__valid_date_range():
+    """Dates are converted to UTC epoch timestamps."""
+    result = parse_date_range(
+        '2019-01-01T09:00:00-05:00',
+        '2019-01-02T00:00:00+00:00',
+    )
+
+    assert result == (
+        to_timestamp('2019-01-01T14:00:00+00:00'),
+        to_timestamp('2019-01-02T00:00:00+00:00'),
+    )
+
+
+def test__invalid_date():
+    """Dates that are not in ISO 8601 format are rejected."""
+    with pytest.raises(InvalidParameterException) as e:
+        parse_date_range('2019-01-01T00:00:00+00:00', 'tomorrow')
+
+    assert str(e.value) == 'Invalid end_date: ISO 8601 format required'
+
+
+def test__missing_date():
+    """Dates that were not provided as strings are rejected."""
+    with pytest.raises(InvalidParameterException) as e:
+        parse_date_range(None, '2019-01-01T00:00:00+00:00')
+
+    assert str(e.value) == 'Invalid start_date: ISO 8601 format required'
+
+
+def test__start_date_after_end_date():
+    """The start date must be before the end date."""
+    with pytest.raises(InvalidParameterException):
+        parse_date_range(
+            '2019-01-02T00:00:00+00:00',
+            '2019-01-01T00:00:00+00:00',
+        )
@@ -0,0 +1,18 @@
+import pytest
+
+from utils.exceptions import InvalidParameterException
+from utils.request_params import parse_format
+
+
+def test__default_format():
+    """No format is used unless one is requested."""
+    assert parse_format(None) is None
+    assert parse_format('compact') == 'compact'
+
+
+def test__unsupported_format():
+    """Formats other than compact are rejected."""
+    with pytest.raises(InvalidParameterException) as e:
+        parse_format('csv')
+
+    assert str(e.value) == 'Invalid format: must be compact'
@@ -0,0 +1,31 @@
+import json
+
+from utils.availability_utils import Availability
+from utils.dates import to_timestamp
+from utils.responses import dumps_compact_json_list
+
+
+def test__compact_json_list():
+    """Availabilities are serialized as pairs of dates relative to the
+    offset, which is included along with the unit of the dates.
+    """
+    offset = to_timestamp('2019-01-01T00:00:00+00:00')
+    availabilities = [
+        Availability(offset + 3600, offset + 7200),
+        Availability(offset + 9000, offset + 9900),
+    ]
+
+    result = json.loads(dumps_compact_json_list(availabilities, offset))
+
+    assert result == {
+        'data': [[3600, 7200], [9000, 9900]],
+        'offset': offset,
+        'unit': 'seconds',
+    }
+
+
+def test__empty_compact_json_list():
+    """An empty list of availabilities is still a valid document."""
+    result = json.loads(dumps_compact_json_list([], 0))
+
+    assert result == {'data': [], 'offset': 0, 'unit': 'seconds'}
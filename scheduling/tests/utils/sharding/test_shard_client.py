@@ -0,0 +1,86 @@
+from http import HTTPStatus
+from threading import Thread
+from urllib.parse import parse_qs
+import json
+
+import pytest
+from werkzeug.serving import make_server
+
+from utils.availability_utils import Availability
+from utils.exceptions import ShardException
+from utils.sharding import ShardClient
+
+
+def _fake_shard(user_availabilities):
+    """Build a WSGI application serving the given users' availabilities."""
+    def app(environ, start_response):
+        user_ids = parse_qs(environ['QUERY_STRING'])['user_id']
+
+        missing_user_ids = [
+            user_id for user_id in user_ids
+            if int(user_id) not in user_availabilities
+        ]
+        if missing_user_ids:
+            status = '404 NOT FOUND'
+            body = {'message': f'User id {missing_user_ids[0]} does not exist'}
+        else:
+            status = '200 OK'
+            body = {'data': {
+                user_id: user_availabilities[int(user_id)]
+                for user_id in user_ids
+            }}
+
+        start_response(status, [('Content-Type', 'application/json')])
+        return [json.dumps(body).encode('utf-8')]
+    return app
+
+
+@pytest.fixture
+def shard_urls():
+    servers = [
+        make_server('127.0.0.1', 0, _fake_shard({2: [[10, 20]], 4: []})),
+        make_server('127.0.0.1', 0, _fake_shard({1: [[0, 30]]})),
+    ]
+    for server in servers:
+        Thread(target=server.serve_forever, daemon=True).start()
+
+    yield [f'http://127.0.0.1:{server.server_port}' for server in servers]
+
+    for server in servers:
+        server.shutdown()
+
+
+def test__fan_out(shard_urls):
+    """Each user's availabilities are fetched from the shard that owns them,
+    and returned in the order the users were requested.
+    """
+    client = ShardClient(shard_urls)
+
+    result = client.get_user_availabilities([1, 2, 4], 0, 100, False)
+
+    assert result == [
+        [Availability(0, 30)],
+        [Availability(10, 20)],
+        [],
+    ]
+
+
+def test__shard_error(shard_urls):
+    """Errors from a shard are raised with its status code and message."""
+    client = ShardClient(shard_urls)
+
+    with pytest.raises(ShardException) as e:
+        client.get_user_availabilities([1, 3], 0, 100, False)
+
+    assert e.value.status_code == HTTPStatus.NOT_FOUND
+    assert str(e.value) == 'User id 3 does not exist'
+
+
+def test__unavailable_shard(shard_urls):
+    """Shards that cannot be reached are reported as a bad gateway."""
+    client = ShardClient([shard_urls[0], 'http://127.0.0.1:1'], timeout=1)
+
+    with pytest.raises(ShardException) as e:
+        client.get_user_availabilities([1], 0, 100, False)
+
+    assert e.value.status_code == HTTPStatus.BAD_GATEWAY
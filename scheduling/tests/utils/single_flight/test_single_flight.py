@@ -0,0 +1,144 @@
+from threading import Event, Thread
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def _run_concurrently(single_flight, key, func, follower_count, timeout=None):
+    """Start a leader calling func, then followers for the same key while the
+    leader is still in flight. func must block until the returned event is
+    set.
+    """
+    results = []
+    errors = []
+
+    def call():
+        try:
+            results.append(single_flight.do(key, func, timeout))
+        except Exception as e:
+            errors.append(e)
+
+    leader = Thread(target=call)
+    leader.start()
+    while key not in single_flight._calls:
+        time.sleep(0.001)
+
+    followers = [Thread(target=call) for _ in range(follower_count)]
+    for follower in followers:
+        follower.start()
+    # Give the followers time to start waiting on the leader.
+    time.sleep(0.05)
+
+    return [leader] + followers, results, errors
+
+
+def test__concurrent_calls_share_one_computation():
+    """Calls for a key already in flight wait for it and share its result."""
+    single_flight = SingleFlight()
+    release = Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait()
+        return ['availability']
+
+    threads, results, errors = _run_concurrently(single_flight, 'key',
+                                                 compute, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [['availability']] * 5
+    assert errors == []
+
+
+def test__exception_is_propagated_to_waiting_calls():
+    """If the computation fails, every waiting call raises its exception."""
+    single_flight = SingleFlight()
+    release = Event()
+
+    def compute():
+        release.wait()
+        raise ValueError('failed')
+
+    threads, results, errors = _run_concurrently(single_flight, 'key',
+                                                 compute, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == []
+    assert len(errors) == 3
+    assert all(str(e) == 'failed' for e in errors)
+
+
+def test__timed_out_call_computes_independently():
+    """A call that waits longer than its timeout computes the result itself."""
+    single_flight = SingleFlight()
+    release = Event()
+
+    def compute():
+        release.wait()
+        return 'leader'
+
+    threads, _, _ = _run_concurrently(single_flight, 'key', compute, 0)
+
+    assert single_flight.do('key', lambda: 'follower', 0.01) == 'follower'
+
+    release.set()
+    threads[0].join()
+
+
+def test__completed_call_is_not_reused():
+    """Calls made after a computation completes start a new one."""
+    single_flight = SingleFlight()
+
+    assert single_flight.do('key', lambda: 1) == 1
+    assert single_flight.do('key', lambda: 2) == 2
+
+    with pytest.raises(ValueError):
+        single_flight.do('key', lambda: int('x'))
+    assert single_flight.do('key', lambda: 3) == 3
+
+
+def test__interrupted_call_is_computed_by_waiting_calls():
+    """If the computation is interrupted rather than failing, the waiting
+    calls compute the result themselves, rather than sharing a result of
+    None.
+    """
+    single_flight = SingleFlight()
+    release = Event()
+    leader_errors = []
+
+    def interrupt():
+        release.wait()
+        raise KeyboardInterrupt()
+
+    def lead():
+        try:
+            single_flight.do('key', interrupt)
+        except BaseException as e:
+            leader_errors.append(e)
+
+    leader = Thread(target=lead)
+    leader.start()
+    while 'key' not in single_flight._calls:
+        time.sleep(0.001)
+
+    results = []
+    follower = Thread(
+        target=lambda: results.append(single_flight.do('key', lambda: 2)),
+    )
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(leader_errors) == 1
+    assert isinstance(leader_errors[0], KeyboardInterrupt)
+    assert results == [2]
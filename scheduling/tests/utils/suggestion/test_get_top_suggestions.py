@@ -0,0 +1,72 @@
+from utils.availability_utils import Availability
+from utils.suggestion_utils import (
+    get_top_suggestions,
+    iter_candidate_starts,
+    Suggestion,
+)
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+def test__candidates_are_aligned_and_fit():
+    """Candidate start dates are aligned to the step, and leave room for the
+    whole meeting within the availability.
+    """
+    availabilities = [
+        Availability(100, 2 * HOUR),
+        Availability(3 * HOUR, 3 * HOUR + 1200),
+    ]
+
+    result = iter_candidate_starts(availabilities, HOUR, 900)
+
+    assert list(result) == [900, 1800, 2700, 3600]
+
+
+def test__closest_to_preferred_time_ranked_first():
+    """Meetings whose middle is nearest the preferred times rank first, with
+    earlier meetings breaking ties.
+    """
+    availabilities = [Availability(0, 2 * DAY)]
+    preferred_times = [[12 * HOUR, DAY + 12 * HOUR]]
+
+    result = get_top_suggestions(availabilities, HOUR, HOUR, 3,
+                                 preferred_times=preferred_times)
+
+    assert result == [
+        Suggestion(11 * HOUR, 12 * HOUR, []),
+        Suggestion(12 * HOUR, 13 * HOUR, []),
+        Suggestion(DAY + 11 * HOUR, DAY + 12 * HOUR, []),
+    ]
+
+
+def test__optional_attendees_outrank_preferred_times():
+    """Meetings more optional attendees are free for rank first."""
+    availabilities = [Availability(0, DAY)]
+    optional_user_availabilities = {
+        2: [Availability(0, 2 * HOUR), Availability(20 * HOUR, DAY)],
+        3: [Availability(HOUR, 2 * HOUR + 1800)],
+    }
+
+    result = get_top_suggestions(availabilities, HOUR, HOUR, 2,
+                                 optional_user_availabilities,
+                                 [[12 * HOUR]])
+
+    assert result == [
+        Suggestion(HOUR, 2 * HOUR, [2, 3]),
+        Suggestion(20 * HOUR, 21 * HOUR, [2]),
+    ]
+
+
+def test__only_limit_suggestions_are_returned():
+    """No more than the limit is returned, however many candidates there
+    are.
+    """
+    availabilities = [Availability(0, 365 * DAY)]
+
+    result = get_top_suggestions(availabilities, 1800, 900, 4)
+
+    assert result == [
+        Suggestion(start_date, start_date + 1800, [])
+        for start_date in (0, 900, 1800, 2700)
+    ]
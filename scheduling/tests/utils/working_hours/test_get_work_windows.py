@@ -0,0 +1,139 @@
+from data.models import WorkingHours, WorkingHoursTime
+from utils.dates import to_timestamp
+from utils.working_hours import WorkHourTemplate, get_work_hour_template
+
+WORKING_HOURS = WorkingHours(
+    WorkingHoursTime(9, 0),
+    WorkingHoursTime(17, 0),
+)
+
+
+def test__windows_are_clipped_to_date_range():
+    """Work windows are clipped to the requested date range."""
+    template = WorkHourTemplate(WORKING_HOURS, 'UTC')
+
+    result = template.get_work_windows(
+        to_timestamp("2019-01-01T12:00:00+00:00"),
+        to_timestamp("2019-01-02T10:00:00+00:00"),
+    )
+
+    assert result == [
+        (
+            to_timestamp("2019-01-01T12:00:00+00:00"),
+            to_timestamp("2019-01-01T17:00:00+00:00"),
+        ),
+        (
+            to_timestamp("2019-01-02T09:00:00+00:00"),
+            to_timestamp("2019-01-02T10:00:00+00:00"),
+        ),
+    ]
+
+
+def test__daylight_saving_time_transition():
+    """Work windows follow the local time across daylight saving time
+    transitions.
+    """
+    template = WorkHourTemplate(WORKING_HOURS, 'America/New_York')
+
+    result = template.get_work_windows(
+        to_timestamp("2019-03-09T00:00:00+00:00"),
+        to_timestamp("2019-03-12T00:00:00+00:00"),
+    )
+
+    assert result == [
+        (
+            to_timestamp("2019-03-09T14:00:00+00:00"),
+            to_timestamp("2019-03-09T22:00:00+00:00"),
+        ),
+        (
+            to_timestamp("2019-03-10T13:00:00+00:00"),
+            to_timestamp("2019-03-10T21:00:00+00:00"),
+        ),
+        (
+            to_timestamp("2019-03-11T13:00:00+00:00"),
+            to_timestamp("2019-03-11T21:00:00+00:00"),
+        ),
+    ]
+
+
+def test__windows_spanning_compilations():
+    """Date ranges that extend beyond the compiled days, in either
+    direction, are compiled as needed.
+    """
+    template = WorkHourTemplate(WORKING_HOURS, 'UTC')
+    template.get_work_windows(
+        to_timestamp("2019-01-01T00:00:00+00:00"),
+        to_timestamp("2019-01-02T00:00:00+00:00"),
+    )
+
+    result = template.get_work_windows(
+        to_timestamp("2015-06-01T00:00:00+00:00"),
+        to_timestamp("2023-06-01T00:00:00+00:00"),
+    )
+
+    assert len(result) == (
+        to_timestamp("2023-06-01T00:00:00+00:00") -
+        to_timestamp("2015-06-01T00:00:00+00:00")
+    ) // (24 * 60 * 60)
+
+
+def test__ends_of_the_calendar():
+    """Date ranges at the very start and end of the representable dates are
+    compiled up to the ends of the calendar, in time zones either side of
+    UTC.
+    """
+    for time_zone in ('UTC', 'Asia/Tokyo', 'America/Los_Angeles'):
+        template = WorkHourTemplate(WORKING_HOURS, time_zone)
+
+        first_days = template.get_work_windows(
+            to_timestamp("0001-01-01T00:00:00+00:00"),
+            to_timestamp("0001-01-05T00:00:00+00:00"),
+        )
+        last_days = template.get_work_windows(
+            to_timestamp("9999-12-25T00:00:00+00:00"),
+            to_timestamp("9999-12-31T23:59:59+00:00"),
+        )
+
+        # Days that fall partly outside of the calendar in UTC may be lost.
+        assert len(first_days) >= 3
+        assert len(last_days) >= 6
+
+    template = WorkHourTemplate(WORKING_HOURS, 'UTC')
+    assert template.get_work_windows(
+        to_timestamp("0001-01-01T00:00:00+00:00"),
+        to_timestamp("0001-01-02T00:00:00+00:00"),
+    ) == [(
+        to_timestamp("0001-01-01T09:00:00+00:00"),
+        to_timestamp("0001-01-01T17:00:00+00:00"),
+    )]
+
+
+def test__distant_date_ranges_replace_compiled_days():
+    """A date range apart from the compiled days is compiled on its own,
+    rather than along with every day in between.
+    """
+    template = WorkHourTemplate(WORKING_HOURS, 'UTC')
+    template.get_work_windows(
+        to_timestamp("2019-01-01T00:00:00+00:00"),
+        to_timestamp("2019-01-02T00:00:00+00:00"),
+    )
+
+    result = template.get_work_windows(
+        to_timestamp("9999-12-30T00:00:00+00:00"),
+        to_timestamp("9999-12-31T00:00:00+00:00"),
+    )
+
+    assert result == [(
+        to_timestamp("9999-12-30T09:00:00+00:00"),
+        to_timestamp("9999-12-30T17:00:00+00:00"),
+    )]
+    first_day, last_day, _, _ = template._windows
+    assert last_day - first_day <= 2 * 365
+
+
+def test__templates_are_cached():
+    """Templates are compiled once per working hours and time zone."""
+    template = get_work_hour_template(WORKING_HOURS, 'Europe/London')
+
+    assert get_work_hour_template(WORKING_HOURS, 'Europe/London') is template
+    assert get_work_hour_template(WORKING_HOURS, 'UTC') is not template
@@ -0,0 +1,200 @@
+import pytest
+
+from app import app
+from data.database import Database
+from data.groups import GroupStore
+from data.models import Event, Group, User, WorkingHours
+from utils.dates import to_timestamp
+import views.availability
+
+START_DATE = '2019-01-01T00:00:00+00:00'
+END_DATE = '2019-01-02T00:00:00+00:00'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    db = Database({
+        user_id: User(
+            id=user_id,
+            working_hours=WorkingHours('09:00', '17:00'),
+            time_zone='UTC',
+            events=[
+                Event(
+                    id=1,
+                    title='Meeting',
+                    start_date=to_timestamp(f'2019-01-01T{9 + user_id}:00:00'
+                                            '+00:00'),
+                    end_date=to_timestamp(f'2019-01-01T{10 + user_id}:00:00'
+                                          '+00:00'),
+                ),
+            ],
+        )
+        for user_id in (1, 2, 3)
+    })
+    monkeypatch.setattr(views.availability, 'db', db)
+    monkeypatch.setattr(views.availability, 'groups', GroupStore([
+        Group(1, 'Team', user_ids=[1, 2]),
+    ]))
+    views.availability.user_availability_cache.clear()
+    views.availability.common_availability_cache.clear()
+
+    return app.test_client()
+
+
+def _query(user_ids=None, **params):
+    query = {'start_date': START_DATE, 'end_date': END_DATE}
+    if user_ids is not None:
+        query['user_ids'] = user_ids
+    query.update(params)
+    return query
+
+
+def test__errors_are_reported_per_query(client):
+    """Invalid queries report their own error, without failing the valid
+    queries alongside them.
+    """
+    response = client.post('/scheduling/availability/batch', json={
+        'queries': [
+            _query([1]),
+            _query([1, 99]),
+            _query([]),
+            _query([1], start_date='tomorrow'),
+            'not a query',
+        ],
+    })
+
+    assert response.status_code == 200
+    results = response.get_json()['data']
+    assert results[0] == {'data': [
+        {
+            'start_date': '2019-01-01T09:00:00+00:00',
+            'end_date': '2019-01-01T10:00:00+00:00',
+        },
+        {
+            'start_date': '2019-01-01T11:00:00+00:00',
+            'end_date': '2019-01-01T17:00:00+00:00',
+        },
+    ]}
+    assert results[1] == {'message': 'User id 99 does not exist',
+                          'status': 404}
+    assert [result['status'] for result in results[2:]] == [400, 400, 400]
+
+
+@pytest.mark.parametrize('body', [None, {}, {'queries': []},
+                                  {'queries': {'user_ids': [1]}}, [1]])
+def test__missing_queries_are_rejected(client, body):
+    """A body without a non-empty list of queries is rejected as a whole."""
+    response = client.post('/scheduling/availability/batch', json=body)
+
+    assert response.status_code == 400
+
+
+def test__shared_users_are_computed_once(client, monkeypatch):
+    """A user included in several queries over the same date range has
+    their availability computed once for the whole batch.
+    """
+    computed = []
+    get_user_availability = views.availability._get_user_availability
+
+    def counting_get_user_availability(user_id, *args):
+        computed.append(user_id)
+        return get_user_availability(user_id, *args)
+
+    monkeypatch.setattr(views.availability, '_get_user_availability',
+                        counting_get_user_availability)
+
+    response = client.post('/scheduling/availability/batch', json={
+        'queries': [_query([1, 2]), _query([2, 3]), _query([1, 3])],
+    })
+
+    assert sorted(computed) == [1, 2, 3]
+    assert response.get_json()['data'][1] == {'data': [
+        {
+            'start_date': '2019-01-01T09:00:00+00:00',
+            'end_date': '2019-01-01T11:00:00+00:00',
+        },
+        {
+            'start_date': '2019-01-01T13:00:00+00:00',
+            'end_date': '2019-01-01T17:00:00+00:00',
+        },
+    ]}
+
+
+@pytest.mark.parametrize('query', [
+    _query([True]),
+    _query([1, False]),
+    _query(['1']),
+    _query(group_ids=[True]),
+    _query(),
+])
+def test__invalid_ids_are_rejected(client, query):
+    """User and group ids must be integers, and booleans are not accepted
+    as ids.
+    """
+    response = client.post('/scheduling/availability/batch',
+                           json={'queries': [query]})
+
+    assert response.get_json()['data'] == [{
+        'message': 'At least one user_id or group_id is required',
+        'status': 400,
+    }]
+
+
+def test__groups(client):
+    """Groups are replaced by their members, alongside any individual
+    users.
+    """
+    response = client.post('/scheduling/availability/batch', json={
+        'queries': [
+            _query(group_ids=[1]),
+            _query([2, 3], group_ids=[1]),
+            _query(group_ids=[99]),
+        ],
+    })
+
+    results = response.get_json()['data']
+    assert results[0] == {'data': [
+        {
+            'start_date': '2019-01-01T09:00:00+00:00',
+            'end_date': '2019-01-01T10:00:00+00:00',
+        },
+        {
+            'start_date': '2019-01-01T12:00:00+00:00',
+            'end_date': '2019-01-01T17:00:00+00:00',
+        },
+    ]}
+    assert results[1] == {'data': [
+        {
+            'start_date': '2019-01-01T09:00:00+00:00',
+            'end_date': '2019-01-01T10:00:00+00:00',
+        },
+        {
+            'start_date': '2019-01-01T13:00:00+00:00',
+            'end_date': '2019-01-01T17:00:00+00:00',
+        },
+    ]}
+    assert results[2] == {'message': 'Group id 99 does not exist',
+                          'status': 404}
+
+
+def test__compact_format(client):
+    """Queries may request the compact format individually."""
+    response = client.post('/scheduling/availability/batch', json={
+        'queries': [
+            _query([1], format='compact'),
+            _query([1]),
+            _query([1], format='csv'),
+        ],
+    })
+
+    results = response.get_json()['data']
+    assert results[0] == {
+        'data': [[9 * 3600, 10 * 3600], [11 * 3600, 17 * 3600]],
+        'offset': to_timestamp(START_DATE),
+        'unit': 'seconds',
+    }
+    assert results[1]['data'][0] == {
+        'start_date': '2019-01-01T09:00:00+00:00',
+        'end_date': '2019-01-01T10:00:00+00:00',
+    }
+    assert results[2]['status'] == 400
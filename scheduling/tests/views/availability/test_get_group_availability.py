@@ -0,0 +1,138 @@
+import pytest
+
+from app import app
+from data.database import Database
+from data.groups import GroupStore
+from data.models import Event, Group, User, WorkingHours
+from utils.dates import to_timestamp
+import views.availability
+
+START_DATE = '2019-01-01T00:00:00+00:00'
+END_DATE = '2019-01-02T00:00:00+00:00'
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = Database({
+        user_id: User(
+            id=user_id,
+            working_hours=WorkingHours('09:00', '17:00'),
+            time_zone='UTC',
+            events=[
+                Event(
+                    id=1,
+                    title='Meeting',
+                    start_date=to_timestamp(f'2019-01-01T{9 + user_id}:00:00'
+                                            '+00:00'),
+                    end_date=to_timestamp(f'2019-01-01T{10 + user_id}:00:00'
+                                          '+00:00'),
+                ),
+            ],
+        )
+        for user_id in (1, 2, 3, 4)
+    })
+    monkeypatch.setattr(views.availability, 'db', db)
+    monkeypatch.setattr(views.availability, 'groups', GroupStore([
+        Group(1, 'Engineering', user_ids=[1, 2], group_ids=[2]),
+        Group(2, 'Platform', user_ids=[2, 3]),
+    ]))
+    views.availability.user_availability_cache.clear()
+    views.availability.common_availability_cache.clear()
+    views.availability.group_availability_cache.clear()
+    return db
+
+
+@pytest.fixture
+def computed_group_ids(db, monkeypatch):
+    computed_group_ids = []
+    compute_group_availability = (
+        views.availability._compute_group_availability
+    )
+
+    def recording_compute_group_availability(group_id, *args):
+        computed_group_ids.append(group_id)
+        return compute_group_availability(group_id, *args)
+
+    monkeypatch.setattr(views.availability, '_compute_group_availability',
+                        recording_compute_group_availability)
+    return computed_group_ids
+
+
+def _get_availability(user_ids=(), group_ids=()):
+    response = app.test_client().get(
+        '/scheduling/availability/',
+        query_string={
+            'user_id': list(user_ids),
+            'group_id': list(group_ids),
+            'start_date': START_DATE,
+            'end_date': END_DATE,
+        },
+    )
+    return response.get_json()['data']
+
+
+def test__nested_groups_match_their_members(db):
+    """A group that contains another group is available when all of the
+    members of both are.
+    """
+    assert _get_availability(group_ids=[1]) == (
+        _get_availability(user_ids=[1, 2, 3])
+    )
+    assert _get_availability(user_ids=[4], group_ids=[1]) == [
+        {
+            'start_date': '2019-01-01T09:00:00+00:00',
+            'end_date': '2019-01-01T10:00:00+00:00',
+        },
+        {
+            'start_date': '2019-01-01T14:00:00+00:00',
+            'end_date': '2019-01-01T17:00:00+00:00',
+        },
+    ]
+
+
+def test__nested_groups_reuse_cached_groups(computed_group_ids,
+                                            monkeypatch):
+    """A group that contains another group is computed from that group's
+    cached availability, rather than from each of its members.
+    """
+    computed_user_ids = []
+    get_user_availability = views.availability._get_user_availability
+
+    def recording_get_user_availability(user_id, *args):
+        computed_user_ids.append(user_id)
+        return get_user_availability(user_id, *args)
+
+    monkeypatch.setattr(views.availability, '_get_user_availability',
+                        recording_get_user_availability)
+
+    _get_availability(group_ids=[2])
+    views.availability.user_availability_cache.clear()
+    _get_availability(group_ids=[1])
+    _get_availability(group_ids=[1, 2])
+
+    assert computed_group_ids == [2, 1]
+    assert computed_user_ids == [2, 3, 1]
+
+
+def test__nested_groups_are_invalidated(db, computed_group_ids):
+    """A change to a member of a contained group invalidates both groups."""
+    _get_availability(group_ids=[1])
+
+    db.create_event(3, 'Lunch', to_timestamp('2019-01-01T15:00:00+00:00'),
+                    to_timestamp('2019-01-01T16:00:00+00:00'))
+
+    assert _get_availability(group_ids=[1]) == [
+        {
+            'start_date': '2019-01-01T09:00:00+00:00',
+            'end_date': '2019-01-01T10:00:00+00:00',
+        },
+        {
+            'start_date': '2019-01-01T13:00:00+00:00',
+            'end_date': '2019-01-01T15:00:00+00:00',
+        },
+        {
+            'start_date': '2019-01-01T16:00:00+00:00',
+            'end_date': '2019-01-01T17:00:00+00:00',
+        },
+    ]
+    assert computed_group_ids == [1, 2, 1, 2]
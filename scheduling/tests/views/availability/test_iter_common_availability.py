@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from data.database import Database
+from data.models import Event, User, WorkingHours
+from utils.dates import to_timestamp
+import views.availability
+
+DAY = 24 * 60 * 60
+START_DATE = to_timestamp('2019-01-01T00:00:00+00:00')
+
+
+@pytest.fixture
+def db(monkeypatch):
+    rng = random.Random(0)
+    users = {}
+    for user_id, time_zone in enumerate(
+        ('UTC', 'Europe/Berlin', 'America/New_York'),
+        start=1,
+    ):
+        events = []
+        date = START_DATE
+        for event_id in range(60):
+            # Long gaps leave free intervals spanning several chunks.
+            date += rng.choice((3600, 5 * 3600, 3 * DAY, 9 * DAY))
+            events.append(Event(event_id, 'Meeting', date, date + 3600))
+            date += 3600
+        users[user_id] = User(user_id, WorkingHours('09:00', '17:00'),
+                              time_zone, events)
+
+    db = Database(users)
+    monkeypatch.setattr(views.availability, 'db', db)
+    views.availability.user_availability_cache.clear()
+    views.availability.common_availability_cache.clear()
+    return db
+
+
+@pytest.mark.parametrize('should_include_non_working_hours', [False, True])
+def test__matches_common_availability(db, should_include_non_working_hours):
+    """Fetching free intervals a chunk at a time yields the same
+    availabilities as fetching the whole date range at once.
+    """
+    end_date = START_DATE + 200 * DAY + 1234
+
+    for user_ids in ([1], [1, 2], [1, 2, 3]):
+        result = views.availability.iter_common_availability(
+            user_ids,
+            START_DATE + 500,
+            end_date,
+            should_include_non_working_hours,
+        )
+
+        assert list(result) == views.availability.get_common_availability(
+            user_ids,
+            START_DATE + 500,
+            end_date,
+            should_include_non_working_hours,
+        )
+
+
+def test__free_intervals_are_fetched_as_consumed(db, monkeypatch):
+    """Only the chunks of free intervals that are consumed are fetched, so
+    stopping early does not depend on the length of the date range.
+    """
+    fetched = []
+    get_user_free_intervals = db.get_user_free_intervals
+
+    def recording_get_user_free_intervals(user_id, start_date, end_date):
+        fetched.append((start_date, end_date))
+        return get_user_free_intervals(user_id, start_date, end_date)
+
+    monkeypatch.setattr(db, 'get_user_free_intervals',
+                        recording_get_user_free_intervals)
+
+    fetch_counts = []
+    for days in (30, 365):
+        fetched.clear()
+        result = views.availability.iter_common_availability(
+            [1, 2, 3],
+            START_DATE,
+            START_DATE + days * DAY,
+            False,
+        )
+        next(result)
+        next(result)
+        fetch_counts.append(len(fetched))
+
+    assert fetch_counts[0] == fetch_counts[1]
+    assert all(
+        end_date - start_date <= views.availability.FREE_INTERVAL_CHUNK_SIZE
+        for start_date, end_date in fetched
+    )
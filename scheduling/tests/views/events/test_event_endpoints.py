@@ -0,0 +1,134 @@
+import pytest
+
+from app import app
+from data.database import Database
+from data.models import Event, User, WorkingHours
+from utils.dates import to_timestamp
+import views.availability
+import views.events
+
+EVENT = {
+    'title': 'Lunch',
+    'start': '2019-01-01T12:00:00+00:00',
+    'end': '2019-01-01T13:00:00+00:00',
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    db = Database({
+        1: User(
+            id=1,
+            working_hours=WorkingHours('09:00', '17:00'),
+            time_zone='UTC',
+            events=[
+                Event(
+                    id=1,
+                    title='Meeting',
+                    start_date=to_timestamp('2019-01-01T10:00:00+00:00'),
+                    end_date=to_timestamp('2019-01-01T11:00:00+00:00'),
+                ),
+            ],
+        ),
+    })
+    monkeypatch.setattr(views.availability, 'db', db)
+    monkeypatch.setattr(views.events, 'db', db)
+    views.availability.user_availability_cache.clear()
+    views.availability.common_availability_cache.clear()
+
+    return app.test_client()
+
+
+def _get_availability(client):
+    response = client.get('/scheduling/availability/', query_string={
+        'user_id': 1,
+        'start_date': '2019-01-01T00:00:00+00:00',
+        'end_date': '2019-01-02T00:00:00+00:00',
+    })
+    return [
+        (availability['start_date'][11:16], availability['end_date'][11:16])
+        for availability in response.get_json()['data']
+    ]
+
+
+def test__create_event(client):
+    """Created events are returned with a newly allocated id, and change the
+    user's availability straight away.
+    """
+    assert _get_availability(client) == [('09:00', '10:00'),
+                                         ('11:00', '17:00')]
+
+    response = client.post('/scheduling/users/1/events/', json=EVENT)
+
+    assert response.status_code == 201
+    assert response.get_json() == {'data': dict(EVENT, id=2)}
+    assert _get_availability(client) == [('09:00', '10:00'),
+                                         ('11:00', '12:00'),
+                                         ('13:00', '17:00')]
+
+
+def test__update_event(client):
+    """Updated events are returned, and move within the user's
+    availability.
+    """
+    _get_availability(client)
+
+    response = client.put('/scheduling/users/1/events/1', json=EVENT)
+
+    assert response.status_code == 200
+    assert response.get_json() == {'data': dict(EVENT, id=1)}
+    assert _get_availability(client) == [('09:00', '12:00'),
+                                         ('13:00', '17:00')]
+
+
+def test__delete_event(client):
+    """Deleted events free the time they took up."""
+    _get_availability(client)
+
+    response = client.delete('/scheduling/users/1/events/1')
+
+    assert response.status_code == 204
+    assert response.get_data() == b''
+    assert _get_availability(client) == [('09:00', '17:00')]
+
+
+@pytest.mark.parametrize('body', [
+    None,
+    ['not', 'an', 'event'],
+    dict(EVENT, title=''),
+    dict(EVENT, title=None),
+    dict(EVENT, start='tomorrow'),
+    dict(EVENT, end=None),
+    dict(EVENT, end=EVENT['start']),
+])
+@pytest.mark.parametrize('method, path', [
+    ('post', '/scheduling/users/1/events/'),
+    ('put', '/scheduling/users/1/events/1'),
+])
+def test__invalid_events_are_rejected(client, method, path, body):
+    """Events without a title, or without a valid date range, are rejected
+    with a 400, leaving the user's schedule unchanged.
+    """
+    response = getattr(client, method)(path, json=body)
+
+    assert response.status_code == 400
+    assert 'message' in response.get_json()
+    assert _get_availability(client) == [('09:00', '10:00'),
+                                         ('11:00', '17:00')]
+
+
+@pytest.mark.parametrize('method, path, message', [
+    ('post', '/scheduling/users/2/events/', 'User id 2 does not exist'),
+    ('put', '/scheduling/users/2/events/1', 'User id 2 does not exist'),
+    ('delete', '/scheduling/users/2/events/1', 'User id 2 does not exist'),
+    ('put', '/scheduling/users/1/events/9', 'Event id 9 does not exist'),
+    ('delete', '/scheduling/users/1/events/9', 'Event id 9 does not exist'),
+])
+def test__unknown_users_and_events(client, method, path, message):
+    """Writes to users or events that do not exist are rejected with a
+    404.
+    """
+    response = getattr(client, method)(path, json=EVENT)
+
+    assert response.status_code == 404
+    assert response.get_json() == {'message': message}
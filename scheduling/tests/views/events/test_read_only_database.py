@@ -0,0 +1,40 @@
+import pytest
+
+from app import app
+from data.models import User, WorkingHours
+from data.snapshot_database import SnapshotDatabase, write_snapshot
+import views.events
+
+EVENT = {
+    'title': 'Meeting',
+    'start': '2019-01-01T10:00:00+00:00',
+    'end': '2019-01-01T11:00:00+00:00',
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    filename = str(tmp_path / 'db.snapshot')
+    write_snapshot(
+        [User(1, WorkingHours('09:00', '17:00'), 'UTC', [])],
+        filename,
+    )
+    monkeypatch.setattr(views.events, 'db', SnapshotDatabase(filename))
+    return app.test_client()
+
+
+@pytest.mark.parametrize('method, path', [
+    ('post', '/scheduling/users/1/events/'),
+    ('put', '/scheduling/users/1/events/1'),
+    ('delete', '/scheduling/users/1/events/1'),
+])
+def test__writes_conflict(client, method, path):
+    """Writes to a read-only database are rejected with a 409 and an error
+    message.
+    """
+    response = getattr(client, method)(path, json=EVENT)
+
+    assert response.status_code == 409
+    assert response.get_json() == {
+        'message': 'Events cannot be modified in a read-only database',
+    }
@@ -1,17 +1,21 @@
-import arrow
+from itertools import groupby, islice
+from operator import itemgetter
 
-UTC = 'UTC'
+from utils.dates import to_isoformat
+from utils.working_hours import get_work_hour_template
 
 
 class Availability():
     """Representation of a user's availability."""
 
+    __slots__ = ('start_date', 'end_date')
+
     def __init__(self, start_date, end_date):
         """Initialize an availability.
 
         Args:
-            start_date(str): The start date in ISO 8601 format.
-            end_date(str): The end date in ISO 8601 format.
+            start_date(int): The start date as a UTC epoch timestamp.
+            end_date(int): The end date as a UTC epoch timestamp.
         """
         self.start_date = start_date
         self.end_date = end_date
@@ -19,12 +23,14 @@ class Availability():
     def to_json(self):
         """Serialize the availability to json.
 
+        The dates are formatted as ISO 8601 strings, in UTC.
+
         Returns:
             (dict): The availability object in json-serializable form.
         """
         return {
-            'start_date': self.start_date,
-            'end_date': self.end_date,
+            'start_date': to_isoformat(self.start_date),
+            'end_date': to_isoformat(self.end_date),
         }
 
     def __eq__(self, other):
@@ -48,21 +54,39 @@ def get_user_availability(user_events, start_date, end_date):
         user_events(list(Event)): The users events that are scheduled within
             the date range. Assumed to be in ascending order by start date
             and that all events have some overlap with the provided date range.
-        start_date(str): The start date of the date range for which
-            availability should be calculated. Assumed to be in ISO 8601
-            format, UTC.
-        end_date(str): The end date of the date range for which availability
-            should be calculated. Assumed to be in ISO 8601 format, UTC.
+        start_date(int): The start date of the date range for which
+            availability should be calculated, as a UTC epoch timestamp.
+        end_date(int): The end date of the date range for which availability
+            should be calculated, as a UTC epoch timestamp.
 
     Returns:
         (list(Availability)): A list of availabilities for user.
     """
+    return list(iter_user_availability(user_events, start_date, end_date))
+
+
+def iter_user_availability(user_events, start_date, end_date):
+    """Lazily calculate a user's availability for a given date range.
+
+    Args:
+        user_events(iterable(Event)): The users events that are scheduled
+            within the date range. Assumed to be in ascending order by start
+            date and that all events have some overlap with the provided date
+            range.
+        start_date(int): The start date of the date range for which
+            availability should be calculated, as a UTC epoch timestamp.
+        end_date(int): The end date of the date range for which availability
+            should be calculated, as a UTC epoch timestamp.
+
+    Returns:
+        (generator(Availability)): The availabilities of the user, in
+            ascending order by start date.
+    """
     return _get_user_availability(
-        user_events,
+        _get_busy_intervals(user_events),
         start_date,
         end_date,
-        add_availability_func=add_availability,
-        get_date_func=lambda date: date,
+        get_availabilities_func=get_availabilities,
     )
 
 
@@ -77,11 +101,10 @@ def get_user_work_hour_availability(user_events, start_date, end_date,
         user_events(list(Event)): The users events that are scheduled within
             the date range. Assumed to be in ascending order by start date
             and that all events have some overlap with the provided date range.
-        start_date(str): The start date of the date range for which
-            availability should be calculated. Assumed to be in ISO 8601
-            format, UTC.
-        end_date(str): The end date of the date range for which availability
-            should be calculated. Assumed to be in ISO 8601 format, UTC.
+        start_date(int): The start date of the date range for which
+            availability should be calculated, as a UTC epoch timestamp.
+        end_date(int): The end date of the date range for which availability
+            should be calculated, as a UTC epoch timestamp.
         working_hours(data.models.WorkingHours): The hours during which
             a user works on a daily basis.
         time_zone(str): The time zone within which the user works.
@@ -90,62 +113,160 @@ def get_user_work_hour_availability(user_events, start_date, end_date,
         (list(Availability)): A list of availabilities for the user, within
             the user's working hours.
     """
-    def get_date_func(date):
-        return arrow.get(date).to(time_zone)
+    return list(iter_user_work_hour_availability(
+        user_events,
+        start_date,
+        end_date,
+        working_hours,
+        time_zone,
+    ))
 
-    add_availability_func = generate_add_work_hour_availability_function(
+
+def iter_user_work_hour_availability(user_events, start_date, end_date,
+                                     working_hours, time_zone):
+    """Lazily calculate a user's availability for a given date range, taking
+    working hours into consideration.
+
+    Args:
+        user_events(iterable(Event)): The users events that are scheduled
+            within the date range. Assumed to be in ascending order by start
+            date and that all events have some overlap with the provided date
+            range.
+        start_date(int): The start date of the date range for which
+            availability should be calculated, as a UTC epoch timestamp.
+        end_date(int): The end date of the date range for which availability
+            should be calculated, as a UTC epoch timestamp.
+        working_hours(data.models.WorkingHours): The hours during which
+            a user works on a daily basis.
+        time_zone(str): The time zone within which the user works.
+
+    Returns:
+        (generator(Availability)): The availabilities of the user within
+            their working hours, in ascending order by start date.
+    """
+    return iter_busy_interval_availability(
+        _get_busy_intervals(user_events),
+        start_date,
+        end_date,
         working_hours,
+        time_zone,
     )
 
+
+def iter_busy_interval_availability(busy_intervals, start_date, end_date,
+                                    working_hours=None, time_zone=None):
+    """Lazily calculate a user's availability for a given date range from
+    the start and end dates of their events.
+
+    This allows availability to be calculated directly from the columns of
+    an event store, without creating an Event for each event.
+
+    Args:
+        busy_intervals(iterable(tuple(int, int))): The start and end dates
+            of the user's events that are scheduled within the date range, as
+            UTC epoch timestamps. Assumed to be in ascending order by start
+            date and that all events have some overlap with the provided date
+            range.
+        start_date(int): The start date of the date range for which
+            availability should be calculated, as a UTC epoch timestamp.
+        end_date(int): The end date of the date range for which availability
+            should be calculated, as a UTC epoch timestamp.
+        working_hours(data.models.WorkingHours): The hours during which
+            a user works on a daily basis, or None if availability outside of
+            working hours should be included.
+        time_zone(str): The time zone within which the user works.
+
+    Returns:
+        (generator(Availability)): The availabilities of the user, in
+            ascending order by start date.
+    """
+    if working_hours is None:
+        get_availabilities_func = get_availabilities
+    else:
+        get_availabilities_func = (
+            generate_get_work_hour_availabilities_function(
+                working_hours,
+                time_zone,
+            )
+        )
+
     return _get_user_availability(
-        user_events,
+        busy_intervals,
         start_date,
         end_date,
-        add_availability_func,
-        get_date_func)
+        get_availabilities_func)
 
 
-def _get_user_availability(user_events, start_date, end_date,
-                           add_availability_func, get_date_func):
-    """Utility function for ascertaining a user's availability.
+def iter_free_interval_availability(free_intervals, working_hours=None,
+                                    time_zone=None):
+    """Lazily calculate a user's availability from the intervals during
+    which they have no events.
 
     Args:
-        user_events(list(Event)): The users events that are scheduled within
-            the date range. Assumed to be in ascending order by start date
-            and that all events have some overlap with the provided date range.
-        start_date(str): The start date of the date range for which
-            availability should be calculated. Assumed to be in ISO 8601
-            format, UTC.
-        end_date(str): The end date of the date range for which availability
-            should be calculated. Assumed to be in ISO 8601 format, UTC.
-        add_availability_func(function): The function responsible for
-            determining if an open slot in a user's schedule is a valid
-            availability for them, and adding it to the availabilities if so.
-        get_date_func(function): The function responsible for converting
-            an ISO 8601 UTC datestring into the format expected by the
-            add_availability_func.
+        free_intervals(iterable(tuple(int, int))): The start and end dates of
+            the user's free intervals, clipped to the date range for which
+            availability should be calculated, as UTC epoch timestamps, in
+            ascending order.
+        working_hours(data.models.WorkingHours): The hours during which
+            a user works on a daily basis, or None if availability outside of
+            working hours should be included.
+        time_zone(str): The time zone within which the user works.
 
-    Returns:
-        (list(Availability)): A list of valid availabilities for the user.
+    Yields:
+        (Availability): The availabilities of the user, in ascending order by
+            start date.
     """
-    availabilities = []
+    if working_hours is None:
+        get_availabilities_func = get_availabilities
+    else:
+        get_availabilities_func = (
+            generate_get_work_hour_availabilities_function(
+                working_hours,
+                time_zone,
+            )
+        )
 
-    start_date = get_date_func(start_date)
-    end_date = get_date_func(end_date)
+    for start_date, end_date in free_intervals:
+        yield from get_availabilities_func(
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+
+def _get_busy_intervals(user_events):
+    return ((event.start_date, event.end_date) for event in user_events)
 
-    availability_start = start_date
 
-    for event in user_events:
-        event_start = get_date_func(event.start_date)
-        event_end = get_date_func(event.end_date)
+def _get_user_availability(busy_intervals, start_date, end_date,
+                           get_availabilities_func):
+    """Utility function for ascertaining a user's availability.
 
+    Args:
+        busy_intervals(iterable(tuple(int, int))): The start and end dates
+            of the user's events that are scheduled within the date range.
+            Assumed to be in ascending order by start date and that all
+            events have some overlap with the provided date range.
+        start_date(int): The start date of the date range for which
+            availability should be calculated, as a UTC epoch timestamp.
+        end_date(int): The end date of the date range for which availability
+            should be calculated, as a UTC epoch timestamp.
+        get_availabilities_func(function): The function responsible for
+            determining which portions of an open slot in a user's schedule
+            are valid availabilities for them.
+
+    Yields:
+        (Availability): The valid availabilities for the user, in ascending
+            order by start date.
+    """
+    availability_start = start_date
+
+    for event_start, event_end in busy_intervals:
         # Account for overlapping events
         if event_start <= availability_start:
             availability_start = max(availability_start, event_end)
             continue
 
-        add_availability_func(
-            availabilities=availabilities,
+        yield from get_availabilities_func(
             start_date=availability_start,
             end_date=event_start,
         )
@@ -154,53 +275,48 @@ def _get_user_availability(user_events, start_date, end_date,
 
     # Account for any availability between the final event & the end date
     if availability_start < end_date:
-        add_availability_func(
-            availabilities=availabilities,
+        yield from get_availabilities_func(
             start_date=availability_start,
             end_date=end_date,
         )
 
-    return availabilities
-
 
-def add_availability(availabilities, start_date, end_date):
-    """Add an availability to a list.
+def get_availabilities(start_date, end_date):
+    """Determine the availabilities within an open slot.
 
     Args:
-        availabilities(list(Availability)): The list to which the
-            availability should be appended.
-        start_date(str): The start of the availability range in ISO 8601
-            format.
-        end_date(str): The end of the availability range in ISO 8601
-            format.
+        start_date(int): The start of the open slot as a UTC epoch
+            timestamp.
+        end_date(int): The end of the open slot as a UTC epoch timestamp.
+
+    Returns:
+        (tuple(Availability)): A single availability spanning the open slot.
     """
-    availabilities.append(Availability(start_date, end_date))
+    return (Availability(start_date, end_date),)
 
 
-def generate_add_work_hour_availability_function(working_hours):
-    """Generate a work-hour conscious function for adding availabilities.
+def generate_get_work_hour_availabilities_function(working_hours, time_zone):
+    """Generate a work-hour conscious function for determining the
+    availabilities within an open slot.
 
     Args:
         working_hours(data.models.WorkingHours): The work hours to be
-            considered when adding availabilities.
+            considered when determining availabilities.
+        time_zone(str): The time zone within which the work hours apply.
 
     Returns:
-        (function): A function that determines the portions of an
-            availability that do not intersect with working hours, and
-            adds those to a list.
+        (function): A function that determines the portions of an open slot
+            that intersect with working hours.
     """
-    def _add_work_hour_availability(availabilities, start_date, end_date):
-        add_work_hour_availability(
-            availabilities,
-            start_date,
-            end_date,
-            working_hours,
-        )
-    return _add_work_hour_availability
+    template = get_work_hour_template(working_hours, time_zone)
+
+    def _get_work_hour_availabilities(start_date, end_date):
+        return _get_work_window_availabilities(start_date, end_date, template)
+    return _get_work_hour_availabilities
 
 
 def add_work_hour_availability(availabilities, start_date,
-                               end_date, working_hours):
+                               end_date, working_hours, time_zone):
     """Append work-hour-conscious availabilties to a list.
 
     If an availability window spans multiple working days, the window will
@@ -208,53 +324,92 @@ def add_work_hour_availability(availabilities, start_date,
     working hours.
 
     Args:
-        start_date(arrow.Arrow): The start date of the availability range.
-        end_date(arrow.Arrow): The end date of the availability range.
+        availabilities(list(Availability)): The list to which the
+            availabilities should be appended.
+        start_date(int): The start date of the availability range, as a UTC
+            epoch timestamp.
+        end_date(int): The end date of the availability range, as a UTC
+            epoch timestamp.
         working_hours(data.models.WorkingHours): The working hours of a user.
+        time_zone(str): The time zone within which the user works.
     """
-    work_day_start = start_date.replace(
-        hour=working_hours.start.hour,
-        minute=working_hours.start.minute,
-    )
-    work_day_end = start_date.replace(
-        hour=working_hours.end.hour,
-        minute=working_hours.end.minute,
-    )
+    availabilities.extend(_get_work_window_availabilities(
+        start_date,
+        end_date,
+        get_work_hour_template(working_hours, time_zone),
+    ))
 
-    while work_day_start < end_date:
-        _add_isoformat_utc_availability(
-            availabilities,
-            start_date,
-            end_date,
-            work_day_start,
-            work_day_end,
-        )
-        work_day_start = work_day_start.shift(days=1)
-        work_day_end = work_day_end.shift(days=1)
 
+def _get_work_window_availabilities(start_date, end_date, template):
+    """Utility function for determining the portions of an open slot that
+    fall within work hours.
+
+    Args:
+        start_date(int): The start of the open slot, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the open slot, as a UTC epoch timestamp.
+        template(utils.working_hours.WorkHourTemplate): The compiled work
+            hours of the user.
+
+    Returns:
+        (list(Availability)): The availabilities within work hours.
+    """
+    return [
+        Availability(availability_start, availability_end)
+        for availability_start, availability_end
+        in template.get_work_windows(start_date, end_date)
+    ]
 
-def _add_isoformat_utc_availability(availabilities, start_date, end_date,
-                                    work_day_start, work_day_end):
-    """Utility function for adding an availability to a list, taking work
-    hours into account.
 
-    If, when work hours are taken into account, there is a non-zero duration
-    of availability, that availability will be added to the provided list.
+def get_quorum_availabilities(user_availabilities, min_available_users):
+    """Determine when at least a minimum number of the given users are
+    available.
+
+    Performs a single sweep over the start and end dates of every user's
+    availabilities, keeping a running count of how many users are
+    available at each point.
 
     Args:
-        availabilities(list(Availability)): The list of availabilities to be
-            added to.
-        start_date(arrow.Arrow): The start of the availability range.
-        end_date(arrow.Arrow): The end of the availability range.
-        work_day_start(arrow.Arrow): The start of a work day.
-        work_day_end(arrow.Arrow): The end of a work day.
+        user_availabilities(list(list(Availability))): A list of user
+            availabilities, where each user's availabilities do not overlap.
+        min_available_users(int): The minimum number of users that must be
+            available for a period to be considered an availability.
+
+    Returns:
+        list(Availability): A list of availabilities during which at least
+            min_available_users of the given users are available, in
+            ascending order by start date.
     """
-    availability_start = max(work_day_start, start_date).to(UTC).isoformat()
-    availability_end = min(work_day_end, end_date).to(UTC).isoformat()
+    boundaries = sorted(
+        boundary
+        for user_availability in user_availabilities
+        for availability in user_availability
+        for boundary in (
+            (availability.start_date, 1),
+            (availability.end_date, -1),
+        )
+    )
 
-    if availability_start < availability_end:
-        availability = Availability(availability_start, availability_end)
-        availabilities.append(availability)
+    availabilities = []
+
+    available_users = 0
+    availability_start = None
+
+    # Every change at a date is applied before the count is compared to the
+    # quorum, so that one user leaving as another arrives does not split an
+    # availability in two.
+    for date, changes in groupby(boundaries, key=itemgetter(0)):
+        available_users += sum(change for _, change in changes)
+
+        if available_users >= min_available_users:
+            if availability_start is None:
+                availability_start = date
+        elif availability_start is not None:
+            if date > availability_start:
+                availabilities.append(Availability(availability_start, date))
+            availability_start = None
+
+    return availabilities
 
 
 def get_intersecting_availabilities(user_availabilities):
@@ -269,34 +424,79 @@ def get_intersecting_availabilities(user_availabilities):
         list(Availability): A list of availabilities common to all
             given users.
     """
+    return list(iter_intersecting_availabilities(user_availabilities))
+
+
+def iter_intersecting_availabilities(user_availabilities):
+    """Lazily determine all intersecting availabilities for the given users.
+
+    Each user's availabilities are only consumed as far as is needed to
+    produce the next intersecting availability.
+
+    Args:
+        user_availabilities(list(iterable(Availability))): A list of user
+            availabilities, where each user's availabilities are ordered by
+            ascending start time.
+
+    Yields:
+        (Availability): The availabilities common to all given users, in
+            ascending order by start date.
+    """
     iters = []
 
-    max_start_date = ''
     for user_availability in user_availabilities:
         iterator = iter(user_availability)
-        current = next(iterator)
+        current = next(iterator, None)
 
-        iters.append({'current': current, 'iterator': iterator})
+        # A user without any availability has nothing in common with others
+        if current is None:
+            return
 
-        max_start_date = max(max_start_date, current.start_date)
+        iters.append({'current': current, 'iterator': iterator})
 
-    availabilities = []
+    max_start_date = max(i['current'].start_date for i in iters)
 
     while True:
         min_end = min(iters,  key=lambda i: i['current'].end_date)
         min_end_date = min_end['current'].end_date
         if min_end_date > max_start_date:
-            availability = Availability(max_start_date, min_end_date)
-            availabilities.append(availability)
+            yield Availability(max_start_date, min_end_date)
 
-        try:
-            min_end['current'] = next(min_end['iterator'])
-        except StopIteration:
+        min_end['current'] = next(min_end['iterator'], None)
+        if min_end['current'] is None:
             break
 
         max_start_date = max(min_end['current'].start_date, max_start_date)
 
-    return availabilities
+
+def iter_qualifying_availabilities(availabilities, min_duration=None,
+                                   limit=None):
+    """Lazily select the availabilities that are long enough to be useful.
+
+    Availabilities are only consumed until the limit is reached, so when
+    given a lazily computed series of availabilities, no more work is done
+    than is needed to find enough of them.
+
+    Args:
+        availabilities(iterable(Availability)): The availabilities to select
+            from.
+        min_duration(int): The minimum duration of an availability, in
+            seconds, or None if there is no minimum.
+        limit(int): The maximum number of availabilities to select, or None
+            if there is no maximum.
+
+    Returns:
+        (iterator(Availability)): The selected availabilities, in their
+            original order.
+    """
+    if min_duration is not None:
+        availabilities = (
+            availability
+            for availability in availabilities
+            if availability.end_date - availability.start_date >= min_duration
+        )
+
+    return islice(availabilities, limit)
 
 
 # This was a first pass that I abstracted to the above; keeping it here to show
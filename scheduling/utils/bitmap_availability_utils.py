@@ -0,0 +1,149 @@
+from collections import namedtuple
+
+import numpy as np
+
+from utils.availability_utils import Availability
+from utils.working_hours import get_work_hour_template
+
+# A grid of fixed-size slots covering a date range. Slots are aligned to
+# multiples of their size since the epoch, so that they line up across users
+# and, for sizes that divide evenly into a day, with every UTC day.
+Slots = namedtuple('Slots', ['origin', 'size', 'count'])
+
+
+def get_slots(start_date, end_date, slot_size):
+    """Determine the grid of slots covering a date range.
+
+    Args:
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        slot_size(int): The length of each slot, in seconds.
+
+    Returns:
+        (Slots): The slots, the first of which contains the start of the
+            date range and the last of which contains the end of it.
+    """
+    origin = start_date // slot_size * slot_size
+    count = -(-(end_date - origin) // slot_size)
+    return Slots(origin, slot_size, count)
+
+
+def get_availability_bitmap(free_intervals, slots, working_hours=None,
+                            time_zone=None):
+    """Convert a user's free time into a bitmap of the slots during which
+    they are available.
+
+    A slot is only available if the user is free for the whole of it, and,
+    if working hours are provided, it falls entirely within them.
+
+    Args:
+        free_intervals(iterable(tuple(int, int))): The start and end dates of
+            the user's free intervals, as UTC epoch timestamps, in ascending
+            order.
+        slots(Slots): The slots covering the date range.
+        working_hours(data.models.WorkingHours): The hours during which
+            a user works on a daily basis, or None if availability outside of
+            working hours should be included.
+        time_zone(str): The time zone within which the user works.
+
+    Returns:
+        (numpy.ndarray): A bool array with an element for each slot, which is
+            True if the user is available for that slot.
+    """
+    bitmap = _get_interval_bitmap(free_intervals, slots)
+
+    if working_hours is not None:
+        template = get_work_hour_template(working_hours, time_zone)
+        bitmap &= _get_interval_bitmap(
+            template.get_work_windows(
+                slots.origin,
+                slots.origin + slots.count * slots.size,
+            ),
+            slots,
+        )
+
+    return bitmap
+
+
+def get_intersecting_bitmap(bitmaps):
+    """Determine the slots during which every user is available.
+
+    Args:
+        bitmaps(list(numpy.ndarray)): The availability bitmap of each user,
+            over the same slots.
+
+    Returns:
+        (numpy.ndarray): The bitwise AND of the bitmaps.
+    """
+    return np.logical_and.reduce(bitmaps)
+
+
+def get_quorum_bitmap(bitmaps, min_available_users):
+    """Determine the slots during which at least a minimum number of users
+    are available.
+
+    Args:
+        bitmaps(list(numpy.ndarray)): The availability bitmap of each user,
+            over the same slots.
+        min_available_users(int): The minimum number of users that must be
+            available for a slot to be considered available.
+
+    Returns:
+        (numpy.ndarray): A bool array with an element for each slot, which is
+            True if enough users are available for that slot.
+    """
+    return np.count_nonzero(np.stack(bitmaps), axis=0) >= min_available_users
+
+
+def get_bitmap_availabilities(bitmap, slots):
+    """Convert a bitmap of available slots into availabilities.
+
+    Args:
+        bitmap(numpy.ndarray): A bool array with an element for each slot.
+        slots(Slots): The slots that the bitmap covers.
+
+    Returns:
+        (list(Availability)): An availability for each run of consecutive
+            available slots, in ascending order by start date.
+    """
+    padded = np.concatenate(([False], bitmap, [False]))
+    is_start = padded[1:] & ~padded[:-1]
+    is_end = padded[:-1] & ~padded[1:]
+
+    starts = slots.origin + np.flatnonzero(is_start) * slots.size
+    ends = slots.origin + np.flatnonzero(is_end) * slots.size
+
+    return [
+        Availability(start_date, end_date)
+        for start_date, end_date in zip(starts.tolist(), ends.tolist())
+    ]
+
+
+def _get_interval_bitmap(intervals, slots):
+    """Mark the slots that fall entirely within any of the given
+    intervals.
+
+    Args:
+        intervals(iterable(tuple(int, int))): The start and end dates of the
+            intervals, as UTC epoch timestamps. Assumed not to overlap.
+        slots(Slots): The slots covering the date range.
+
+    Returns:
+        (numpy.ndarray): A bool array with an element for each slot.
+    """
+    bounds = np.array(list(intervals), dtype=np.int64).reshape(-1, 2)
+
+    # Round the start of each interval up, and the end down, to the nearest
+    # slot boundary, so that partially covered slots are left unmarked.
+    firsts = -(-(bounds[:, 0] - slots.origin) // slots.size)
+    lasts = (bounds[:, 1] - slots.origin) // slots.size
+    firsts = np.clip(firsts, 0, slots.count)
+    lasts = np.clip(lasts, 0, slots.count)
+
+    is_covered = firsts < lasts
+    changes = np.zeros(slots.count + 1, dtype=np.int64)
+    np.add.at(changes, firsts[is_covered], 1)
+    np.add.at(changes, lasts[is_covered], -1)
+
+    return np.cumsum(changes[:-1]) > 0
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class LRUCache():
+    """A thread-safe, size-bounded cache with optional expiry.
+
+    When the cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        """Initialize the cache.
+
+        Args:
+            max_size(int): The maximum number of entries held in the cache.
+            ttl(float): The number of seconds after which an entry expires,
+                or None if entries should never expire.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """Retrieve an entry from the cache.
+
+        Args:
+            key(hashable): The key of the entry.
+            default: The value to return if there is no such entry, or it
+                has expired.
+
+        Returns:
+            The cached value, or the default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Add an entry to the cache, evicting the least recently used entry
+        if the cache is full.
+
+        Args:
+            key(hashable): The key of the entry.
+            value: The value to cache.
+        """
+        expires_at = None
+        if self._ttl is not None:
+            expires_at = time.monotonic() + self._ttl
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,50 @@
+import calendar
+from datetime import datetime, timedelta, timezone
+
+import arrow
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_SECOND = timedelta(seconds=1)
+
+
+def to_timestamp(date):
+    """Convert a date into a UTC epoch timestamp.
+
+    Strings are parsed with datetime.fromisoformat, which is far faster than
+    arrow, as every event date is converted when a database is loaded.
+    Arrow is only used for the formats it does not accept. Dates without an
+    offset are taken to be in UTC.
+
+    Args:
+        date(str|arrow.Arrow): The date to convert, either as an ISO 8601
+            formatted string or as an arrow object.
+
+    Returns:
+        (int): The number of whole seconds since the epoch, UTC.
+
+    Raises:
+        ValueError: If the date could not be parsed.
+    """
+    if isinstance(date, str):
+        try:
+            parsed = datetime.fromisoformat(date)
+        except ValueError:
+            pass
+        else:
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return (parsed - EPOCH) // ONE_SECOND
+
+    return calendar.timegm(arrow.get(date).utctimetuple())
+
+
+def to_isoformat(timestamp):
+    """Convert a UTC epoch timestamp into an ISO 8601 date string.
+
+    Args:
+        timestamp(int): The number of seconds since the epoch, UTC.
+
+    Returns:
+        (str): The date in ISO 8601 format, UTC.
+    """
+    return arrow.get(timestamp).isoformat()
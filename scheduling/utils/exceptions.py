@@ -0,0 +1,11 @@
+class InvalidParameterException(Exception):
+    """Raised when a request parameter is missing or invalid"""
+    pass
+
+
+class ShardException(Exception):
+    """Raised when a shard responds with an error, or cannot be reached"""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
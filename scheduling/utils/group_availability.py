@@ -0,0 +1,215 @@
+from utils.availability_utils import Availability
+from utils.cache import LRUCache
+from utils.metrics import count, group_bucket_lookups
+
+# Availability is cached a bucket of this many seconds at a time, unless
+# another size is provided, aligned to UTC midnight.
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class GroupAvailabilityCache():
+    """Caches the availability common to the members of groups, a bucket of
+    time at a time.
+
+    Buckets are aligned to the epoch, so requests over different but
+    overlapping date ranges share the same buckets, and only the buckets
+    that are not cached are computed, with consecutive buckets computed
+    together. Entries are keyed on the members and the versions of their
+    data, so a change to any member's data, or to the members of a group,
+    invalidates its entries without waiting for them to expire.
+
+    Buckets are computed for whole buckets at a time, so the availability
+    function of a group that contains other groups can combine their cached
+    buckets, rather than computing their members' availability again.
+    """
+
+    def __init__(self, get_availability_func, max_size, ttl=None,
+                 bucket_size=SECONDS_PER_DAY):
+        """Initialize the cache.
+
+        Args:
+            get_availability_func(function): Computes the availability
+                common to the members of a group, taking the id of the
+                group, the start and end dates and whether to include
+                non-working hours, and returning a list of Availability in
+                ascending order.
+            max_size(int): The maximum number of buckets held in the cache.
+            ttl(float): The number of seconds after which a bucket expires,
+                or None if buckets should never expire.
+            bucket_size(int): The number of seconds in each bucket.
+        """
+        self._get_availability = get_availability_func
+        self._bucket_size = bucket_size
+        self._cache = LRUCache(max_size, ttl)
+
+    def get_availability(self, group_id, member_ids, member_versions,
+                         start_date, end_date,
+                         should_include_non_working_hours):
+        """Determine the availability common to the members of a group.
+
+        Args:
+            group_id(int): The id of the group, which is passed to the
+                availability function. Groups with the same members share
+                the same entries.
+            member_ids(tuple(int)): The ids of the members, in ascending
+                order.
+            member_versions(tuple(int)): The current version of each
+                member's data, in the same order as member_ids.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+            should_include_non_working_hours(bool): Whether availability
+                outside of the members' working hours should be included.
+
+        Returns:
+            (list(Availability)): The common availabilities of the members.
+
+        Raises:
+            Exception: Whatever the availability function raised.
+        """
+        first_bucket = start_date // self._bucket_size
+        last_bucket = (end_date - 1) // self._bucket_size
+
+        def get_cache_key(bucket):
+            return (
+                member_ids,
+                member_versions,
+                bucket,
+                should_include_non_working_hours,
+            )
+
+        bucket_availabilities = {}
+        missing_buckets = []
+        for bucket in range(first_bucket, last_bucket + 1):
+            availabilities = self._cache.get(get_cache_key(bucket))
+            if availabilities is None:
+                missing_buckets.append(bucket)
+            else:
+                bucket_availabilities[bucket] = availabilities
+        count(group_bucket_lookups, len(bucket_availabilities), 'hit')
+        count(group_bucket_lookups, len(missing_buckets), 'miss')
+
+        for run_first_bucket, run_last_bucket in get_runs(missing_buckets):
+            run_availabilities = split_into_buckets(
+                self._get_availability(
+                    group_id,
+                    run_first_bucket * self._bucket_size,
+                    (run_last_bucket + 1) * self._bucket_size,
+                    should_include_non_working_hours,
+                ),
+                run_first_bucket,
+                run_last_bucket,
+                self._bucket_size,
+            )
+            for bucket, availabilities in run_availabilities.items():
+                self._cache.set(get_cache_key(bucket), availabilities)
+                bucket_availabilities[bucket] = availabilities
+
+        return join_buckets(
+            [
+                bucket_availabilities[bucket]
+                for bucket in range(first_bucket, last_bucket + 1)
+            ],
+            start_date,
+            end_date,
+            self._bucket_size,
+        )
+
+    def clear(self):
+        """Remove every bucket from the cache."""
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+def get_runs(buckets):
+    """Group ascending buckets into runs of consecutive buckets.
+
+    Args:
+        buckets(list(int)): The buckets, in ascending order.
+
+    Returns:
+        (list(tuple(int, int))): The first and last bucket of each run.
+    """
+    runs = []
+    for bucket in buckets:
+        if runs and runs[-1][1] == bucket - 1:
+            runs[-1] = (runs[-1][0], bucket)
+        else:
+            runs.append((bucket, bucket))
+    return runs
+
+
+def split_into_buckets(availabilities, first_bucket, last_bucket,
+                       bucket_size=SECONDS_PER_DAY):
+    """Split availabilities at the boundaries between buckets.
+
+    Args:
+        availabilities(list(Availability)): The availabilities, in ascending
+            order by start date, within the buckets.
+        first_bucket(int): The first bucket.
+        last_bucket(int): The last bucket.
+        bucket_size(int): The number of seconds in each bucket.
+
+    Returns:
+        (dict(int, list(Availability))): The availabilities within each
+            bucket, including those with none.
+    """
+    bucket_availabilities = {
+        bucket: []
+        for bucket in range(first_bucket, last_bucket + 1)
+    }
+
+    for availability in availabilities:
+        for bucket in range(
+            availability.start_date // bucket_size,
+            (availability.end_date - 1) // bucket_size + 1,
+        ):
+            bucket_availabilities[bucket].append(Availability(
+                max(availability.start_date, bucket * bucket_size),
+                min(availability.end_date, (bucket + 1) * bucket_size),
+            ))
+
+    return bucket_availabilities
+
+
+def join_buckets(bucket_availabilities, start_date, end_date,
+                 bucket_size=SECONDS_PER_DAY):
+    """Join the availabilities of consecutive buckets, clipped to a date
+    range, rejoining any that were split at the boundaries between them.
+
+    Args:
+        bucket_availabilities(list(list(Availability))): The availabilities
+            of each bucket, in ascending order.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        bucket_size(int): The number of seconds in each bucket.
+
+    Returns:
+        (list(Availability)): The availabilities, in ascending order by start
+            date.
+    """
+    joined = []
+
+    for availabilities in bucket_availabilities:
+        for availability in availabilities:
+            availability_start = max(availability.start_date, start_date)
+            availability_end = min(availability.end_date, end_date)
+            if availability_start >= availability_end:
+                continue
+
+            if (
+                joined and
+                joined[-1].end_date == availability_start and
+                availability_start % bucket_size == 0
+            ):
+                joined[-1] = Availability(joined[-1].start_date,
+                                          availability_end)
+            else:
+                joined.append(Availability(availability_start,
+                                           availability_end))
+
+    return joined
@@ -0,0 +1,252 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from threading import Event, Thread
+import logging
+import os
+import time
+
+from data.exceptions import UserNotFoundException
+from utils.availability_utils import (
+    Availability,
+    iter_free_interval_availability,
+)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# The number of seconds between checks for users whose data has changed.
+DEFAULT_REFRESH_INTERVAL = 5
+
+logger = logging.getLogger(__name__)
+
+# The precomputed availabilities of a user between two dates, as of a
+# version of their data, held as arrays of their start and end dates.
+HorizonEntry = namedtuple('HorizonEntry', [
+    'version',
+    'start_date',
+    'end_date',
+    'starts',
+    'ends',
+])
+
+
+def load_horizon(db, days=None):
+    """Start precomputing availability for the application, if configured.
+
+    Unless provided, the length of the horizon is read from the
+    SCHEDULING_HORIZON_DAYS environment variable, and the interval between
+    refreshes from SCHEDULING_HORIZON_REFRESH_INTERVAL.
+
+    Args:
+        db(data.database.Database): The database, or any other database
+            providing the same interface.
+        days(int): The number of days, from the start of the current UTC
+            day, for which availability is precomputed, or 0 to compute
+            every availability as it is requested. Defaults to 0.
+
+    Returns:
+        (AvailabilityHorizon): The horizon, which is refreshed in a
+            background thread, or None if it is disabled.
+    """
+    if days is None:
+        days = int(os.environ.get('SCHEDULING_HORIZON_DAYS', 0))
+
+    if db is None or days < 1:
+        return None
+
+    horizon = AvailabilityHorizon(
+        db,
+        days,
+        float(os.environ.get('SCHEDULING_HORIZON_REFRESH_INTERVAL',
+                             DEFAULT_REFRESH_INTERVAL)),
+    )
+    horizon.start()
+    return horizon
+
+
+class AvailabilityHorizon():
+    """A rolling window of precomputed availability for every user.
+
+    Both the working hour and all hours availability of each user are
+    computed ahead of time, from the start of the current UTC day, for a
+    number of days. A background thread advances the window as days pass,
+    and recomputes a user's availability whenever the version of their data
+    changes. Until it has done so, their availability is not served from the
+    horizon.
+    """
+
+    def __init__(self, db, days, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 clock=time.time):
+        """Initialize the horizon, without computing any availability.
+
+        Args:
+            db(data.database.Database): The database, or any other database
+                providing the same interface.
+            days(int): The number of days for which availability is
+                precomputed.
+            refresh_interval(float): The number of seconds between checks
+                for users whose data has changed, or days that have passed.
+            clock(function): Returns the current UTC epoch timestamp.
+        """
+        self._db = db
+        self._days = days
+        self._refresh_interval = refresh_interval
+        self._clock = clock
+
+        # Keyed on user id and whether non-working hours are included. Each
+        # entry is replaced as a whole, so it can be read without a lock.
+        self._entries = {}
+        self._stopped = Event()
+
+    def start(self):
+        """Refresh the horizon in a background thread until stopped."""
+        Thread(target=self._run, name='availability-horizon',
+               daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def refresh(self):
+        """Compute the availability of every user whose data has changed
+        since it was last computed, or whose horizon is out of date.
+        """
+        start_date, end_date = self._get_window()
+
+        for user_id in self._db.get_user_ids():
+            for should_include_non_working_hours in (False, True):
+                key = (user_id, should_include_non_working_hours)
+                entry = self._entries.get(key)
+
+                try:
+                    version = self._db.get_user_version(user_id)
+                    if (
+                        entry is not None and
+                        entry.version == version and
+                        entry.start_date == start_date
+                    ):
+                        continue
+
+                    self._entries[key] = self._compute(
+                        user_id,
+                        version,
+                        start_date,
+                        end_date,
+                        should_include_non_working_hours,
+                    )
+                except UserNotFoundException:
+                    self._entries.pop(key, None)
+
+    def get_user_availability(self, user_id, start_date, end_date,
+                              should_include_non_working_hours):
+        """Retrieve a user's availability from the horizon.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+            should_include_non_working_hours(bool): Whether availability
+                outside of the user's working hours should be included.
+
+        Returns:
+            (list(Availability)): The availabilities of the user, or None if
+                the date range is not within the horizon, or the user's
+                availability has not been computed for the current version
+                of their data.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        availabilities = self.iter_user_availability(
+            user_id,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
+        return None if availabilities is None else list(availabilities)
+
+    def iter_user_availability(self, user_id, start_date, end_date,
+                               should_include_non_working_hours):
+        """Lazily retrieve a user's availability from the horizon.
+
+        Whether the availability can be served from the horizon is checked
+        straight away, but each availability is only sliced from it as it is
+        consumed.
+
+        Args:
+            user_id(int): The id of the user.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+            should_include_non_working_hours(bool): Whether availability
+                outside of the user's working hours should be included.
+
+        Returns:
+            (iterator(Availability)): The availabilities of the user, or None
+                if the date range is not within the horizon, or the user's
+                availability has not been computed for the current version
+                of their data.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+        """
+        entry = self._entries.get((user_id, should_include_non_working_hours))
+
+        if (
+            entry is None or
+            start_date < entry.start_date or
+            end_date > entry.end_date or
+            entry.version != self._db.get_user_version(user_id)
+        ):
+            return None
+
+        starts = entry.starts
+        ends = entry.ends
+
+        return (
+            Availability(max(starts[i], start_date), min(ends[i], end_date))
+            for i in range(
+                bisect_right(ends, start_date),
+                bisect_left(starts, end_date),
+            )
+        )
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Failed to refresh the availability horizon')
+
+            if self._stopped.wait(self._refresh_interval):
+                return
+
+    def _get_window(self):
+        now = int(self._clock())
+        start_date = now - now % SECONDS_PER_DAY
+        return start_date, start_date + self._days * SECONDS_PER_DAY
+
+    def _compute(self, user_id, version, start_date, end_date,
+                 should_include_non_working_hours):
+        free_intervals = self._db.get_user_free_intervals(user_id, start_date,
+                                                          end_date)
+
+        if should_include_non_working_hours:
+            availabilities = iter_free_interval_availability(free_intervals)
+        else:
+            user = self._db.get_user(user_id)
+            availabilities = iter_free_interval_availability(
+                free_intervals,
+                user.working_hours,
+                user.time_zone,
+            )
+
+        starts = array('q')
+        ends = array('q')
+        for availability in availabilities:
+            starts.append(availability.start_date)
+            ends.append(availability.end_date)
+
+        return HorizonEntry(version, start_date, end_date, starts, ends)
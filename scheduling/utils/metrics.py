@@ -0,0 +1,278 @@
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from threading import Lock
+import os
+import time
+
+PROMETHEUS_MIMETYPE = 'text/plain; version=0.0.4'
+
+# Upper bounds of the duration histograms' buckets, in seconds.
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1,
+    2.5, 5, 10,
+)
+
+_enabled = os.environ.get('SCHEDULING_METRICS_ENABLED') == 'true'
+
+# The time spent in each phase of the current request, in seconds, or None
+# if the current request is not being timed.
+_request_timings = ContextVar('request_timings', default=None)
+
+# The metrics reported by render_metrics.
+_metrics = []
+
+
+class Counter():
+    """A Prometheus counter, optionally partitioned by labels."""
+
+    def __init__(self, name, help, label_names=()):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values = {}
+        self._lock = Lock()
+
+    def inc(self, amount=1, *label_values):
+        """Increment the counter.
+
+        Args:
+            amount(int): The amount to increment it by.
+            *label_values(str): The value of each of the counter's labels.
+        """
+        with self._lock:
+            self._values[label_values] = (
+                self._values.get(label_values, 0) + amount
+            )
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.help}',
+            f'# TYPE {self.name} counter',
+        ]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f'{self.name}{labels} {value}')
+        return lines
+
+
+class Histogram():
+    """A Prometheus histogram, optionally partitioned by labels."""
+
+    def __init__(self, name, help, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._values = {}
+        self._lock = Lock()
+
+    def observe(self, value, *label_values):
+        """Record an observation.
+
+        Args:
+            value(float): The observed value.
+            *label_values(str): The value of each of the histogram's labels.
+        """
+        with self._lock:
+            values = self._values.get(label_values)
+            if values is None:
+                values = self._values[label_values] = {
+                    'bucket_counts': [0] * (len(self.buckets) + 1),
+                    'sum': 0,
+                }
+
+            values['bucket_counts'][bisect_left(self.buckets, value)] += 1
+            values['sum'] += value
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.help}',
+            f'# TYPE {self.name} histogram',
+        ]
+        with self._lock:
+            for label_values, values in sorted(self._values.items()):
+                bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+                count = 0
+                for bound, bucket_count in zip(bounds,
+                                               values['bucket_counts']):
+                    count += bucket_count
+                    labels = _format_labels(
+                        self.label_names + ('le',),
+                        label_values + (bound,),
+                    )
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f'{self.name}_sum{labels} {values["sum"]}')
+                lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+def _register(metric):
+    _metrics.append(metric)
+    return metric
+
+
+request_durations = _register(Histogram(
+    'scheduling_request_duration_seconds',
+    'Time spent handling each request.',
+    ('endpoint',),
+))
+phase_durations = _register(Histogram(
+    'scheduling_phase_duration_seconds',
+    'Time spent in each phase of handling a request.',
+    ('phase',),
+))
+intervals_scanned = _register(Counter(
+    'scheduling_free_intervals_scanned_total',
+    'Free intervals read from the database to compute availability.',
+))
+availabilities_generated = _register(Counter(
+    'scheduling_availabilities_generated_total',
+    'Availabilities generated for individual users.',
+))
+bitmap_slots_generated = _register(Counter(
+    'scheduling_bitmap_slots_generated_total',
+    'Slots generated for individual users by the bitmap engine.',
+))
+coalesced_requests = _register(Counter(
+    'scheduling_coalesced_requests_total',
+    'Requests that waited on an identical computation already in flight, '
+    'by outcome.',
+    ('outcome',),
+))
+group_bucket_lookups = _register(Counter(
+    'scheduling_group_bucket_lookups_total',
+    'Lookups of cached daily group availability, by whether they were '
+    'served.',
+    ('result',),
+))
+horizon_lookups = _register(Counter(
+    'scheduling_horizon_lookups_total',
+    'Lookups of precomputed availability, by whether they were served.',
+    ('result',),
+))
+
+
+class _Phase():
+    __slots__ = ('_name', '_start')
+
+    def __init__(self, name):
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self._start
+        phase_durations.observe(duration, self._name)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[self._name] = timings.get(self._name, 0) + duration
+
+
+_NULL_PHASE = nullcontext()
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled):
+    """Turn instrumentation on or off.
+
+    Instrumentation is off unless the SCHEDULING_METRICS_ENABLED environment
+    variable is "true".
+
+    Args:
+        enabled(bool): Whether instrumentation should be on.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def phase(name):
+    """Time a phase of handling a request.
+
+    The duration is added to the phase's histogram, and to the timings of
+    the current request. When instrumentation is off, a shared context
+    manager that does nothing is returned instead.
+
+    Args:
+        name(str): The name of the phase.
+
+    Returns:
+        (contextmanager): A context manager timing the code it wraps.
+    """
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+def count(counter, amount=1, *label_values):
+    """Increment a counter, if instrumentation is on.
+
+    Args:
+        counter(Counter): The counter.
+        amount(int): The amount to increment it by.
+        *label_values(str): The value of each of the counter's labels.
+    """
+    if _enabled:
+        counter.inc(amount, *label_values)
+
+
+def start_request_timing():
+    """Begin collecting the timings of the current request's phases."""
+    if _enabled:
+        _request_timings.set({'start': time.perf_counter()})
+
+
+def finish_request_timing(endpoint):
+    """Stop collecting the timings of the current request's phases.
+
+    Args:
+        endpoint(str): The name of the endpoint that handled the request.
+
+    Returns:
+        (str): The timings in the format of a Server-Timing header, or None
+            if the request was not timed.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        return None
+
+    _request_timings.set(None)
+
+    total = time.perf_counter() - timings.pop('start')
+    request_durations.observe(total, endpoint)
+
+    return ', '.join(
+        f'{name};dur={duration * 1000:.3f}'
+        for name, duration in list(timings.items()) + [('total', total)]
+    )
+
+
+def render_metrics():
+    """Render every metric in the Prometheus text format.
+
+    Returns:
+        (str): The metrics.
+    """
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _format_labels(label_names, label_values):
+    if not label_names:
+        return ''
+
+    labels = ','.join(
+        f'{name}="{value}"'
+        for name, value in zip(label_names, label_values)
+    )
+    return f'{{{labels}}}'
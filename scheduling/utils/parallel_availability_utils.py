@@ -0,0 +1,113 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+import os
+
+from utils.availability_utils import (
+    Availability,
+    iter_free_interval_availability,
+)
+
+
+def load_process_pool(size=None):
+    """Create the process pool configured for the application.
+
+    Unless provided, the number of worker processes is read from the
+    SCHEDULING_PROCESS_POOL_SIZE environment variable.
+
+    Args:
+        size(int): The number of worker processes, or 0 to compute every
+            availability in the current process. Defaults to 0.
+
+    Returns:
+        (tuple(concurrent.futures.ProcessPoolExecutor, int)): The process
+            pool, or None if it is disabled, along with its size.
+    """
+    if size is None:
+        size = int(os.environ.get('SCHEDULING_PROCESS_POOL_SIZE', 0))
+
+    if size < 1:
+        return None, 0
+
+    return ProcessPoolExecutor(size), size
+
+
+def get_user_availabilities_in_parallel(executor, user_free_times,
+                                        chunk_count):
+    """Calculate the availabilities of many users across a pool of
+    processes.
+
+    The users are split into chunks, each of which is computed by a single
+    task, so that the overhead of a task is shared between many users. Free
+    intervals and availabilities are shipped between processes as flat
+    arrays of integers, which pickle as a single block of bytes, rather than
+    as an object per interval.
+
+    Args:
+        executor(concurrent.futures.Executor): The pool of processes.
+        user_free_times(list(tuple)): The free intervals of each user, along
+            with the working hours and time zone that apply to them, as
+            accepted by
+            utils.availability_utils.iter_free_interval_availability.
+        chunk_count(int): The number of chunks to split the users into,
+            typically the number of processes in the pool.
+
+    Returns:
+        (list(list(Availability))): The availabilities of each user, in the
+            same order as user_free_times.
+    """
+    packed_free_times = [
+        (_pack_intervals(free_intervals), working_hours, time_zone)
+        for free_intervals, working_hours, time_zone in user_free_times
+    ]
+
+    chunk_size = -(-len(packed_free_times) // chunk_count)
+    chunks = [
+        packed_free_times[i:i + chunk_size]
+        for i in range(0, len(packed_free_times), chunk_size)
+    ]
+
+    return [
+        [
+            Availability(start_date, end_date)
+            for start_date, end_date in _unpack_intervals(packed_availability)
+        ]
+        for packed_availabilities in executor.map(
+            _get_packed_availabilities,
+            chunks,
+        )
+        for packed_availability in packed_availabilities
+    ]
+
+
+def _get_packed_availabilities(packed_free_times):
+    """Calculate the availabilities of a chunk of users, in a worker
+    process.
+
+    Args:
+        packed_free_times(list(tuple(array, WorkingHours, str))): The packed
+            free intervals, working hours and time zone of each user.
+
+    Returns:
+        (list(array)): The packed availabilities of each user.
+    """
+    return [
+        _pack_intervals(
+            (availability.start_date, availability.end_date)
+            for availability in iter_free_interval_availability(
+                _unpack_intervals(packed_free_intervals),
+                working_hours,
+                time_zone,
+            )
+        )
+        for packed_free_intervals, working_hours, time_zone
+        in packed_free_times
+    ]
+
+
+def _pack_intervals(intervals):
+    return array('q', chain.from_iterable(intervals))
+
+
+def _unpack_intervals(packed_intervals):
+    return zip(packed_intervals[0::2], packed_intervals[1::2])
@@ -0,0 +1,184 @@
+from calendar import monthrange, timegm
+from datetime import date, datetime
+from functools import lru_cache
+
+import arrow
+
+DAILY = 'daily'
+WEEKLY = 'weekly'
+MONTHLY = 'monthly'
+FREQUENCIES = (DAILY, WEEKLY, MONTHLY)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Occurrences are expanded, and cached, a bucket of this many seconds at a
+# time. Buckets are aligned to the epoch, so the same query windows map to
+# the same buckets.
+BUCKET_SIZE = 28 * SECONDS_PER_DAY
+
+# The maximum number of expanded buckets kept in memory, across every
+# recurring event.
+MAX_CACHED_BUCKETS = 10000
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def get_occurrence_starts(first_start, duration, time_zone, frequency,
+                          interval, count, until, exceptions, start_date,
+                          end_date):
+    """Determine the start dates of the occurrences of a recurring event that
+    overlap with a date range.
+
+    Occurrences recur at the same local time of day as the first, in the
+    given time zone, so they follow daylight saving time transitions. Only
+    the buckets overlapping with the date range are expanded, so the cost
+    grows with the number of occurrences in the range, rather than the
+    number since the first occurrence.
+
+    Args:
+        first_start(int): The start date of the first occurrence, as a UTC
+            epoch timestamp.
+        duration(int): The length of each occurrence, in seconds.
+        time_zone(str): The time zone within which the event recurs.
+        frequency(str): One of FREQUENCIES.
+        interval(int): The number of days, weeks or months between
+            occurrences.
+        count(int): The maximum number of occurrences, or None.
+        until(int): The last date on which an occurrence may start, as a UTC
+            epoch timestamp, or None.
+        exceptions(frozenset(int)): The start dates of occurrences that have
+            been cancelled.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+
+    Returns:
+        (list(int)): The start dates of the occurrences, in ascending order.
+    """
+    # Occurrences that start before the range may still run into it.
+    first_bucket = max(start_date - duration, first_start) // BUCKET_SIZE
+    last_bucket = (end_date - 1) // BUCKET_SIZE
+    if until is not None:
+        last_bucket = min(last_bucket, until // BUCKET_SIZE)
+
+    return [
+        occurrence_start
+        for bucket in range(first_bucket, last_bucket + 1)
+        for occurrence_start in _expand_bucket(
+            first_start,
+            time_zone,
+            frequency,
+            interval,
+            count,
+            until,
+            exceptions,
+            bucket,
+        )
+        if (
+            occurrence_start < end_date and
+            occurrence_start + duration > start_date
+        )
+    ]
+
+
+@lru_cache(maxsize=MAX_CACHED_BUCKETS)
+def _expand_bucket(first_start, time_zone, frequency, interval, count, until,
+                   exceptions, bucket):
+    """Determine the start dates of the occurrences of a recurring event that
+    start within a bucket.
+
+    Returns:
+        (tuple(int)): The start dates, in ascending order.
+    """
+    bucket_start = bucket * BUCKET_SIZE
+    bucket_end = bucket_start + BUCKET_SIZE
+
+    tzinfo = arrow.get(0).to(time_zone).tzinfo
+    local_first_start = arrow.get(first_start).to(time_zone).naive
+
+    # A local date is never more than a day either side of the UTC date.
+    first_ordinal = EPOCH_ORDINAL + bucket_start // SECONDS_PER_DAY - 1
+    last_ordinal = EPOCH_ORDINAL + (bucket_end - 1) // SECONDS_PER_DAY + 1
+
+    if frequency == MONTHLY:
+        local_dates = _iter_monthly_dates(local_first_start.date(), interval,
+                                          first_ordinal, last_ordinal)
+    else:
+        days = interval * (7 if frequency == WEEKLY else 1)
+        local_dates = _iter_daily_dates(local_first_start.date(), days,
+                                        first_ordinal, last_ordinal)
+
+    occurrence_starts = []
+    for i, local_date in local_dates:
+        if count is not None and i >= count:
+            break
+
+        local_start = datetime.combine(
+            local_date,
+            local_first_start.time(),
+            tzinfo=tzinfo,
+        )
+        occurrence_start = timegm(local_start.utctimetuple())
+
+        if until is not None and occurrence_start > until:
+            break
+
+        if (
+            bucket_start <= occurrence_start < bucket_end and
+            occurrence_start not in exceptions
+        ):
+            occurrence_starts.append(occurrence_start)
+
+    return tuple(occurrence_starts)
+
+
+def _iter_daily_dates(first_date, days, first_ordinal, last_ordinal):
+    """Yield the index and local date of each occurrence recurring every
+    given number of days, between two dates.
+    """
+    first_date_ordinal = first_date.toordinal()
+    i = max(0, -(-(first_ordinal - first_date_ordinal) // days))
+
+    while True:
+        ordinal = first_date_ordinal + i * days
+        if ordinal > last_ordinal:
+            return
+        yield i, date.fromordinal(ordinal)
+        i += 1
+
+
+def _iter_monthly_dates(first_date, months, first_ordinal, last_ordinal):
+    """Yield the index and local date of each occurrence recurring every
+    given number of months, between two dates.
+
+    Months without the first occurrence's day of the month are skipped, and
+    do not count towards the index.
+    """
+    first_month = first_date.year * 12 + first_date.month - 1
+    range_first_date = date.fromordinal(first_ordinal)
+    range_first_month = range_first_date.year * 12 + range_first_date.month - 1
+    i = max(0, -(-(range_first_month - first_month) // months))
+
+    def get_date(i):
+        year, month = divmod(first_month + i * months, 12)
+        month += 1
+        if first_date.day > monthrange(year, month)[1]:
+            return None
+        return date(year, month, first_date.day)
+
+    # Every month has the first 28 days, so skipped months only need to be
+    # counted for later days of the month.
+    index = i
+    if first_date.day > 28:
+        index = sum(1 for j in range(i) if get_date(j) is not None)
+
+    while True:
+        year, month = divmod(first_month + i * months, 12)
+        if date(year, month + 1, 1).toordinal() > last_ordinal:
+            return
+
+        local_date = get_date(i)
+        if local_date is not None:
+            yield index, local_date
+            index += 1
+        i += 1
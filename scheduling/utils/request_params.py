@@ -0,0 +1,173 @@
+from utils.dates import to_timestamp
+from utils.exceptions import InvalidParameterException
+
+INVALID_DATE_FORMAT = 'Invalid {}: ISO 8601 format required'
+INVALID_DATE_RANGE = 'Start date must be less than end date'
+INVALID_MIN_ATTENDEES = (
+    'Invalid min_attendees: must be between 1 and the number of users'
+)
+INVALID_POSITIVE_INTEGER = 'Invalid {}: must be a positive integer'
+INVALID_GRANULARITY = (
+    'Invalid granularity: must be a number of minutes that divides evenly '
+    'into a day'
+)
+INVALID_FORMAT = 'Invalid format: must be compact'
+
+MINUTES_PER_DAY = 24 * 60
+
+COMPACT_FORMAT = 'compact'
+
+
+def parse_date(date, name):
+    """Parse a date parameter.
+
+    Args:
+        date(str): The date, in ISO 8601 format.
+        name(str): The name of the parameter, for use in error messages.
+
+    Returns:
+        (int): The date as a UTC epoch timestamp.
+
+    Raises:
+        InvalidParameterException: If the date is not in ISO 8601 format.
+    """
+    if not isinstance(date, str):
+        raise InvalidParameterException(INVALID_DATE_FORMAT.format(name))
+
+    try:
+        return to_timestamp(date)
+    except ValueError:
+        raise InvalidParameterException(INVALID_DATE_FORMAT.format(name))
+
+
+def parse_date_range(start_date, end_date):
+    """Parse a pair of date parameters delimiting a date range.
+
+    Args:
+        start_date(str): The start date, in ISO 8601 format.
+        end_date(str): The end date, in ISO 8601 format.
+
+    Returns:
+        (tuple(int, int)): The start and end dates as UTC epoch timestamps.
+
+    Raises:
+        InvalidParameterException: If either date is not in ISO 8601
+            format, or the start date is not before the end date.
+    """
+    start_date = parse_date(start_date, 'start_date')
+    end_date = parse_date(end_date, 'end_date')
+
+    if start_date >= end_date:
+        raise InvalidParameterException(INVALID_DATE_RANGE)
+
+    return start_date, end_date
+
+
+def parse_min_attendees(min_attendees, user_count):
+    """Parse a min_attendees parameter.
+
+    Args:
+        min_attendees(str|int): The minimum number of users that must be
+            available, or None if it was not provided.
+        user_count(int): The number of users requested.
+
+    Returns:
+        (int): The minimum number of users that must be available, or None
+            if every user must be available.
+
+    Raises:
+        InvalidParameterException: If the value is not an integer between 1
+            and the number of users.
+    """
+    if min_attendees is None:
+        return None
+
+    try:
+        min_attendees = int(min_attendees)
+    except (TypeError, ValueError):
+        raise InvalidParameterException(INVALID_MIN_ATTENDEES)
+
+    if not 1 <= min_attendees <= user_count:
+        raise InvalidParameterException(INVALID_MIN_ATTENDEES)
+
+    return min_attendees
+
+
+def parse_positive_integer(value, name):
+    """Parse an optional, positive integer parameter.
+
+    Args:
+        value(str|int): The value of the parameter, or None if it was not
+            provided.
+        name(str): The name of the parameter, for use in error messages.
+
+    Returns:
+        (int): The value of the parameter, or None if it was not provided.
+
+    Raises:
+        InvalidParameterException: If the value is not a positive integer.
+    """
+    if value is None:
+        return None
+
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise InvalidParameterException(INVALID_POSITIVE_INTEGER.format(name))
+
+    if value < 1:
+        raise InvalidParameterException(INVALID_POSITIVE_INTEGER.format(name))
+
+    return value
+
+
+def parse_granularity(granularity):
+    """Parse a granularity parameter.
+
+    Args:
+        granularity(str|int): The length of each slot, in minutes, or None if
+            it was not provided.
+
+    Returns:
+        (int): The length of each slot, in minutes, or None if it was not
+            provided.
+
+    Raises:
+        InvalidParameterException: If the value is not a positive integer
+            that divides evenly into a day.
+    """
+    if granularity is None:
+        return None
+
+    try:
+        granularity = int(granularity)
+    except (TypeError, ValueError):
+        raise InvalidParameterException(INVALID_GRANULARITY)
+
+    if granularity < 1 or MINUTES_PER_DAY % granularity:
+        raise InvalidParameterException(INVALID_GRANULARITY)
+
+    return granularity
+
+
+def parse_format(response_format):
+    """Parse a format parameter.
+
+    Args:
+        response_format(str): The format in which availabilities should be
+            returned, or None if it was not provided.
+
+    Returns:
+        (str): The format, or None if availabilities should be returned as
+            objects with ISO 8601 dates.
+
+    Raises:
+        InvalidParameterException: If the format is not supported.
+    """
+    if response_format is None:
+        return None
+
+    if response_format != COMPACT_FORMAT:
+        raise InvalidParameterException(INVALID_FORMAT)
+
+    return response_format
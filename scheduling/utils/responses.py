@@ -1,6 +1,13 @@
 from http import HTTPStatus
+import json
 
-from flask import jsonify
+from flask import jsonify, Response
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+JSON_MIMETYPE = 'application/json'
+
+# The unit of the dates in compact responses.
+COMPACT_UNIT = 'seconds'
 
 
 def _response(message, status_code):
@@ -32,6 +39,65 @@ def not_found(message='NOT FOUND'):
     return _response(message, HTTPStatus.NOT_FOUND)
 
 
+def conflict(message='CONFLICT'):
+    """Create a 409 response.
+
+    Args:
+        message(str): The error message to be provided to the end user,
+            defaults to "CONFLICT".
+
+    Returns:
+        (HTTPResponse): A 409 HTTP response.
+    """
+    return _response(message, HTTPStatus.CONFLICT)
+
+
+def bad_gateway(message='BAD GATEWAY'):
+    """Create a 502 response.
+
+    Args:
+        message(str): The error message to be provided to the end user,
+            defaults to "BAD GATEWAY".
+
+    Returns:
+        (HTTPResponse): A 502 HTTP response.
+    """
+    return _response(message, HTTPStatus.BAD_GATEWAY)
+
+
+def success_json(data):
+    """Create a 200 response containing JSON data.
+
+    Args:
+        data: JSON-serializable data for the response.
+
+    Returns:
+        (HTTPResponse): A 200 HTTP response.
+    """
+    return jsonify({'data': data}), HTTPStatus.OK
+
+
+def created(data):
+    """Create a 201 response containing JSON data.
+
+    Args:
+        data: JSON-serializable data describing the created resource.
+
+    Returns:
+        (HTTPResponse): A 201 HTTP response.
+    """
+    return jsonify({'data': data}), HTTPStatus.CREATED
+
+
+def no_content():
+    """Create an empty 204 response.
+
+    Returns:
+        (HTTPResponse): A 204 HTTP response.
+    """
+    return '', HTTPStatus.NO_CONTENT
+
+
 def success_json_list(data):
     """Create a 200 response containing a list of JSON data.
 
@@ -42,3 +108,116 @@ def success_json_list(data):
         (HTTPResponse): A 200 HTTP response.
     """
     return jsonify({'data': [item.to_json() for item in data]}), HTTPStatus.OK
+
+
+def success_compact_json_list(data, offset):
+    """Create a 200 response containing a list of availabilities, each as a
+    pair of start and end dates relative to a shared offset.
+
+    The body is written directly from the availabilities' dates, without
+    building an object per availability.
+
+    Args:
+        data(iterable(Availability)): The availabilities for the response.
+        offset(int): The UTC epoch timestamp from which dates are measured,
+            which must not be after any of the dates.
+
+    Returns:
+        (HTTPResponse): A 200 HTTP response.
+    """
+    return Response(
+        dumps_compact_json_list(data, offset),
+        HTTPStatus.OK,
+        mimetype=JSON_MIMETYPE,
+    )
+
+
+def dumps_compact_json_list(data, offset):
+    """Serialize a list of availabilities in the compact format.
+
+    Args:
+        data(iterable(Availability)): The availabilities.
+        offset(int): The UTC epoch timestamp from which dates are measured.
+
+    Returns:
+        (str): The JSON document, with the pairs of dates under data.
+    """
+    pairs = ','.join([
+        f'[{item.start_date - offset},{item.end_date - offset}]'
+        for item in data
+    ])
+    return (
+        f'{{"data":[{pairs}],"offset":{offset},"unit":"{COMPACT_UNIT}"}}\n'
+    )
+
+
+def to_compact_json(data, offset):
+    """Convert a list of availabilities into the compact format, as
+    JSON-serializable data.
+
+    Args:
+        data(iterable(Availability)): The availabilities.
+        offset(int): The UTC epoch timestamp from which dates are measured.
+
+    Returns:
+        (dict): The pairs of dates under data, along with the offset and
+            unit.
+    """
+    return {
+        'data': [
+            [item.start_date - offset, item.end_date - offset]
+            for item in data
+        ],
+        'offset': offset,
+        'unit': COMPACT_UNIT,
+    }
+
+
+def success_ndjson_stream(data):
+    """Create a 200 response streaming JSON data as newline-delimited JSON.
+
+    Items are serialized one at a time, as the response is sent, so the data
+    may be produced lazily.
+
+    Args:
+        data(iterable): JSON-serializable data for the response.
+
+    Returns:
+        (HTTPResponse): A 200 HTTP response.
+    """
+    def generate():
+        for item in data:
+            yield json.dumps(item.to_json()) + '\n'
+
+    return Response(generate(), HTTPStatus.OK, mimetype=NDJSON_MIMETYPE)
+
+
+def success_text(text, mimetype='text/plain'):
+    """Create a 200 response containing plain text.
+
+    Args:
+        text(str): The body of the response.
+        mimetype(str): The mimetype of the response, defaults to
+            "text/plain".
+
+    Returns:
+        (HTTPResponse): A 200 HTTP response.
+    """
+    return Response(text, HTTPStatus.OK, mimetype=mimetype)
+
+
+def success_compact_ndjson_stream(data):
+    """Create a 200 response streaming availabilities as newline-delimited
+    pairs of start and end dates, as UTC epoch timestamps.
+
+    Args:
+        data(iterable(Availability)): The availabilities for the response.
+
+    Returns:
+        (HTTPResponse): A 200 HTTP response.
+    """
+    def generate():
+        for item in data:
+            yield f'[{item.start_date},{item.end_date}]\n'
+
+    return Response(generate(), HTTPStatus.OK, mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+import json
+import os
+
+from utils.availability_utils import Availability
+from utils.dates import to_isoformat
+from utils.exceptions import ShardException
+
+SHARD_AVAILABILITY_PATH = '/scheduling/shard/availability/'
+
+# The number of seconds to wait for a shard to respond.
+DEFAULT_SHARD_TIMEOUT = 10
+
+SHARD_UNAVAILABLE = 'Shard {} is unavailable'
+INVALID_SHARD_RESPONSE = 'Shard {} returned an invalid response'
+
+
+def get_shard_index(user_id, shard_count):
+    """Determine which shard owns a user.
+
+    Args:
+        user_id(int): The id of the user.
+        shard_count(int): The number of shards.
+
+    Returns:
+        (int): The index of the shard.
+    """
+    return user_id % shard_count
+
+
+def load_shard():
+    """Read which partition of the users the current process serves.
+
+    The partition is read from the SCHEDULING_SHARD_INDEX and
+    SCHEDULING_SHARD_COUNT environment variables.
+
+    Returns:
+        (tuple(int, int)): The index of the shard and the number of shards,
+            or None if users are not partitioned.
+    """
+    shard_count = int(os.environ.get('SCHEDULING_SHARD_COUNT', 0))
+    if shard_count < 1:
+        return None
+
+    return int(os.environ.get('SCHEDULING_SHARD_INDEX', 0)), shard_count
+
+
+def load_shard_client():
+    """Create the client through which a coordinator queries its shards.
+
+    The base URL of each shard is read, in order of their indexes, from the
+    comma-separated SCHEDULING_SHARD_URLS environment variable, and the
+    timeout from SCHEDULING_SHARD_TIMEOUT.
+
+    Returns:
+        (ShardClient): The client, or None if the current process is not a
+            coordinator.
+    """
+    urls = [
+        url.strip()
+        for url in os.environ.get('SCHEDULING_SHARD_URLS', '').split(',')
+        if url.strip()
+    ]
+    if not urls:
+        return None
+
+    return ShardClient(
+        urls,
+        float(os.environ.get('SCHEDULING_SHARD_TIMEOUT',
+                             DEFAULT_SHARD_TIMEOUT)),
+    )
+
+
+class ShardClient():
+    """A client for the per-user availability API of a set of shards.
+
+    Requests for users owned by different shards are sent concurrently.
+    """
+
+    def __init__(self, urls, timeout=DEFAULT_SHARD_TIMEOUT, executor=None):
+        """Initialize the client.
+
+        Args:
+            urls(list(str)): The base URL of each shard, in order of their
+                indexes.
+            timeout(float): The number of seconds to wait for a shard to
+                respond.
+            executor(concurrent.futures.Executor): The executor in which
+                requests are sent, defaults to a thread per shard.
+        """
+        self.urls = urls
+        self._timeout = timeout
+        self._executor = executor or ThreadPoolExecutor(len(urls))
+
+    def get_user_availabilities(self, user_ids, start_date, end_date,
+                                should_include_non_working_hours):
+        """Retrieve the availabilities of a group of users from the shards
+        that own them.
+
+        Args:
+            user_ids(list(int)): The ids of the users.
+            start_date(int): The start of the date range, as a UTC epoch
+                timestamp.
+            end_date(int): The end of the date range, as a UTC epoch
+                timestamp.
+            should_include_non_working_hours(bool): Whether availability
+                outside of the users' working hours should be included.
+
+        Returns:
+            (list(list(Availability))): The availabilities of each user, in
+                the same order as user_ids.
+
+        Raises:
+            ShardException: If any of the shards responded with an error, or
+                could not be reached.
+        """
+        shard_user_ids = {}
+        for user_id in user_ids:
+            shard_index = get_shard_index(user_id, len(self.urls))
+            shard_user_ids.setdefault(shard_index, []).append(user_id)
+
+        futures = [
+            self._executor.submit(
+                self._get_shard_availabilities,
+                self.urls[shard_index],
+                shard_user_ids[shard_index],
+                start_date,
+                end_date,
+                should_include_non_working_hours,
+            )
+            for shard_index in sorted(shard_user_ids)
+        ]
+
+        user_availabilities = {}
+        for future in futures:
+            user_availabilities.update(future.result())
+
+        return [user_availabilities[user_id] for user_id in user_ids]
+
+    def _get_shard_availabilities(self, url, user_ids, start_date, end_date,
+                                  should_include_non_working_hours):
+        query_string = urlencode(
+            [('user_id', user_id) for user_id in user_ids] + [
+                ('start_date', to_isoformat(start_date)),
+                ('end_date', to_isoformat(end_date)),
+                (
+                    'include_non_working_hours',
+                    'true' if should_include_non_working_hours else 'false',
+                ),
+            ]
+        )
+
+        try:
+            with urlopen(f'{url}{SHARD_AVAILABILITY_PATH}?{query_string}',
+                         timeout=self._timeout) as response:
+                data = json.load(response)['data']
+        except HTTPError as e:
+            raise ShardException(e.code, _get_error_message(e, url))
+        except OSError:
+            raise ShardException(HTTPStatus.BAD_GATEWAY,
+                                 SHARD_UNAVAILABLE.format(url))
+        except (ValueError, KeyError, TypeError):
+            raise ShardException(HTTPStatus.BAD_GATEWAY,
+                                 INVALID_SHARD_RESPONSE.format(url))
+
+        return {
+            int(user_id): [
+                Availability(availability_start, availability_end)
+                for availability_start, availability_end in availabilities
+            ]
+            for user_id, availabilities in data.items()
+        }
+
+
+def _get_error_message(error, url):
+    try:
+        return json.load(error)['message']
+    except (ValueError, KeyError, TypeError):
+        return INVALID_SHARD_RESPONSE.format(url)
@@ -0,0 +1,81 @@
+from threading import Event, Lock
+
+from utils.metrics import coalesced_requests, count
+
+
+class _Call():
+    __slots__ = ('done', 'result', 'exception', 'is_complete')
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.exception = None
+        self.is_complete = False
+
+
+class SingleFlight():
+    """Coalesces concurrent calls that would compute the same result.
+
+    The first caller for a key computes the result, and any callers that
+    arrive while it is doing so wait for it and share its result, or its
+    exception, rather than computing it again. Once the computation is
+    complete, the next caller for the key starts a new one. If the caller
+    computing it is interrupted instead, by a KeyboardInterrupt or
+    SystemExit, the callers waiting for it compute the result themselves.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = Lock()
+
+    def do(self, key, func, timeout=None):
+        """Call a function, unless a call for the same key is in flight, in
+        which case wait for that call instead.
+
+        Args:
+            key(hashable): Identifies the result the function computes.
+            func(function): Computes the result, taking no arguments.
+            timeout(float): The number of seconds to wait for a call in
+                flight, after which the function is called independently, or
+                None to wait indefinitely.
+
+        Returns:
+            The result of the function.
+
+        Raises:
+            Exception: Whatever the function, or the call in flight, raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if is_leader:
+            try:
+                call.result = func()
+                call.is_complete = True
+                return call.result
+            except Exception as e:
+                call.exception = e
+                call.is_complete = True
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(timeout):
+            count(coalesced_requests, 1, 'timeout')
+            return func()
+
+        if not call.is_complete:
+            count(coalesced_requests, 1, 'interrupted')
+            return func()
+
+        if call.exception is not None:
+            count(coalesced_requests, 1, 'error')
+            raise call.exception
+
+        count(coalesced_requests, 1, 'shared')
+        return call.result
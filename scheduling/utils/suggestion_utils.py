@@ -0,0 +1,175 @@
+from bisect import bisect_left
+import heapq
+
+from utils.dates import to_isoformat
+
+
+class Suggestion():
+    """A suggested time for a meeting."""
+
+    __slots__ = ('start_date', 'end_date', 'optional_user_ids')
+
+    def __init__(self, start_date, end_date, optional_user_ids):
+        """Initialize a suggestion.
+
+        Args:
+            start_date(int): The start date as a UTC epoch timestamp.
+            end_date(int): The end date as a UTC epoch timestamp.
+            optional_user_ids(list(int)): The ids of the optional attendees
+                who are free for the whole meeting.
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self.optional_user_ids = optional_user_ids
+
+    def to_json(self):
+        """Serialize the suggestion to json.
+
+        The dates are formatted as ISO 8601 strings, in UTC.
+
+        Returns:
+            (dict): The suggestion in json-serializable form.
+        """
+        return {
+            'start_date': to_isoformat(self.start_date),
+            'end_date': to_isoformat(self.end_date),
+            'optional_user_ids': self.optional_user_ids,
+        }
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if type(other) != type(self):
+            return False
+        return (
+            (other.start_date, other.end_date, other.optional_user_ids) ==
+            (self.start_date, self.end_date, self.optional_user_ids)
+        )
+
+
+def iter_candidate_starts(availabilities, duration, step):
+    """Yield every start date at which a meeting fits within a set of
+    availabilities.
+
+    Start dates are aligned to multiples of the step since the epoch, so
+    that, for example, a step of 15 minutes yields start dates on the
+    quarter hour.
+
+    Args:
+        availabilities(iterable(Availability)): The availabilities, in
+            ascending order by start date.
+        duration(int): The length of the meeting, in seconds.
+        step(int): The number of seconds between candidate start dates.
+
+    Yields:
+        (int): The candidate start dates, in ascending order.
+    """
+    for availability in availabilities:
+        start_date = availability.start_date + -availability.start_date % step
+        last_start_date = availability.end_date - duration
+
+        while start_date <= last_start_date:
+            yield start_date
+            start_date += step
+
+
+def get_top_suggestions(availabilities, duration, step, limit,
+                        optional_user_availabilities=None,
+                        preferred_times=None):
+    """Determine the best times for a meeting, in a single pass over the
+    availabilities.
+
+    Candidates are ranked by the number of optional attendees who are free
+    for the whole meeting, then by how close the middle of the meeting is to
+    each attendee's preferred times, then by how early they start. Only the
+    best candidates seen so far are held, in a heap, so memory use does not
+    grow with the length of the date range.
+
+    Args:
+        availabilities(iterable(Availability)): The availabilities common to
+            the required attendees, in ascending order by start date.
+        duration(int): The length of the meeting, in seconds.
+        step(int): The number of seconds between candidate start dates.
+        limit(int): The maximum number of suggestions.
+        optional_user_availabilities(dict(int, iterable(Availability))): The
+            availabilities of each optional attendee, under their id, in
+            ascending order by start date.
+        preferred_times(list(list(int))): For each required attendee, the
+            times, as ascending UTC epoch timestamps, at which they would
+            most like the middle of a meeting to fall.
+
+    Returns:
+        (list(Suggestion)): The suggestions, best first.
+    """
+    optional_cursors = [
+        _AvailabilityCursor(user_id, user_availability)
+        for user_id, user_availability in sorted(
+            (optional_user_availabilities or {}).items()
+        )
+    ]
+    preferred_times = [times for times in preferred_times or [] if times]
+
+    # A min-heap of the best candidates, so the worst is replaced first.
+    heap = []
+
+    for start_date in iter_candidate_starts(availabilities, duration, step):
+        end_date = start_date + duration
+        middle = start_date + duration // 2
+
+        optional_user_ids = tuple(
+            cursor.user_id
+            for cursor in optional_cursors
+            if cursor.is_free(start_date, end_date)
+        )
+        distance = sum(
+            _get_distance_to_nearest(times, middle)
+            for times in preferred_times
+        )
+
+        candidate = (
+            (len(optional_user_ids), -distance, -start_date),
+            optional_user_ids,
+        )
+        if len(heap) < limit:
+            heapq.heappush(heap, candidate)
+        elif candidate > heap[0]:
+            heapq.heapreplace(heap, candidate)
+
+    return [
+        Suggestion(-rank[2], -rank[2] + duration, list(optional_user_ids))
+        for rank, optional_user_ids in sorted(heap, reverse=True)
+    ]
+
+
+class _AvailabilityCursor():
+    """Steps through a user's availabilities as candidate meetings, in
+    ascending order, are checked against them.
+    """
+
+    def __init__(self, user_id, availabilities):
+        self.user_id = user_id
+        self._availabilities = iter(availabilities)
+        self._current = next(self._availabilities, None)
+
+    def is_free(self, start_date, end_date):
+        # Availabilities ending before this meeting cannot contain it, nor
+        # any later meeting.
+        while (
+            self._current is not None and
+            self._current.end_date < end_date
+        ):
+            self._current = next(self._availabilities, None)
+
+        return (
+            self._current is not None and
+            self._current.start_date <= start_date
+        )
+
+
+def _get_distance_to_nearest(times, time):
+    i = bisect_left(times, time)
+    if i == 0:
+        return times[0] - time
+    if i == len(times):
+        return time - times[-1]
+    return min(times[i] - time, time - times[i - 1])
@@ -0,0 +1,76 @@
+import numpy as np
+
+from utils.availability_utils import Availability
+
+
+def get_intersecting_availabilities_vectorized(user_availabilities):
+    """Determine all intersecting availabilities for the given users.
+
+    Produces the same result as
+    utils.availability_utils.get_intersecting_availabilities, but rather
+    than stepping through each user's availabilities in turn, it counts how
+    many users are available between every pair of consecutive availability
+    boundaries using NumPy array operations. This scales far better when
+    intersecting the availabilities of a large number of users.
+
+    Args:
+        user_availabilities(list(list(Availability))): A list of user
+            availabilities, where each user's list of availabilities
+            is ordered by ascending start time and does not overlap.
+
+    Returns:
+        list(Availability): A list of availabilities common to all
+            given users.
+    """
+    user_count = len(user_availabilities)
+    availability_count = sum(
+        len(user_availability)
+        for user_availability in user_availabilities
+    )
+
+    starts = np.fromiter(
+        (
+            availability.start_date
+            for user_availability in user_availabilities
+            for availability in user_availability
+        ),
+        dtype=np.int64,
+        count=availability_count,
+    )
+    ends = np.fromiter(
+        (
+            availability.end_date
+            for user_availability in user_availabilities
+            for availability in user_availability
+        ),
+        dtype=np.int64,
+        count=availability_count,
+    )
+
+    dates = np.concatenate((starts, ends))
+    changes = np.concatenate((
+        np.ones(availability_count, dtype=np.int64),
+        np.full(availability_count, -1, dtype=np.int64),
+    ))
+
+    # Sort the boundaries by date, with availabilities that end on a given
+    # date ordered before those that start on it, so that back-to-back
+    # availabilities never briefly count a user twice.
+    order = np.lexsort((changes, dates))
+    dates = dates[order]
+    available_counts = np.cumsum(changes[order])
+
+    # Between a boundary and the next one, the number of available users is
+    # the running total of the changes up to and including that boundary.
+    is_common = (
+        (available_counts[:-1] == user_count) &
+        (dates[1:] > dates[:-1])
+    )
+
+    return [
+        Availability(start_date, end_date)
+        for start_date, end_date in zip(
+            dates[:-1][is_common].tolist(),
+            dates[1:][is_common].tolist(),
+        )
+    ]
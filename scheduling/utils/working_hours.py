@@ -0,0 +1,191 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+import arrow
+
+from utils.metrics import phase
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# The number of days of work windows compiled at a time.
+DAYS_PER_COMPILATION = 365
+
+# The maximum number of (working hours, time zone) templates kept in memory.
+MAX_CACHED_TEMPLATES = 1024
+
+EPOCH = date(1970, 1, 1)
+EPOCH_DATETIME = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_SECOND = timedelta(seconds=1)
+
+# The first and last (exclusive) days, counted from the epoch, that local
+# dates can represent. Compilation is clipped to them.
+MIN_DAY = (date.min - EPOCH).days
+MAX_DAY = (date.max - EPOCH).days + 1
+
+
+class WorkHourTemplate():
+    """The work windows for a set of working hours in a given time zone.
+
+    Each local day's working hours are resolved to a window of UTC epoch
+    timestamps, with any daylight saving time transitions taken into
+    account. Windows are compiled a year at a time, as they are needed, so
+    that restricting an availability to working hours is a matter of
+    intersecting it with the precomputed windows.
+    """
+
+    def __init__(self, working_hours, time_zone):
+        """Initialize the template.
+
+        Args:
+            working_hours(data.models.WorkingHours): The working hours.
+            time_zone(str): The time zone within which the working hours
+                apply.
+        """
+        self._working_hours = working_hours
+        self._tzinfo = arrow.get(0).to(time_zone).tzinfo
+
+        # The first and last (exclusive) compiled days, counted from the
+        # epoch, and the start and end dates of the work windows within them.
+        # Swapped as a whole so that concurrent readers see a consistent set.
+        self._windows = (0, 0, [], [])
+
+    def get_work_windows(self, start_date, end_date):
+        """Retrieve the work windows intersecting with a date range.
+
+        Args:
+            start_date(int): The start date of the range, as a UTC epoch
+                timestamp.
+            end_date(int): The end date of the range, as a UTC epoch
+                timestamp.
+
+        Returns:
+            (list(tuple(int, int))): The start and end dates of the work
+                windows, clipped to the date range, in ascending order.
+        """
+        # A local date is never more than a day either side of the UTC date.
+        _, _, starts, ends = self._compile(
+            start_date // SECONDS_PER_DAY - 1,
+            (end_date - 1) // SECONDS_PER_DAY + 2,
+        )
+
+        lo = bisect_right(ends, start_date)
+        hi = bisect_left(starts, end_date)
+
+        return [
+            (max(starts[i], start_date), min(ends[i], end_date))
+            for i in range(lo, hi)
+        ]
+
+    def _compile(self, first_day, last_day):
+        """Ensure the work windows of a range of days have been compiled.
+
+        Args:
+            first_day(int): The first day of the range, counted from the
+                epoch.
+            last_day(int): The day after the last day of the range, counted
+                from the epoch.
+
+        Returns:
+            (tuple): The compiled windows, covering at least the given range.
+        """
+        windows = self._windows
+        compiled_first_day, compiled_last_day, starts, ends = windows
+
+        if compiled_first_day <= first_day and last_day <= compiled_last_day:
+            return windows
+
+        first_day = max(first_day - first_day % DAYS_PER_COMPILATION,
+                        MIN_DAY)
+        last_day = min(last_day + -last_day % DAYS_PER_COMPILATION, MAX_DAY)
+
+        with phase('compile_work_hours'):
+            # A range apart from the compiled days replaces them, rather
+            # than compiling every day in between.
+            if (
+                compiled_first_day == compiled_last_day or
+                last_day < compiled_first_day or
+                compiled_last_day < first_day
+            ):
+                starts, ends = self._compile_days(first_day, last_day)
+            else:
+                first_day = min(first_day, compiled_first_day)
+                last_day = max(last_day, compiled_last_day)
+
+                earlier_starts, earlier_ends = self._compile_days(
+                    first_day,
+                    compiled_first_day,
+                )
+                later_starts, later_ends = self._compile_days(
+                    compiled_last_day,
+                    last_day,
+                )
+                starts = earlier_starts + starts + later_starts
+                ends = earlier_ends + ends + later_ends
+
+        windows = (first_day, last_day, starts, ends)
+        self._windows = windows
+        return windows
+
+    def _compile_days(self, first_day, last_day):
+        """Compute the work windows for a range of days.
+
+        Args:
+            first_day(int): The first day of the range, counted from the
+                epoch.
+            last_day(int): The day after the last day of the range, counted
+                from the epoch.
+
+        Returns:
+            (tuple(list(int), list(int))): The start and end dates of the
+                non-empty work windows, as UTC epoch timestamps.
+        """
+        starts = []
+        ends = []
+
+        for day in range(first_day, last_day):
+            local_date = EPOCH + timedelta(days=day)
+
+            work_day_start = self._to_timestamp(
+                local_date,
+                self._working_hours.start,
+            )
+            work_day_end = self._to_timestamp(
+                local_date,
+                self._working_hours.end,
+            )
+
+            if work_day_start < work_day_end:
+                starts.append(work_day_start)
+                ends.append(work_day_end)
+
+        return starts, ends
+
+    def _to_timestamp(self, local_date, time):
+        local_datetime = datetime(
+            local_date.year,
+            local_date.month,
+            local_date.day,
+            time.hour,
+            time.minute,
+            tzinfo=self._tzinfo,
+        )
+        # Subtracting, rather than converting to UTC, allows for work days
+        # at the very ends of the calendar that fall outside of it in UTC.
+        return (local_datetime - EPOCH_DATETIME) // ONE_SECOND
+
+
+@lru_cache(maxsize=MAX_CACHED_TEMPLATES)
+def get_work_hour_template(working_hours, time_zone):
+    """Retrieve the compiled template for a set of working hours.
+
+    Templates are cached, with the least recently used evicted first.
+
+    Args:
+        working_hours(data.models.WorkingHours): The working hours.
+        time_zone(str): The time zone within which the working hours apply.
+
+    Returns:
+        (WorkHourTemplate): The template for the working hours.
+    """
+    return WorkHourTemplate(working_hours, time_zone)
@@ -0,0 +1,252 @@
+import asyncio
+from contextvars import copy_context
+from functools import partial
+
+from data.async_database import AsyncDatabase
+from data.exceptions import GroupNotFoundException, UserNotFoundException
+from utils.exceptions import InvalidParameterException
+from utils.metrics import count, intervals_scanned, phase
+from utils.responses import bad_request, not_found
+from views.availability import (
+    combine_user_availabilities,
+    common_availability_cache,
+    compute_user_availability,
+    db,
+    get_attendee_ids,
+    get_common_availability_cache_key,
+    get_common_bitmap_availability,
+    get_group_common_availability,
+    get_horizon_user_availability,
+    get_user_availability_cache_key,
+    parse_availability_query,
+    respond_with_availabilities,
+    should_stream_response,
+    user_availability_cache,
+    UserFreeTime,
+    GROUP_NOT_FOUND,
+    USER_NOT_FOUND,
+)
+
+# A coordinator holds no users of its own, so it has nothing to fetch
+# asynchronously, and is served by the Flask view instead.
+async_db = None if db is None else AsyncDatabase(db)
+
+
+async def get_availability_async(args, accept_mimetypes):
+    """Determine the availability common to a group of users, fetching
+    every user's data concurrently.
+
+    Accepts the same parameters as views.availability.get_availability, and
+    shares its caches, precomputed availability, groups and metrics. Every
+    other step runs in the event loop's default executor, in the context of
+    the current request, so the event loop is never blocked. Concurrent
+    requests for the same availability are not coalesced, and availabilities
+    are always computed in full before they are filtered or streamed.
+
+    Args:
+        args(werkzeug.datastructures.MultiDict): The query string parameters
+            of the request.
+        accept_mimetypes(werkzeug.datastructures.MIMEAccept): The mimetypes
+            accepted by the client.
+
+    Returns:
+        (HTTPResponse): The response.
+    """
+    try:
+        with phase('parse'):
+            query = parse_availability_query(args)
+    except InvalidParameterException as e:
+        return bad_request(str(e))
+    except GroupNotFoundException as e:
+        return not_found(GROUP_NOT_FOUND.format(e.group_id))
+
+    try:
+        # Quorums and bitmaps count each member of a group separately, so
+        # only the strict intersection can reuse a group's availability.
+        if (
+            query.group_ids and
+            query.min_attendees is None and
+            query.granularity is None
+        ):
+            availabilities = await _run(
+                get_group_common_availability,
+                query.group_ids,
+                query.user_ids,
+                query.start_date,
+                query.end_date,
+                query.should_include_non_working_hours,
+            )
+        else:
+            availabilities = await get_common_availability_async(
+                get_attendee_ids(query.user_ids, query.group_ids),
+                query.start_date,
+                query.end_date,
+                query.should_include_non_working_hours,
+                query.min_attendees,
+                query.granularity,
+            )
+    except UserNotFoundException as e:
+        return not_found(USER_NOT_FOUND.format(e.user_id))
+
+    return await _run(
+        respond_with_availabilities,
+        availabilities,
+        query,
+        should_stream_response(args, accept_mimetypes),
+    )
+
+
+async def get_common_availability_async(user_ids, start_date, end_date,
+                                        should_include_non_working_hours,
+                                        min_attendees=None,
+                                        granularity=None):
+    """Determine the availability common to a group of users, fetching
+    every user's data concurrently.
+
+    Results are cached in the same caches as
+    views.availability.get_common_availability.
+
+    Args:
+        user_ids(list(int)): The ids of the users.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the users' working hours should be included.
+        min_attendees(int): The minimum number of users that must be
+            available, or None if every user must be available.
+        granularity(int): The length of the slots, in minutes, to which
+            availability should be aligned, or None if it should not be.
+
+    Returns:
+        (list(Availability)): The common availabilities of the users.
+
+    Raises:
+        UserNotFoundException: If any of the users do not exist.
+    """
+    with phase('fetch'):
+        user_versions = await asyncio.gather(*(
+            async_db.get_user_version(user_id)
+            for user_id in user_ids
+        ))
+    cache_key = get_common_availability_cache_key(
+        user_ids,
+        user_versions,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+        min_attendees,
+        granularity,
+    )
+
+    availabilities = common_availability_cache.get(cache_key)
+    if availabilities is not None:
+        return availabilities
+
+    if granularity is None:
+        user_availabilities = await asyncio.gather(*(
+            _get_cached_user_availability_async(
+                user_id,
+                user_version,
+                start_date,
+                end_date,
+                should_include_non_working_hours,
+            )
+            for user_id, user_version in zip(user_ids, user_versions)
+        ))
+        availabilities = await _run(
+            combine_user_availabilities,
+            user_availabilities,
+            min_attendees,
+        )
+    else:
+        with phase('fetch'):
+            user_free_times = await asyncio.gather(*(
+                _get_user_free_time_async(
+                    user_id,
+                    start_date,
+                    end_date,
+                    should_include_non_working_hours,
+                )
+                for user_id in user_ids
+            ))
+        availabilities = await _run(
+            get_common_bitmap_availability,
+            user_free_times,
+            start_date,
+            end_date,
+            min_attendees,
+            granularity,
+        )
+
+    common_availability_cache.set(cache_key, availabilities)
+    return availabilities
+
+
+async def _get_cached_user_availability_async(
+    user_id, user_version, start_date, end_date,
+    should_include_non_working_hours,
+):
+    cache_key = get_user_availability_cache_key(
+        user_id,
+        user_version,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    )
+
+    user_availability = user_availability_cache.get(cache_key)
+    if user_availability is not None:
+        return user_availability
+
+    user_availability = await _run(
+        get_horizon_user_availability,
+        user_id,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    )
+    if user_availability is None:
+        user_free_time = await _get_user_free_time_async(
+            user_id,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
+        user_availability = await _run(compute_user_availability,
+                                       user_free_time)
+
+    user_availability_cache.set(cache_key, user_availability)
+    return user_availability
+
+
+async def _get_user_free_time_async(user_id, start_date, end_date,
+                                    should_include_non_working_hours):
+    if should_include_non_working_hours:
+        free_intervals = await async_db.get_user_free_intervals(
+            user_id,
+            start_date,
+            end_date,
+        )
+        count(intervals_scanned, len(free_intervals))
+        return UserFreeTime(free_intervals, None, None)
+
+    free_intervals, user = await asyncio.gather(
+        async_db.get_user_free_intervals(user_id, start_date, end_date),
+        async_db.get_user(user_id),
+    )
+    count(intervals_scanned, len(free_intervals))
+    return UserFreeTime(free_intervals, user.working_hours, user.time_zone)
+
+
+def _run(func, *args):
+    """Run a function in the event loop's default executor, in the current
+    context, so that it sees the current request and records its metrics
+    against it.
+
+    Returns:
+        (asyncio.Future): The result of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(None, partial(copy_context().run, func,
+                                              *args))
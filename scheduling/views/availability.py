@@ -1,81 +1,1255 @@
+from collections import namedtuple
+from http import HTTPStatus
+
 from flask import request
-import arrow
 
-from data.database import Database
-from data.exceptions import UserNotFoundException
+from data.backends import load_database, load_groups
+from data.exceptions import GroupNotFoundException, UserNotFoundException
 from utils.availability_utils import (
-    get_user_availability,
-    get_user_work_hour_availability,
     get_intersecting_availabilities,
+    get_quorum_availabilities,
+    iter_free_interval_availability,
+    iter_intersecting_availabilities,
+    iter_qualifying_availabilities,
+)
+from utils.bitmap_availability_utils import (
+    get_availability_bitmap,
+    get_bitmap_availabilities,
+    get_intersecting_bitmap,
+    get_quorum_bitmap,
+    get_slots,
+)
+from utils.cache import LRUCache
+from utils.exceptions import InvalidParameterException, ShardException
+from utils.group_availability import GroupAvailabilityCache
+from utils.horizon import load_horizon
+from utils.metrics import (
+    availabilities_generated,
+    bitmap_slots_generated,
+    count,
+    horizon_lookups,
+    intervals_scanned,
+    phase,
+)
+from utils.parallel_availability_utils import (
+    get_user_availabilities_in_parallel,
+    load_process_pool,
 )
-from utils.responses import bad_request, not_found, success_json_list
+from utils.request_params import (
+    parse_date_range,
+    parse_format,
+    parse_granularity,
+    parse_min_attendees,
+    parse_positive_integer,
+    COMPACT_FORMAT,
+)
+from utils.responses import (
+    bad_gateway,
+    bad_request,
+    not_found,
+    success_compact_json_list,
+    success_compact_ndjson_stream,
+    success_json,
+    success_json_list,
+    success_ndjson_stream,
+    to_compact_json,
+    NDJSON_MIMETYPE,
+)
+from utils.sharding import load_shard_client
+from utils.single_flight import SingleFlight
+from utils.vectorized_availability_utils import (
+    get_intersecting_availabilities_vectorized,
+)
+
+USER_NOT_FOUND = 'User id {} does not exist'
+USER_ID_REQUIRED = 'At least one user_id is required'
+GROUP_NOT_FOUND = 'Group id {} does not exist'
+USER_OR_GROUP_ID_REQUIRED = 'At least one user_id or group_id is required'
 
-INVALID_DATE_FORMAT = 'Invalid {}: ISO 8601 format required'
+# The maximum number of queries accepted in a single batch request.
+MAX_BATCH_QUERIES = 1000
 
-db = Database.from_file()
+# The number of users from which the vectorized intersection outperforms
+# stepping through each user's availabilities in turn.
+VECTORIZED_INTERSECTION_MIN_USERS = 4
+
+# Bounds on the cached availabilities. Entries are keyed on the versions of
+# the users involved, so changes to a user's data invalidate them without
+# waiting for them to expire.
+USER_AVAILABILITY_CACHE_SIZE = 10000
+COMMON_AVAILABILITY_CACHE_SIZE = 1000
+GROUP_AVAILABILITY_CACHE_SIZE = 10000
+CACHE_TTL = 5 * 60
+
+# Groups' availability is computed and cached a bucket of this many seconds
+# at a time, aligned to UTC midnight, so queries over different but
+# overlapping date ranges share the same buckets.
+GROUP_BUCKET_SIZE = 24 * 60 * 60
+
+# The number of seconds a request waits on an identical computation already
+# in flight, before computing the availability itself.
+COALESCING_TIMEOUT = 30
+
+# Availability computed lazily fetches each user's free intervals a chunk of
+# this many seconds at a time, so that memory use, and the work done before
+# the first availability, do not grow with the length of the date range.
+FREE_INTERVAL_CHUNK_SIZE = 7 * 24 * 60 * 60
+
+# The number of users whose availability must be computed from which
+# spreading them across the process pool outweighs the cost of shipping
+# their data to it.
+PARALLEL_AVAILABILITY_MIN_USERS = 64
+
+# A coordinator holds no users of its own, and instead fetches each user's
+# availability from the shard that owns them.
+shard_client = load_shard_client()
+db = load_database() if shard_client is None else None
+process_pool, process_pool_size = load_process_pool()
+horizon = load_horizon(db)
+groups = load_groups()
+
+user_availability_cache = LRUCache(USER_AVAILABILITY_CACHE_SIZE, CACHE_TTL)
+common_availability_cache = LRUCache(COMMON_AVAILABILITY_CACHE_SIZE,
+                                     CACHE_TTL)
+# The function computing groups' availability is defined below, so it is
+# looked up when called.
+group_availability_cache = GroupAvailabilityCache(
+    lambda *args: _compute_group_availability(*args),
+    GROUP_AVAILABILITY_CACHE_SIZE,
+    CACHE_TTL,
+    GROUP_BUCKET_SIZE,
+)
+
+# Concurrent requests for the same group's availability share a single
+# computation, keyed on the same key as common_availability_cache.
+common_availability_flights = SingleFlight()
+
+AvailabilityQuery = namedtuple('AvailabilityQuery', [
+    'user_ids',
+    'group_ids',
+    'start_date',
+    'end_date',
+    'should_include_non_working_hours',
+    'min_attendees',
+    'min_duration',
+    'limit',
+    'granularity',
+    'response_format',
+])
+
+# The free intervals of a user within a date range, along with the working
+# hours and time zone that apply to them, which are None if availability
+# outside of working hours should be included.
+UserFreeTime = namedtuple('UserFreeTime', [
+    'free_intervals',
+    'working_hours',
+    'time_zone',
+])
 
 
 def get_availability():
-    user_ids = [int(id) for id in request.args.getlist('user_id')]
+    try:
+        with phase('parse'):
+            query = parse_availability_query(request.args)
+    except InvalidParameterException as e:
+        return bad_request(str(e))
+    except GroupNotFoundException as e:
+        return not_found(GROUP_NOT_FOUND.format(e.group_id))
 
-    if not user_ids:
-        return bad_request('At least one user_id is required')
+    should_stream = should_stream_response(request.args,
+                                           request.accept_mimetypes)
+
+    should_compute_lazily = (
+        should_stream or
+        query.min_duration is not None or
+        query.limit is not None
+    )
 
-    start_date_param = request.args.get('start_date', '')
     try:
-        start_date = arrow.get(start_date_param).to('utc').isoformat()
-    except ValueError:
-        return bad_request(INVALID_DATE_FORMAT.format('start_date'))
+        if shard_client is not None:
+            availabilities = get_sharded_common_availability(
+                get_attendee_ids(query.user_ids, query.group_ids),
+                query.start_date,
+                query.end_date,
+                query.should_include_non_working_hours,
+                query.min_attendees,
+                query.granularity,
+            )
+        # Quorums and bitmaps count each member of a group separately, so
+        # only the strict intersection can reuse a group's availability.
+        elif (
+            query.group_ids and
+            query.min_attendees is None and
+            query.granularity is None
+        ):
+            availabilities = get_group_common_availability(
+                query.group_ids,
+                query.user_ids,
+                query.start_date,
+                query.end_date,
+                query.should_include_non_working_hours,
+            )
+        # Quorums and bitmaps need every user's availability up front, so
+        # only the strict intersection can be computed lazily.
+        elif (
+            should_compute_lazily and
+            query.min_attendees is None and
+            query.granularity is None
+        ):
+            availabilities = iter_common_availability(
+                query.user_ids,
+                query.start_date,
+                query.end_date,
+                query.should_include_non_working_hours,
+            )
+        else:
+            availabilities = get_common_availability(
+                get_attendee_ids(query.user_ids, query.group_ids),
+                query.start_date,
+                query.end_date,
+                query.should_include_non_working_hours,
+                query.min_attendees,
+                granularity=query.granularity,
+            )
+    except UserNotFoundException as e:
+        return not_found(USER_NOT_FOUND.format(e.user_id))
+    except ShardException as e:
+        if e.status_code == HTTPStatus.NOT_FOUND:
+            return not_found(str(e))
+        return bad_gateway(str(e))
+
+    return respond_with_availabilities(availabilities, query, should_stream)
+
+
+def should_stream_response(args, accept_mimetypes):
+    """Determine whether an availability request should be answered with a
+    stream.
+
+    Args:
+        args(werkzeug.datastructures.MultiDict): The query string parameters
+            of the request.
+        accept_mimetypes(werkzeug.datastructures.MIMEAccept): The mimetypes
+            accepted by the client.
+
+    Returns:
+        (bool): Whether the availabilities should be streamed as
+            newline-delimited JSON.
+    """
+    return (
+        args.get('stream') == 'true' or
+        accept_mimetypes.best == NDJSON_MIMETYPE
+    )
+
+
+def respond_with_availabilities(availabilities, query, should_stream):
+    """Create the response to an availability request.
+
+    Args:
+        availabilities(iterable(Availability)): The common availabilities.
+        query(AvailabilityQuery): The parameters of the request.
+        should_stream(bool): Whether the availabilities should be streamed.
+
+    Returns:
+        (HTTPResponse): A 200 HTTP response, in the requested format.
+    """
+    availabilities = get_qualifying_availabilities(availabilities, query)
+
+    if should_stream:
+        if query.response_format == COMPACT_FORMAT:
+            return success_compact_ndjson_stream(availabilities)
+        return success_ndjson_stream(availabilities)
+
+    with phase('serialize'):
+        if query.response_format == COMPACT_FORMAT:
+            return success_compact_json_list(availabilities, query.start_date)
+        return success_json_list(availabilities)
+
+
+def parse_availability_query(args):
+    """Parse the parameters of an availability request.
+
+    Args:
+        args(werkzeug.datastructures.MultiDict): The query string parameters
+            of the request.
+
+    Returns:
+        (AvailabilityQuery): The parsed parameters.
+
+    Raises:
+        InvalidParameterException: If any of the parameters are missing or
+            invalid.
+        GroupNotFoundException: If any of the groups do not exist.
+    """
+    user_ids = [int(id) for id in args.getlist('user_id')]
+    group_ids = [int(id) for id in args.getlist('group_id')]
+
+    if not user_ids and not group_ids:
+        raise InvalidParameterException(USER_OR_GROUP_ID_REQUIRED)
+
+    start_date, end_date = parse_date_range(
+        args.get('start_date', ''),
+        args.get('end_date', ''),
+    )
+
+    return AvailabilityQuery(
+        user_ids=user_ids,
+        group_ids=group_ids,
+        start_date=start_date,
+        end_date=end_date,
+        should_include_non_working_hours=(
+            args.get('include_non_working_hours') == 'true'
+        ),
+        min_attendees=parse_min_attendees(
+            args.get('min_attendees'),
+            len(get_attendee_ids(user_ids, group_ids)),
+        ),
+        min_duration=parse_positive_integer(
+            args.get('min_duration'),
+            'min_duration',
+        ),
+        limit=parse_positive_integer(args.get('limit'), 'limit'),
+        granularity=parse_granularity(args.get('granularity')),
+        response_format=parse_format(args.get('format')),
+    )
+
+
+def get_attendee_ids(user_ids, group_ids):
+    """Determine every user attending a meeting, with groups replaced by
+    their members.
+
+    Args:
+        user_ids(list(int)): The ids of the individual users.
+        group_ids(list(int)): The ids of the groups.
+
+    Returns:
+        (list(int)): The ids of the users. If there are no groups, these are
+            the individual users, as they were given. Otherwise, each user
+            is included once, in ascending order.
+
+    Raises:
+        GroupNotFoundException: If any of the groups do not exist.
+    """
+    if not group_ids:
+        return user_ids
+
+    attendee_ids = set(user_ids)
+    for group_id in group_ids:
+        attendee_ids.update(groups.get_member_ids(group_id))
+
+    return sorted(attendee_ids)
+
+
+def get_qualifying_availabilities(availabilities, query):
+    """Apply the min_duration and limit parameters of a request to its
+    availabilities.
+
+    Args:
+        availabilities(iterable(Availability)): The availabilities.
+        query(AvailabilityQuery): The parameters of the request.
+
+    Returns:
+        (iterable(Availability)): The availabilities that qualify, which are
+            filtered lazily if either parameter was provided.
+    """
+    if query.min_duration is None and query.limit is None:
+        return availabilities
+
+    return iter_qualifying_availabilities(
+        availabilities,
+        min_duration=_minutes_to_seconds(query.min_duration),
+        limit=query.limit,
+    )
+
+
+def get_batch_availability():
+    """Determine the common availability for many groups of users at once.
+
+    Each user's availability is computed at most once per date range across
+    the whole batch, and shared between every query that includes them.
+    Errors are reported per query, without failing the rest of the batch.
+    """
+    body = request.get_json(silent=True)
+    queries = body.get('queries') if isinstance(body, dict) else None
+
+    if not isinstance(queries, list) or not queries:
+        return bad_request('A list of queries is required')
+
+    if len(queries) > MAX_BATCH_QUERIES:
+        return bad_request(
+            f'At most {MAX_BATCH_QUERIES} queries may be batched together'
+        )
+
+    user_availabilities = {}
+
+    def get_shared_user_availability(*args):
+        if args not in user_availabilities:
+            user_availabilities[args] = get_cached_user_availability(*args)
+        return user_availabilities[args]
+
+    results = [
+        _get_batch_query_result(query, get_shared_user_availability)
+        for query in queries
+    ]
+
+    return success_json(results)
+
+
+def _get_batch_query_result(query, get_user_availability_func):
+    """Run a single query from a batch.
+
+    Args:
+        query(dict): The query, with the same parameters as the
+            availability endpoint, except that user and group ids are
+            provided as lists under user_ids and group_ids.
+        get_user_availability_func(function): The function responsible for
+            determining a single user's availability.
+
+    Returns:
+        (dict): The query's availabilities under data, or an error message
+            and HTTP status code under message and status.
+    """
+    if not isinstance(query, dict):
+        return _batch_error('Each query must be an object',
+                            HTTPStatus.BAD_REQUEST)
+
+    user_ids = query.get('user_ids', [])
+    group_ids = query.get('group_ids', [])
+    if (
+        not _is_id_list(user_ids) or
+        not _is_id_list(group_ids) or
+        not user_ids and not group_ids
+    ):
+        return _batch_error(USER_OR_GROUP_ID_REQUIRED,
+                            HTTPStatus.BAD_REQUEST)
+
+    try:
+        attendee_ids = get_attendee_ids(user_ids, group_ids)
+    except GroupNotFoundException as e:
+        return _batch_error(GROUP_NOT_FOUND.format(e.group_id),
+                            HTTPStatus.NOT_FOUND)
 
-    end_date_param = request.args.get('end_date', '')
     try:
-        end_date = arrow.get(end_date_param).to('utc').isoformat()
-    except ValueError:
-        return bad_request(INVALID_DATE_FORMAT.format('end_date'))
+        start_date, end_date = parse_date_range(
+            query.get('start_date', ''),
+            query.get('end_date', ''),
+        )
+        min_attendees = parse_min_attendees(
+            query.get('min_attendees'),
+            len(attendee_ids),
+        )
+        min_duration = parse_positive_integer(
+            query.get('min_duration'),
+            'min_duration',
+        )
+        limit = parse_positive_integer(query.get('limit'), 'limit')
+        granularity = parse_granularity(query.get('granularity'))
+        response_format = parse_format(query.get('format'))
+    except InvalidParameterException as e:
+        return _batch_error(str(e), HTTPStatus.BAD_REQUEST)
 
-    if start_date >= end_date:
-        return bad_request("Start date must be less than end date")
+    try:
+        availabilities = get_common_availability(
+            attendee_ids,
+            start_date,
+            end_date,
+            query.get('include_non_working_hours') is True,
+            min_attendees,
+            get_user_availability_func,
+            granularity,
+        )
+    except UserNotFoundException as e:
+        return _batch_error(USER_NOT_FOUND.format(e.user_id),
+                            HTTPStatus.NOT_FOUND)
 
-    should_include_non_working_hours = (
-        request.args.get('include_non_working_hours') == 'true'
+    availabilities = iter_qualifying_availabilities(
+        availabilities,
+        min_duration=_minutes_to_seconds(min_duration),
+        limit=limit,
     )
 
-    if should_include_non_working_hours:
-        def get_availability(user_id, user_events):
-            return get_user_availability(
-                user_events,
+    if response_format == COMPACT_FORMAT:
+        return to_compact_json(availabilities, start_date)
+
+    return {
+        'data': [availability.to_json() for availability in availabilities],
+    }
+
+
+def _is_id_list(ids):
+    # JSON booleans are decoded as bools, which are also ints.
+    return isinstance(ids, list) and all(
+        isinstance(id, int) and not isinstance(id, bool)
+        for id in ids
+    )
+
+
+def _batch_error(message, status_code):
+    return {'message': message, 'status': status_code}
+
+
+def _minutes_to_seconds(minutes):
+    return None if minutes is None else minutes * 60
+
+
+def get_common_availability(user_ids, start_date, end_date,
+                            should_include_non_working_hours,
+                            min_attendees=None,
+                            get_user_availability_func=None,
+                            granularity=None):
+    """Determine the availability common to a group of users.
+
+    Results are cached, keyed on the versions of the users' data, and
+    concurrent calls for the same result share a single computation.
+
+    Args:
+        user_ids(list(int)): The ids of the users.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the users' working hours should be included.
+        min_attendees(int): The minimum number of users that must be
+            available, or None if every user must be available.
+        get_user_availability_func(function): The function responsible for
+            determining a single user's availability, defaults to
+            get_cached_user_availability.
+        granularity(int): The length of the slots, in minutes, to which
+            availability should be aligned, or None if it should not be.
+
+    Returns:
+        (list(Availability)): The common availabilities of the users.
+
+    Raises:
+        UserNotFoundException: If any of the users do not exist.
+    """
+    cache_key = get_common_availability_cache_key(
+        user_ids,
+        [db.get_user_version(user_id) for user_id in user_ids],
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+        min_attendees,
+        granularity,
+    )
+
+    availabilities = common_availability_cache.get(cache_key)
+    if availabilities is not None:
+        return availabilities
+
+    def compute():
+        if granularity is None:
+            availabilities = _get_common_availability(
+                user_ids,
                 start_date,
                 end_date,
+                should_include_non_working_hours,
+                min_attendees,
+                get_user_availability_func or get_cached_user_availability,
             )
-    else:
-        def get_availability(user_id, user_events):
-            user = db.get_user(user_id)
-            return get_user_work_hour_availability(
-                user_events,
+        else:
+            availabilities = get_common_bitmap_availability(
+                [
+                    _get_user_free_time(
+                        user_id,
+                        start_date,
+                        end_date,
+                        should_include_non_working_hours,
+                    )
+                    for user_id in user_ids
+                ],
                 start_date,
                 end_date,
-                working_hours=user.working_hours,
-                time_zone=user.time_zone
+                min_attendees,
+                granularity,
             )
+        common_availability_cache.set(cache_key, availabilities)
+        return availabilities
+
+    return common_availability_flights.do(cache_key, compute,
+                                          COALESCING_TIMEOUT)
 
+
+def get_group_common_availability(group_ids, user_ids, start_date, end_date,
+                                  should_include_non_working_hours):
+    """Determine the availability common to groups and individual users.
+
+    Each group's availability is retrieved from the group cache, so only the
+    individual users who are not members of a group are intersected with
+    them from scratch.
+
+    Args:
+        group_ids(list(int)): The ids of the groups.
+        user_ids(list(int)): The ids of the individual users.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the users' working hours should be included.
+
+    Returns:
+        (list(Availability)): The common availabilities of the groups and
+            users.
+
+    Raises:
+        GroupNotFoundException: If any of the groups do not exist.
+        UserNotFoundException: If any of the users do not exist.
+    """
+    member_ids = set()
     user_availabilities = []
-    for user_id in user_ids:
-        try:
-            user_events = db.get_user_events(user_id, start_date, end_date)
-        except UserNotFoundException:
-            return not_found(f'User id {user_id} does not exist')
 
-        user_availability = get_availability(user_id, user_events)
+    for group_id in dict.fromkeys(group_ids):
+        user_availabilities.append(get_group_availability(
+            group_id,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        ))
+        member_ids.update(groups.get_member_ids(group_id))
+
+    for user_id in dict.fromkeys(user_ids):
+        if user_id not in member_ids:
+            user_availabilities.append(get_cached_user_availability(
+                user_id,
+                start_date,
+                end_date,
+                should_include_non_working_hours,
+            ))
+
+    return combine_user_availabilities(user_availabilities)
+
+
+def get_group_availability(group_id, start_date, end_date,
+                           should_include_non_working_hours):
+    """Determine the availability common to the members of a group.
+
+    The availability is retrieved from the group cache, a UTC day at a
+    time, keyed on the members and the versions of their data. Groups that
+    contain other groups are computed from the cached availability of those
+    groups.
+
+    Args:
+        group_id(int): The id of the group.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the members' working hours should be included.
+
+    Returns:
+        (list(Availability)): The common availabilities of the members.
+
+    Raises:
+        GroupNotFoundException: If the group does not exist.
+        UserNotFoundException: If any of the members do not exist.
+    """
+    member_ids = groups.get_member_ids(group_id)
+    member_versions = tuple(
+        db.get_user_version(user_id)
+        for user_id in member_ids
+    )
+
+    return group_availability_cache.get_availability(
+        group_id,
+        member_ids,
+        member_versions,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    )
+
+
+def _compute_group_availability(group_id, start_date, end_date,
+                                should_include_non_working_hours):
+    """Compute the availability common to the members of a group, from that
+    of the groups it contains and of its remaining members.
+
+    Returns:
+        (list(Availability)): The common availabilities of the members.
+    """
+    group = groups.get_group(group_id)
+
+    user_availabilities = []
+    subgroup_member_ids = set()
+    for subgroup_id in dict.fromkeys(group.group_ids):
+        user_availabilities.append(get_group_availability(
+            subgroup_id,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        ))
+        subgroup_member_ids.update(groups.get_member_ids(subgroup_id))
+
+    user_ids = [
+        user_id
+        for user_id in dict.fromkeys(group.user_ids)
+        if user_id not in subgroup_member_ids
+    ]
+    if user_ids:
+        user_availabilities.append(_get_common_availability(
+            user_ids,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+            None,
+            get_cached_user_availability,
+        ))
+
+    return combine_user_availabilities(user_availabilities)
+
+
+def get_common_availability_cache_key(user_ids, user_versions, start_date,
+                                      end_date,
+                                      should_include_non_working_hours,
+                                      min_attendees, granularity):
+    """Build the key under which a group's common availability is cached.
+
+    Args:
+        user_ids(list(int)): The ids of the users.
+        user_versions(list(int)): The current version of each user's data,
+            in the same order as user_ids.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the users' working hours should be included.
+        min_attendees(int): The minimum number of users that must be
+            available, or None if every user must be available.
+        granularity(int): The length of the slots, in minutes, or None.
+
+    Returns:
+        (tuple): The cache key.
+    """
+    return (
+        tuple(sorted(zip(user_ids, user_versions))),
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+        min_attendees,
+        granularity,
+    )
+
+
+def _get_common_availability(user_ids, start_date, end_date,
+                             should_include_non_working_hours,
+                             min_attendees, get_user_availability_func):
+    if (
+        process_pool is not None and
+        get_user_availability_func is get_cached_user_availability and
+        len(user_ids) >= PARALLEL_AVAILABILITY_MIN_USERS
+    ):
+        user_availabilities = _get_cached_user_availabilities(
+            user_ids,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
+        return combine_user_availabilities(user_availabilities,
+                                           min_attendees)
+
+    user_availabilities = []
+    for user_id in user_ids:
+        user_availability = get_user_availability_func(
+            user_id,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
 
         # If any user has zero availability in the given timeframe, bail early
-        if not len(user_availability):
-            return success_json_list([])
+        if not len(user_availability) and min_attendees is None:
+            return []
 
         user_availabilities.append(user_availability)
 
+    return combine_user_availabilities(user_availabilities, min_attendees)
+
+
+def combine_user_availabilities(user_availabilities, min_attendees=None):
+    """Determine the availability common to a group of users from each of
+    their availabilities, using whichever engine suits the group best.
+
+    Args:
+        user_availabilities(list(list(Availability))): The availabilities of
+            each user, in ascending order by start date.
+        min_attendees(int): The minimum number of users that must be
+            available, or None if every user must be available.
+
+    Returns:
+        (list(Availability)): The common availabilities of the users.
+    """
+    with phase('intersect'):
+        if min_attendees is not None:
+            return get_quorum_availabilities(user_availabilities,
+                                             min_attendees)
+
+        if len(user_availabilities) == 1:
+            return user_availabilities[0]
+
+        if len(user_availabilities) >= VECTORIZED_INTERSECTION_MIN_USERS:
+            return get_intersecting_availabilities_vectorized(
+                user_availabilities,
+            )
+
+        return get_intersecting_availabilities(user_availabilities)
+
+
+def get_common_bitmap_availability(user_free_times, start_date, end_date,
+                                   min_attendees, granularity):
+    """Determine the availability common to a group of users, in slots of
+    a fixed length.
+
+    Each user's availability is converted into a bitmap of the slots during
+    which they are available, and the bitmaps are combined with a bitwise
+    AND, or by counting the available users in each slot for a quorum. Only
+    slots that fall entirely within the availability of enough users are
+    included, so for dates aligned to the slots this produces the same
+    availabilities as the other engines.
+
+    Args:
+        user_free_times(list(UserFreeTime)): The free time of each user.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        min_attendees(int): The minimum number of users that must be
+            available, or None if every user must be available.
+        granularity(int): The length of the slots, in minutes.
+
+    Returns:
+        (list(Availability)): The common availabilities of the users.
+    """
+    slots = get_slots(start_date, end_date, granularity * 60)
+
+    with phase('work_hours'):
+        bitmaps = [
+            get_availability_bitmap(
+                user_free_time.free_intervals,
+                slots,
+                working_hours=user_free_time.working_hours,
+                time_zone=user_free_time.time_zone,
+            )
+            for user_free_time in user_free_times
+        ]
+    count(bitmap_slots_generated, slots.count * len(bitmaps))
+
+    with phase('intersect'):
+        if min_attendees is None:
+            return get_bitmap_availabilities(
+                get_intersecting_bitmap(bitmaps),
+                slots,
+            )
+
+        return get_bitmap_availabilities(
+            get_quorum_bitmap(bitmaps, min_attendees),
+            slots,
+        )
+
+
+def get_sharded_common_availability(user_ids, start_date, end_date,
+                                    should_include_non_working_hours,
+                                    min_attendees=None, granularity=None):
+    """Determine the availability common to a group of users, by fetching
+    each user's availability from the shard that owns them.
+
+    The shards' responses are combined in the same way as availabilities
+    computed locally.
+
+    Args:
+        user_ids(list(int)): The ids of the users.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the users' working hours should be included.
+        min_attendees(int): The minimum number of users that must be
+            available, or None if every user must be available.
+        granularity(int): The length of the slots, in minutes, to which
+            availability should be aligned, or None if it should not be.
+
+    Returns:
+        (list(Availability)): The common availabilities of the users.
+
+    Raises:
+        ShardException: If any of the shards responded with an error, or
+            could not be reached.
+    """
+    with phase('fan_out'):
+        user_availabilities = shard_client.get_user_availabilities(
+            user_ids,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
+
+    if granularity is None:
+        return combine_user_availabilities(user_availabilities, min_attendees)
+
+    # Availabilities are already restricted to working hours, so they can
+    # stand in for free intervals.
+    return get_common_bitmap_availability(
+        [
+            UserFreeTime(
+                [
+                    (availability.start_date, availability.end_date)
+                    for availability in user_availability
+                ],
+                None,
+                None,
+            )
+            for user_availability in user_availabilities
+        ],
+        start_date,
+        end_date,
+        min_attendees,
+        granularity,
+    )
+
+
+def iter_common_availability(user_ids, start_date, end_date,
+                             should_include_non_working_hours):
+    """Lazily determine the availability common to a group of users.
+
+    Each user's availability is only computed as far as is needed to produce
+    the next common availability, so memory use does not grow with the
+    length of the date range. Results are not cached.
+
+    Args:
+        user_ids(list(int)): The ids of the users.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the users' working hours should be included.
+
+    Returns:
+        (iterator(Availability)): The common availabilities of the users, in
+            ascending order by start date.
+
+    Raises:
+        UserNotFoundException: If any of the users do not exist. This is
+            raised immediately, rather than once iteration begins.
+    """
+    user_availabilities = [
+        _iter_user_availability(
+            user_id,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
+        for user_id in user_ids
+    ]
+
     if len(user_availabilities) == 1:
-        return success_json_list(user_availabilities[0])
+        return user_availabilities[0]
+
+    return iter_intersecting_availabilities(user_availabilities)
+
+
+def get_cached_user_availability(user_id, start_date, end_date,
+                                 should_include_non_working_hours):
+    """Determine a user's availability, reusing any cached result for the
+    current version of their data.
+
+    Args:
+        user_id(int): The id of the user.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the user's working hours should be included.
+
+    Returns:
+        (list(Availability)): The availabilities of the user.
+
+    Raises:
+        UserNotFoundException: If the user does not exist.
+    """
+    cache_key = get_user_availability_cache_key(
+        user_id,
+        db.get_user_version(user_id),
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    )
+
+    user_availability = user_availability_cache.get(cache_key)
+    if user_availability is None:
+        user_availability = _get_user_availability(
+            user_id,
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
+        user_availability_cache.set(cache_key, user_availability)
+
+    return user_availability
+
+
+def _get_cached_user_availabilities(user_ids, start_date, end_date,
+                                    should_include_non_working_hours):
+    """Determine the availability of many users, computing any that are
+    not cached across the process pool if there are enough of them.
+
+    Each user's data is read in this process, so only their free intervals,
+    working hours and time zone are shipped to the pool.
+    """
+    cache_keys = [
+        get_user_availability_cache_key(
+            user_id,
+            db.get_user_version(user_id),
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        )
+        for user_id in user_ids
+    ]
+    user_availabilities = [
+        user_availability_cache.get(cache_key)
+        for cache_key in cache_keys
+    ]
 
-    availabilities = get_intersecting_availabilities(user_availabilities)
+    for i, user_availability in enumerate(user_availabilities):
+        if user_availability is None:
+            user_availabilities[i] = get_horizon_user_availability(
+                user_ids[i],
+                start_date,
+                end_date,
+                should_include_non_working_hours,
+            )
+
+    uncached_indexes = [
+        i for i, user_availability in enumerate(user_availabilities)
+        if user_availability is None
+    ]
+    user_free_times = [
+        tuple(_get_user_free_time(
+            user_ids[i],
+            start_date,
+            end_date,
+            should_include_non_working_hours,
+        ))
+        for i in uncached_indexes
+    ]
+
+    with phase('work_hours'):
+        if len(user_free_times) >= PARALLEL_AVAILABILITY_MIN_USERS:
+            computed_availabilities = get_user_availabilities_in_parallel(
+                process_pool,
+                user_free_times,
+                process_pool_size,
+            )
+        else:
+            computed_availabilities = [
+                list(iter_free_interval_availability(*user_free_time))
+                for user_free_time in user_free_times
+            ]
+    count(
+        availabilities_generated,
+        sum(len(availability) for availability in computed_availabilities),
+    )
+
+    for i, user_availability in zip(uncached_indexes,
+                                    computed_availabilities):
+        user_availabilities[i] = user_availability
+        user_availability_cache.set(cache_keys[i], user_availability)
+
+    return user_availabilities
+
+
+def get_user_availability_cache_key(user_id, user_version, start_date,
+                                    end_date,
+                                    should_include_non_working_hours):
+    """Build the key under which a user's availability is cached.
+
+    Args:
+        user_id(int): The id of the user.
+        user_version(int): The current version of the user's data.
+        start_date(int): The start of the date range, as a UTC epoch
+            timestamp.
+        end_date(int): The end of the date range, as a UTC epoch timestamp.
+        should_include_non_working_hours(bool): Whether availability outside
+            of the user's working hours should be included.
+
+    Returns:
+        (tuple): The cache key.
+    """
+    return (
+        user_id,
+        user_version,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    )
+
+
+def _get_user_availability(user_id, start_date, end_date,
+                           should_include_non_working_hours):
+    user_availability = get_horizon_user_availability(
+        user_id,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    )
+    if user_availability is not None:
+        return user_availability
+
+    return compute_user_availability(_get_user_free_time(
+        user_id,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    ))
+
+
+def compute_user_availability(user_free_time):
+    """Compute a user's availability from their free time.
+
+    Args:
+        user_free_time(UserFreeTime): The free time of the user.
+
+    Returns:
+        (list(Availability)): The availabilities of the user.
+    """
+    with phase('work_hours'):
+        user_availability = list(
+            iter_free_interval_availability(*user_free_time)
+        )
+    count(availabilities_generated, len(user_availability))
+
+    return user_availability
+
+
+def _iter_user_availability(user_id, start_date, end_date,
+                            should_include_non_working_hours):
+    user_availability = get_horizon_user_availability(
+        user_id,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+        should_iterate=True,
+    )
+    if user_availability is not None:
+        return user_availability
+
+    free_intervals = _iter_user_free_intervals(user_id, start_date, end_date)
+
+    if should_include_non_working_hours:
+        return iter_free_interval_availability(free_intervals)
+
+    with phase('fetch'):
+        user = db.get_user(user_id)
+
+    return iter_free_interval_availability(
+        free_intervals,
+        user.working_hours,
+        user.time_zone,
+    )
+
+
+def _iter_user_free_intervals(user_id, start_date, end_date):
+    """Lazily fetch a user's free intervals, a chunk at a time.
+
+    The first chunk is fetched straight away, so that a missing user is
+    reported before iteration begins. Free intervals split at the boundary
+    between chunks are joined back together.
+
+    Returns:
+        (iterator(tuple(int, int))): The start and end dates of the free
+            intervals, in ascending order.
+
+    Raises:
+        UserNotFoundException: If the user does not exist.
+    """
+    chunk_end = min(start_date + FREE_INTERVAL_CHUNK_SIZE, end_date)
+    first_chunk = _fetch_user_free_intervals(user_id, start_date, chunk_end)
+
+    def generate():
+        chunk = first_chunk
+        chunk_start = start_date
+        next_chunk_start = chunk_end
+        pending = None
+
+        while True:
+            for free_interval in chunk:
+                if pending is None:
+                    pending = free_interval
+                elif pending[1] == free_interval[0] == chunk_start:
+                    pending = (pending[0], free_interval[1])
+                else:
+                    yield pending
+                    pending = free_interval
+
+            # Only an interval running to the end of the chunk can continue
+            # into the next one.
+            if pending is not None and pending[1] != next_chunk_start:
+                yield pending
+                pending = None
+
+            if next_chunk_start >= end_date:
+                break
+
+            chunk_start = next_chunk_start
+            next_chunk_start = min(chunk_start + FREE_INTERVAL_CHUNK_SIZE,
+                                   end_date)
+            chunk = _fetch_user_free_intervals(user_id, chunk_start,
+                                               next_chunk_start)
+
+        if pending is not None:
+            yield pending
+
+    return generate()
+
+
+def _fetch_user_free_intervals(user_id, start_date, end_date):
+    with phase('fetch'):
+        free_intervals = db.get_user_free_intervals(user_id, start_date,
+                                                    end_date)
+    count(intervals_scanned, len(free_intervals))
+    return free_intervals
+
+
+def get_horizon_user_availability(user_id, start_date, end_date,
+                                  should_include_non_working_hours,
+                                  should_iterate=False):
+    """Retrieve a user's precomputed availability, if the date range falls
+    within the horizon and it is up to date.
+
+    Returns:
+        (list(Availability)|iterator(Availability)): The availabilities of
+            the user, sliced from the horizon lazily if should_iterate is
+            set, or None if they must be computed.
+
+    Raises:
+        UserNotFoundException: If the user does not exist.
+    """
+    if horizon is None:
+        return None
+
+    if should_iterate:
+        get_user_availability_func = horizon.iter_user_availability
+    else:
+        get_user_availability_func = horizon.get_user_availability
+
+    user_availability = get_user_availability_func(
+        user_id,
+        start_date,
+        end_date,
+        should_include_non_working_hours,
+    )
+    count(horizon_lookups, 1, 'miss' if user_availability is None else 'hit')
+
+    return user_availability
+
+
+def _get_user_free_time(user_id, start_date, end_date,
+                        should_include_non_working_hours):
+    with phase('fetch'):
+        free_intervals = db.get_user_free_intervals(user_id, start_date,
+                                                    end_date)
+        if not should_include_non_working_hours:
+            user = db.get_user(user_id)
+    count(intervals_scanned, len(free_intervals))
+
+    if should_include_non_working_hours:
+        return UserFreeTime(free_intervals, None, None)
 
-    return success_json_list(availabilities)
+    return UserFreeTime(free_intervals, user.working_hours, user.time_zone)
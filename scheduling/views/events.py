@@ -0,0 +1,114 @@
+from flask import request
+
+from data.exceptions import (
+    EventNotFoundException,
+    ReadOnlyDatabaseException,
+    UserNotFoundException,
+)
+from utils.exceptions import InvalidParameterException
+from utils.request_params import INVALID_DATE_RANGE, parse_date
+from utils.responses import (
+    bad_request,
+    conflict,
+    created,
+    no_content,
+    not_found,
+    success_json,
+)
+from views.availability import db, USER_NOT_FOUND
+
+EVENT_NOT_FOUND = 'Event id {} does not exist'
+READ_ONLY_DATABASE = 'Events cannot be modified in a read-only database'
+
+
+def create_event(user_id):
+    """Add an event to a user's schedule.
+
+    The event's id is allocated by the database, and returned along with the
+    rest of the event.
+    """
+    try:
+        title, start_date, end_date = _parse_event(request.get_json(
+            silent=True,
+        ))
+    except InvalidParameterException as e:
+        return bad_request(str(e))
+
+    try:
+        event = db.create_event(user_id, title, start_date, end_date)
+    except UserNotFoundException as e:
+        return not_found(USER_NOT_FOUND.format(e.user_id))
+    except ReadOnlyDatabaseException:
+        return conflict(READ_ONLY_DATABASE)
+
+    return created(event.to_json())
+
+
+def update_event(user_id, event_id):
+    """Replace the title, start date and end date of one of a user's
+    events.
+    """
+    try:
+        title, start_date, end_date = _parse_event(request.get_json(
+            silent=True,
+        ))
+    except InvalidParameterException as e:
+        return bad_request(str(e))
+
+    try:
+        event = db.update_event(user_id, event_id, title, start_date,
+                                end_date)
+    except UserNotFoundException as e:
+        return not_found(USER_NOT_FOUND.format(e.user_id))
+    except EventNotFoundException as e:
+        return not_found(EVENT_NOT_FOUND.format(e.event_id))
+    except ReadOnlyDatabaseException:
+        return conflict(READ_ONLY_DATABASE)
+
+    return success_json(event.to_json())
+
+
+def delete_event(user_id, event_id):
+    """Remove one of a user's events."""
+    try:
+        db.delete_event(user_id, event_id)
+    except UserNotFoundException as e:
+        return not_found(USER_NOT_FOUND.format(e.user_id))
+    except EventNotFoundException as e:
+        return not_found(EVENT_NOT_FOUND.format(e.event_id))
+    except ReadOnlyDatabaseException:
+        return conflict(READ_ONLY_DATABASE)
+
+    return no_content()
+
+
+def _parse_event(body):
+    """Parse the body of a request to create or update an event.
+
+    Args:
+        body(dict): The event, with the same title, start and end fields as
+            are returned for it.
+
+    Returns:
+        (tuple(str, int, int)): The title of the event, and its start and end
+            dates as UTC epoch timestamps.
+
+    Raises:
+        InvalidParameterException: If the title is missing, either date is
+            not in ISO 8601 format, or the start date is not before the end
+            date.
+    """
+    if not isinstance(body, dict):
+        raise InvalidParameterException('An event is required')
+
+    title = body.get('title')
+    if not isinstance(title, str) or not title:
+        raise InvalidParameterException('A title is required')
+
+    start_date = parse_date(body.get('start'), 'start')
+    end_date = parse_date(body.get('end'), 'end')
+
+    if start_date >= end_date:
+        raise InvalidParameterException(INVALID_DATE_RANGE)
+
+    return title, start_date, end_date
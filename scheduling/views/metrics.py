@@ -0,0 +1,32 @@
+from flask import request
+
+from utils.metrics import (
+    finish_request_timing,
+    render_metrics,
+    PROMETHEUS_MIMETYPE,
+)
+from utils.responses import success_text
+
+
+def get_metrics():
+    """Report the application's metrics in the Prometheus text format."""
+    return success_text(render_metrics(), PROMETHEUS_MIMETYPE)
+
+
+def add_server_timing(response):
+    """Report the time spent in each phase of a request in its Server-Timing
+    header, if instrumentation is enabled.
+
+    Streamed responses are sent after this runs, so their timings do not
+    include the time spent producing the stream.
+
+    Args:
+        response(flask.Response): The response to the request.
+
+    Returns:
+        (flask.Response): The same response.
+    """
+    server_timing = finish_request_timing(request.endpoint)
+    if server_timing is not None:
+        response.headers['Server-Timing'] = server_timing
+    return response
@@ -0,0 +1,56 @@
+from flask import request
+
+from data.exceptions import UserNotFoundException
+from utils.exceptions import InvalidParameterException
+from utils.request_params import parse_date_range
+from utils.responses import bad_request, not_found, success_json
+from views.availability import (
+    get_cached_user_availability,
+    USER_ID_REQUIRED,
+    USER_NOT_FOUND,
+)
+
+
+def get_shard_availability():
+    """Determine the availability of each of a group of users owned by this
+    shard, for a coordinator to combine.
+
+    Each user's availabilities are returned under their id, as pairs of UTC
+    epoch timestamps.
+    """
+    user_ids = [int(id) for id in request.args.getlist('user_id')]
+    if not user_ids:
+        return bad_request(USER_ID_REQUIRED)
+
+    try:
+        start_date, end_date = parse_date_range(
+            request.args.get('start_date', ''),
+            request.args.get('end_date', ''),
+        )
+    except InvalidParameterException as e:
+        return bad_request(str(e))
+
+    should_include_non_working_hours = (
+        request.args.get('include_non_working_hours') == 'true'
+    )
+
+    try:
+        user_availabilities = {
+            user_id: get_cached_user_availability(
+                user_id,
+                start_date,
+                end_date,
+                should_include_non_working_hours,
+            )
+            for user_id in user_ids
+        }
+    except UserNotFoundException as e:
+        return not_found(USER_NOT_FOUND.format(e.user_id))
+
+    return success_json({
+        str(user_id): [
+            [availability.start_date, availability.end_date]
+            for availability in user_availability
+        ]
+        for user_id, user_availability in user_availabilities.items()
+    })
@@ -0,0 +1,179 @@
+from collections import namedtuple
+
+from flask import request
+
+from data.exceptions import UserNotFoundException
+from utils.exceptions import InvalidParameterException
+from utils.metrics import phase
+from utils.request_params import (
+    parse_date_range,
+    parse_positive_integer,
+    INVALID_POSITIVE_INTEGER,
+)
+from utils.responses import bad_request, not_found, success_json_list
+from utils.suggestion_utils import get_top_suggestions
+from utils.working_hours import get_work_hour_template, SECONDS_PER_DAY
+from views.availability import (
+    db,
+    iter_common_availability,
+    USER_ID_REQUIRED,
+    USER_NOT_FOUND,
+)
+
+INVALID_LIMIT = 'Invalid limit: must be between 1 and {}'
+
+# The number of suggestions returned, unless a limit is provided, and the
+# most that may be requested.
+DEFAULT_SUGGESTION_LIMIT = 5
+MAX_SUGGESTION_LIMIT = 100
+
+# The number of minutes between candidate start times, unless a step is
+# provided.
+DEFAULT_STEP = 15
+
+SuggestionQuery = namedtuple('SuggestionQuery', [
+    'user_ids',
+    'optional_user_ids',
+    'start_date',
+    'end_date',
+    'should_include_non_working_hours',
+    'duration',
+    'step',
+    'limit',
+])
+
+
+def get_suggestions():
+    """Suggest the best times for a meeting between a group of users.
+
+    Candidate start times are taken from the users' common availability,
+    which is computed lazily, and only the best are kept as it is scanned,
+    so the full set of candidates is never held in memory.
+    """
+    try:
+        with phase('parse'):
+            query = parse_suggestion_query(request.args)
+    except InvalidParameterException as e:
+        return bad_request(str(e))
+
+    try:
+        availabilities = iter_common_availability(
+            query.user_ids,
+            query.start_date,
+            query.end_date,
+            query.should_include_non_working_hours,
+        )
+        optional_user_availabilities = {
+            user_id: iter_common_availability(
+                [user_id],
+                query.start_date,
+                query.end_date,
+                query.should_include_non_working_hours,
+            )
+            for user_id in query.optional_user_ids
+        }
+        preferred_times = [
+            _get_work_day_middles(user_id, query.start_date, query.end_date)
+            for user_id in set(query.user_ids)
+        ]
+
+        with phase('rank'):
+            suggestions = get_top_suggestions(
+                availabilities,
+                query.duration * 60,
+                query.step * 60,
+                query.limit,
+                optional_user_availabilities,
+                preferred_times,
+            )
+    except UserNotFoundException as e:
+        return not_found(USER_NOT_FOUND.format(e.user_id))
+
+    with phase('serialize'):
+        return success_json_list(suggestions)
+
+
+def parse_suggestion_query(args):
+    """Parse the parameters of a suggestion request.
+
+    Args:
+        args(werkzeug.datastructures.MultiDict): The query string parameters
+            of the request.
+
+    Returns:
+        (SuggestionQuery): The parsed parameters.
+
+    Raises:
+        InvalidParameterException: If any of the parameters are missing or
+            invalid.
+    """
+    user_ids = [int(id) for id in args.getlist('user_id')]
+
+    if not user_ids:
+        raise InvalidParameterException(USER_ID_REQUIRED)
+
+    start_date, end_date = parse_date_range(
+        args.get('start_date', ''),
+        args.get('end_date', ''),
+    )
+
+    duration = parse_positive_integer(args.get('duration'), 'duration')
+    if duration is None:
+        raise InvalidParameterException(
+            INVALID_POSITIVE_INTEGER.format('duration')
+        )
+
+    limit = parse_positive_integer(args.get('limit'), 'limit')
+    if limit is None:
+        limit = DEFAULT_SUGGESTION_LIMIT
+    elif limit > MAX_SUGGESTION_LIMIT:
+        raise InvalidParameterException(
+            INVALID_LIMIT.format(MAX_SUGGESTION_LIMIT)
+        )
+
+    step = parse_positive_integer(args.get('step'), 'step')
+
+    # Required attendees are already accounted for by the common
+    # availability.
+    optional_user_ids = sorted(
+        set(int(id) for id in args.getlist('optional_user_id')) -
+        set(user_ids)
+    )
+
+    return SuggestionQuery(
+        user_ids=user_ids,
+        optional_user_ids=optional_user_ids,
+        start_date=start_date,
+        end_date=end_date,
+        should_include_non_working_hours=(
+            args.get('include_non_working_hours') == 'true'
+        ),
+        duration=duration,
+        step=step or DEFAULT_STEP,
+        limit=limit,
+    )
+
+
+def _get_work_day_middles(user_id, start_date, end_date):
+    """Determine the middle of each of a user's working days around a date
+    range.
+
+    Returns:
+        (list(int)): The middle of each working day, as ascending UTC epoch
+            timestamps.
+
+    Raises:
+        UserNotFoundException: If the user does not exist.
+    """
+    user = db.get_user(user_id)
+    template = get_work_hour_template(user.working_hours, user.time_zone)
+
+    # Working days are not clipped to the range, so a meeting at its edges
+    # is measured against the true middle of the day.
+    return [
+        (work_day_start + work_day_end) // 2
+        for work_day_start, work_day_end in template.get_work_windows(
+            start_date - SECONDS_PER_DAY,
+            end_date + SECONDS_PER_DAY,
+        )
+    ]